@@ -1,14 +1,16 @@
 """The LuxPower Modbus Integration."""
-import asyncio
 import logging
+import time
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, ServiceCall
 
 from .const import (
     DOMAIN,
+    DATA_SHARED_SESSIONS,
     PLATFORMS,
+    SERVICE_REFRESH_SETTINGS,
     CONF_HOST,
     CONF_PORT,
     CONF_DONGLE_SERIAL,
@@ -18,16 +20,71 @@ from .const import (
     CONF_REGISTER_BLOCK_SIZE,
     CONF_CONNECTION_RETRIES,
     CONF_BATTERY_ENTITIES,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_PIPELINE_WINDOW,
+    CONF_ENERGY_POLL_INTERVAL,
+    CONF_HOLD_POLL_INTERVAL,
+    CONF_HOLD_SENTINEL_CHECK,
+    CONF_WRITE_DEBOUNCE,
     DEFAULT_READ_ONLY,
     DEFAULT_REGISTER_BLOCK_SIZE,
     DEFAULT_CONNECTION_RETRIES,
     DEFAULT_BATTERY_ENTITIES,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_PIPELINE_WINDOW,
+    DEFAULT_ENERGY_POLL_INTERVAL,
+    DEFAULT_HOLD_POLL_INTERVAL,
+    DEFAULT_HOLD_SENTINEL_CHECK,
+    DEFAULT_WRITE_DEBOUNCE,
 )
+from .classes.connection_manager import ModbusConnectionManager
 from .classes.modbus_client import LxpModbusApiClient
+from .classes.request_scheduler import PRIORITY_POLL, RequestScheduler
+from .classes.write_queue import WriteQueue
 from .coordinator import LxpModbusDataUpdateCoordinator
+from .descriptions import log_startup_timings
 
 _LOGGER = logging.getLogger(__name__)
 
+def _acquire_shared_session(hass: HomeAssistant, entry: ConfigEntry, host: str, port: int,
+                            connection_retries: int) -> tuple[ModbusConnectionManager, RequestScheduler]:
+    """Return the persistent connection and request scheduler shared by all entries using the same dongle."""
+    sessions = hass.data.setdefault(DATA_SHARED_SESSIONS, {})
+    key = (host, port)
+    if key not in sessions:
+        sessions[key] = {
+            "connection_manager": ModbusConnectionManager(host, port, connection_retries, persistent=True),
+            "lock": RequestScheduler(),
+            "entries": set(),
+        }
+    session = sessions[key]
+    session["entries"].add(entry.entry_id)
+    return session["connection_manager"], session["lock"]
+
+async def _async_release_shared_session(hass: HomeAssistant, entry: ConfigEntry, key) -> None:
+    """Drop the entry from its shared session, closing the connection once it is unused."""
+    sessions = hass.data.get(DATA_SHARED_SESSIONS, {})
+    session = sessions.get(key)
+    if not session:
+        return
+    session["entries"].discard(entry.entry_id)
+    if not session["entries"]:
+        sessions.pop(key)
+        async with session["lock"].slot(PRIORITY_POLL):
+            await session["connection_manager"].async_disconnect()
+
+def _async_register_services(hass: HomeAssistant) -> None:
+    """Register the integration's services, once for all entries."""
+    if hass.services.has_service(DOMAIN, SERVICE_REFRESH_SETTINGS):
+        return
+
+    async def async_refresh_settings(call: ServiceCall) -> None:
+        """Read all hold registers of every entry on its next poll, which runs now."""
+        for entry_data in list(hass.data.get(DOMAIN, {}).values()):
+            await entry_data["coordinator"].async_refresh_hold_registers()
+
+    hass.services.async_register(DOMAIN, SERVICE_REFRESH_SETTINGS, async_refresh_settings)
+
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up the LuxPower Modbus component from a config entry."""
     # Ensure the top-level dictionary for our integration exists in hass.data
@@ -39,18 +96,36 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     dongle_serial = entry.data[CONF_DONGLE_SERIAL]
     inverter_serial = entry.data[CONF_INVERTER_SERIAL]
     poll_interval = entry.data[CONF_POLL_INTERVAL]
+    energy_poll_interval = entry.data.get(CONF_ENERGY_POLL_INTERVAL, DEFAULT_ENERGY_POLL_INTERVAL)
+    hold_poll_interval = entry.data.get(CONF_HOLD_POLL_INTERVAL, DEFAULT_HOLD_POLL_INTERVAL)
+    hold_sentinel_check = entry.data.get(CONF_HOLD_SENTINEL_CHECK, DEFAULT_HOLD_SENTINEL_CHECK)
 
     # Determine if battery data should be requested
     battery_entities = entry.data.get(CONF_BATTERY_ENTITIES, DEFAULT_BATTERY_ENTITIES).replace(" ", "").split(",")
     request_battery_data = bool(battery_entities) and 'none' not in battery_entities
 
-    # Create a single asyncio.Lock to prevent read/write race conditions
-    lock = asyncio.Lock()
     block_size = entry.data.get(CONF_REGISTER_BLOCK_SIZE, DEFAULT_REGISTER_BLOCK_SIZE)
     connection_retries = entry.data.get(CONF_CONNECTION_RETRIES, DEFAULT_CONNECTION_RETRIES)
+    persistent_connection = entry.data.get(CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION)
+    pipeline_window = entry.data.get(CONF_PIPELINE_WINDOW, DEFAULT_PIPELINE_WINDOW)
+    write_debounce = entry.data.get(CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE)
+
+    if persistent_connection:
+        # Keep one long-lived session per dongle, shared (with its scheduler) by every entry using it
+        session_key = (host, port)
+        connection_manager, lock = _acquire_shared_session(hass, entry, host, port, connection_retries)
+    else:
+        # Schedule reads and writes one at a time, writes first, to prevent race conditions
+        session_key = None
+        connection_manager = None
+        lock = RequestScheduler()
+
     api_client = LxpModbusApiClient(
         host, port, dongle_serial, inverter_serial, lock, block_size, connection_retries,
-        request_battery_data=request_battery_data
+        request_battery_data=request_battery_data,
+        connection_manager=connection_manager,
+        pipeline_window=pipeline_window,
+        hold_sentinel_check=hold_sentinel_check,
     )
 
     # Create our custom coordinator
@@ -58,7 +133,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass,
         api_client,
         poll_interval,
-        entry.title
+        entry.title,
+        energy_poll_interval=energy_poll_interval,
+        hold_poll_interval=hold_poll_interval,
+        entry=entry,
     )
 
     # Store the coordinator and other shared objects in hass.data for this entry
@@ -66,7 +144,10 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "coordinator": coordinator,
         "settings": {**entry.data, **entry.options},
         "lock": lock,
-        "api_client": api_client
+        "api_client": api_client,
+        # Number writes, coalesced so a dragged slider does not flood the dongle
+        "write_queue": WriteQueue(api_client, write_debounce),
+        "session_key": session_key,
     }
 
     # Perform the first data refresh. This will block setup until the first poll is
@@ -106,7 +187,11 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data[DOMAIN][entry.entry_id]["platforms"] = platforms_to_load
 
     # Forward the setup to all platforms (sensor, number, etc.)
+    started = time.perf_counter()
     await hass.config_entries.async_forward_entry_setups(entry, platforms_to_load)
+    log_startup_timings(hass, entry, time.perf_counter() - started)
+
+    _async_register_services(hass)
 
     return True
 
@@ -120,6 +205,11 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     unload_ok = await hass.config_entries.async_unload_platforms(entry, loaded_platforms)
 
     if unload_ok:
-        hass.data[DOMAIN].pop(entry.entry_id)
+        entry_data = hass.data[DOMAIN].pop(entry.entry_id)
+        await entry_data["write_queue"].async_shutdown()
+        if entry_data.get("session_key"):
+            await _async_release_shared_session(hass, entry, entry_data["session_key"])
+        if not hass.data[DOMAIN]:
+            hass.services.async_remove(DOMAIN, SERVICE_REFRESH_SETTINGS)
 
     return unload_ok
@@ -1,25 +1,30 @@
 import logging
+import time
 
 from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN, CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX
+from .descriptions import async_load_descriptions, record_platform_setup
 from .entity import ModbusBridgeEntity
-from .entity_descriptions.binary_sensor_types import BINARY_SENSOR_TYPES
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up binary_sensor entities from a config entry."""
+    started = time.perf_counter()
+    descriptions = await async_load_descriptions(hass, entry, Platform.BINARY_SENSOR)
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entity_prefix = hass.data[DOMAIN][entry.entry_id]['settings'].get(CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX)
     api_client = hass.data[DOMAIN][entry.entry_id]["api_client"]
     
     entities = [
         ModbusBridgeBinarySensor(coordinator, entry, desc, entity_prefix, api_client)
-        for desc in BINARY_SENSOR_TYPES
+        for desc in descriptions.BINARY_SENSOR_TYPES
     ]
     async_add_entities(entities)
+    record_platform_setup(hass, entry, Platform.BINARY_SENSOR, started, len(entities))
 
 class ModbusBridgeBinarySensor(ModbusBridgeEntity, BinarySensorEntity):
     """Represents a binary_sensor entity that writes a value to a register."""
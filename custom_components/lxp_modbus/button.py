@@ -1,25 +1,30 @@
 import logging
+import time
 
 from homeassistant.components.button import ButtonEntity
+from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN, CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX
+from .descriptions import async_load_descriptions, record_platform_setup
 from .entity import ModbusBridgeEntity
-from .entity_descriptions.button_types import BUTTON_TYPES
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up button entities from a config entry."""
+    started = time.perf_counter()
+    descriptions = await async_load_descriptions(hass, entry, Platform.BUTTON)
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entity_prefix = hass.data[DOMAIN][entry.entry_id]['settings'].get(CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX)
     api_client = hass.data[DOMAIN][entry.entry_id]["api_client"]
     
     entities = [
         ModbusBridgeButton(coordinator, entry, desc, entity_prefix, api_client)
-        for desc in BUTTON_TYPES
+        for desc in descriptions.BUTTON_TYPES
     ]
     async_add_entities(entities)
+    record_platform_setup(hass, entry, Platform.BUTTON, started, len(entities))
 
 class ModbusBridgeButton(ModbusBridgeEntity, ButtonEntity):
     """Represents a button entity that writes a value to a register."""
@@ -48,6 +53,6 @@ class ModbusBridgeButton(ModbusBridgeEntity, ButtonEntity):
         success = await self._api_client.async_write_register(self._register, new_register_value)
         
         if success:
-            # After a successful write, request an immediate refresh from the coordinator.
-            # This makes the UI update quickly with any state changes caused by the button press.
-            await self.coordinator.async_request_refresh()
\ No newline at end of file
+            # Read back only the written register instead of refreshing every block, so the
+            # entities it affects (e.g. a flag the inverter clears again) settle in one request
+            await self.coordinator.async_read_back(self._register_type, [self._register])
\ No newline at end of file
@@ -0,0 +1,157 @@
+"""Incremental evaluation of calculated sensors over the input registers they depend on."""
+from collections.abc import Iterable, Iterator, Mapping
+from functools import lru_cache
+from typing import Any, Callable
+
+from ..constants.register_pairs import INPUT_REGISTER_PAIRS
+from .register_store import RegisterStore
+
+
+class Intermediate:
+    """A value computed from input registers and shared by several calculated sensors.
+
+    Calling it with the registers passed to an extract lambda returns the
+    value memoized by the CalculationGraph evaluating the sensor, or
+    computes it directly for any other mapping.
+    """
+
+    __slots__ = ("name", "inputs", "compute")
+
+    def __init__(self, name: str, inputs: Iterable[int], compute: Callable[[Mapping], Any]):
+        self.name = name
+        self.inputs = tuple(inputs)
+        self.compute = compute
+
+    def __call__(self, registers: Mapping) -> Any:
+        if isinstance(registers, _GraphRegisters):
+            return registers.graph.intermediate(self, registers.registers)
+        return self.compute(registers)
+
+    def __repr__(self) -> str:
+        return f"Intermediate({self.name})"
+
+
+def register_sum(name: str, registers: Iterable[int]) -> Intermediate:
+    """Return the intermediate summing registers, missing ones counting as 0."""
+    registers = tuple(registers)
+    return Intermediate(name, registers, lambda values: sum(values.get(reg, 0) for reg in registers))
+
+
+@lru_cache(maxsize=None)
+def combined_u32(low: int, high: int) -> Intermediate:
+    """Return the intermediate combining a low and high register into a 32-bit value.
+
+    The same pair always gives the same intermediate, so sensors reading the
+    same counter share it. Declared input register pairs are taken from the
+    RegisterStore's combined view, decoded for all pairs at once; missing
+    halves count as 0.
+    """
+    def compute(values):
+        if isinstance(values, RegisterStore):
+            value = values.combined(INPUT_REGISTER_PAIRS).get(low)
+            if value is not None:
+                return value
+        return (values.get(high, 0) << 16) | values.get(low, 0)
+
+    return Intermediate(f"u32_{low}_{high}", (low, high), compute)
+
+
+class _GraphRegisters(Mapping):
+    """The registers as seen by an extract lambda evaluated through a graph."""
+
+    __slots__ = ("graph", "registers")
+
+    def __init__(self, graph: "CalculationGraph", registers: Mapping):
+        self.graph = graph
+        self.registers = registers
+
+    def __getitem__(self, register):
+        return self.registers[register]
+
+    def get(self, register, default=None):
+        return self.registers.get(register, default)
+
+    def __contains__(self, register) -> bool:
+        return register in self.registers
+
+    def __iter__(self) -> Iterator:
+        return iter(self.registers)
+
+    def __len__(self) -> int:
+        return len(self.registers)
+
+
+class CalculationGraph:
+    """Results of calculated descriptions and their intermediates, kept until an input changes.
+
+    Each calculated description is a node over the input registers in its
+    depends_on, each intermediate a node over its inputs. A result is reused
+    until invalidate() reports one of its registers as changed, so a poll
+    only re-evaluates the calculations whose inputs moved, and an
+    intermediate such as the total PV power is computed once for all the
+    sensors using it.
+    """
+
+    def __init__(self):
+        """Initialize an empty graph."""
+        self._results = {}
+        # Nodes by input register, for invalidation
+        self._dependents = {}
+        # Results are only valid for the registers they were computed from
+        self._registers = None
+        # Description being evaluated, which depends on the intermediates it uses
+        self._evaluating = None
+
+    def evaluate(self, desc: dict, registers: Mapping, entry) -> Any:
+        """Return the value of a calculated description's extract over the input registers."""
+        if registers is not self._registers:
+            self.invalidate(None)
+            self._registers = registers
+        key = id(desc)
+        try:
+            return self._results[key]
+        except KeyError:
+            pass
+        self._evaluating = key
+        try:
+            value = desc["extract"](_GraphRegisters(self, registers), entry)
+        finally:
+            self._evaluating = None
+        self._store(key, desc.get("depends_on", ()), value)
+        return value
+
+    def intermediate(self, node: Intermediate, registers: Mapping) -> Any:
+        """Return the value of an intermediate, computing it once until its inputs change."""
+        if self._evaluating is not None:
+            self._store_dependency(self._evaluating, node.inputs)
+        try:
+            return self._results[node]
+        except KeyError:
+            pass
+        value = node.compute(registers)
+        self._results[node] = value
+        self._store_dependency(node, node.inputs)
+        return value
+
+    def _store(self, key, inputs: Iterable[int], value) -> None:
+        self._results[key] = value
+        self._store_dependency(key, inputs)
+
+    def _store_dependency(self, key, inputs: Iterable[int]) -> None:
+        for register in inputs:
+            self._dependents.setdefault(register, set()).add(key)
+
+    def invalidate(self, changed: Iterable[int] | None) -> None:
+        """Drop the results depending on the changed input registers, or all of them if None."""
+        if changed is None:
+            self._results.clear()
+            self._dependents.clear()
+            return
+        results, dependents = self._results, self._dependents
+        for register in changed:
+            for key in dependents.pop(register, ()):
+                results.pop(key, None)
+
+    def __len__(self) -> int:
+        """Return the number of results currently memoized."""
+        return len(self._results)
@@ -1,29 +1,50 @@
 """TCP connection management for Modbus communication."""
 import asyncio
 import logging
-from contextlib import suppress
 
-from .lxp_response import LxpResponse
+from .frame_protocol import LxpFrameProtocol
+from .transport import LxpTransport, TcpTransport
 
 _LOGGER = logging.getLogger(__name__)
 
 # Connection constants
-CONNECTION_TIMEOUT = 10
 CLOSE_TIMEOUT = 5
-INITIAL_DATA_READ_SIZE = 300
-INITIAL_DATA_TIMEOUT = 1
 
 
 class ModbusConnectionManager:
-    """Manages TCP connection lifecycle for Modbus communication."""
+    """Manages TCP connection lifecycle for Modbus communication.
+
+    In the default mode every operation opens its own connection and closes it
+    afterwards. In persistent mode a single session is kept open and handed out
+    to every caller, and it is only re-established when it is found dead or a
+    caller reports it as broken.
+
+    Connections are LxpFrameProtocol sessions: incoming bytes are framed as
+    they arrive, so greeting frames the dongle sends after connecting are
+    filed as unsolicited instead of being waited out. They are opened by an
+    LxpTransport, TCP to host:port unless another transport is given.
+    """
 
     def __init__(self, host: str, port: int, connection_retries: int,
-                 skip_initial_data: bool = True):
+                 skip_initial_data: bool = True, persistent: bool = False,
+                 transport: LxpTransport | None = None):
         """Initialize the connection manager."""
         self._host = host
         self._port = port
+        self._transport = transport or TcpTransport(host, port)
         self._connection_retries = connection_retries
         self._skip_initial_data = skip_initial_data
+        self._persistent = persistent
+
+        # Persistent session state
+        self._session = None
+
+        # Session statistics
+        self._connections_opened = 0
+        self._sessions_reused = 0
+        self._reconnects = 0
+        # Framing statistics of the sessions closed so far
+        self._framing_totals = {}
 
     @property
     def host(self) -> str:
@@ -37,33 +58,106 @@ class ModbusConnectionManager:
     def connection_retries(self) -> int:
         return self._connection_retries
 
-    async def async_connect(self) -> tuple[asyncio.StreamReader, asyncio.StreamWriter]:
-        """Establish a TCP connection with timeout."""
-        reader, writer = await asyncio.wait_for(
-            asyncio.open_connection(self._host, self._port),
-            timeout=CONNECTION_TIMEOUT
-        )
-        return reader, writer
+    @property
+    def persistent(self) -> bool:
+        return self._persistent
+
+    @property
+    def transport(self) -> LxpTransport:
+        return self._transport
+
+    async def async_connect(self) -> LxpFrameProtocol:
+        """Open a new connection through the transport."""
+        session = await self._transport.async_open()
+        self._connections_opened += 1
+        return session
+
+    @staticmethod
+    def is_alive(session: LxpFrameProtocol) -> bool:
+        """Return True if the connection can still be used for a request."""
+        return session is not None and session.is_alive
+
+    async def async_acquire(self) -> LxpFrameProtocol:
+        """Return a ready-to-use connection.
+
+        In persistent mode the open session is reused while it is alive, and
+        transparently replaced when it is not.
+        """
+        if self._persistent and self._session is not None:
+            if self.is_alive(self._session):
+                self._sessions_reused += 1
+                await self.async_discard_initial_data(self._session)
+                return self._session
 
-    async def async_close(self, writer: asyncio.StreamWriter) -> None:
+            _LOGGER.debug("Persistent session to %s is no longer alive, reconnecting", self._transport.description)
+            await self.async_disconnect()
+            self._reconnects += 1
+
+        session = await self.async_connect()
+
+        if self._persistent:
+            self._session = session
+        return session
+
+    async def async_release(self, session: LxpFrameProtocol, failed: bool = False) -> None:
+        """Hand a connection back after use.
+
+        Connections are closed unless they are the persistent session. A
+        persistent session reported as failed is dropped so the next
+        acquire opens a fresh one.
+        """
+        if session is None:
+            return
+        if session is self._session:
+            if not failed:
+                return
+            self._session = None
+        await self.async_close(session)
+
+    async def async_disconnect(self) -> None:
+        """Close the persistent session, if one is open."""
+        session = self._session
+        self._session = None
+        await self.async_close(session)
+
+    async def async_close(self, session: LxpFrameProtocol) -> None:
         """Close connection gracefully with timeout protection."""
-        if not writer:
+        if not session:
             return
+        self._add_framing_stats(self._framing_totals, session)
         try:
-            writer.close()
-            await asyncio.wait_for(writer.wait_closed(), timeout=CLOSE_TIMEOUT)
+            session.close()
+            await asyncio.wait_for(session.wait_closed(), timeout=CLOSE_TIMEOUT)
         except (asyncio.TimeoutError, ConnectionError) as e:
             _LOGGER.warning("Error closing connection: %s", e)
 
-    async def async_discard_initial_data(self, reader: asyncio.StreamReader) -> None:
-        """Discard any initial data sent by dongle after connection."""
+    async def async_discard_initial_data(self, session: LxpFrameProtocol) -> None:
+        """Discard unsolicited frames (greetings, cloud traffic) received so far.
+
+        The framer files these as they arrive, so nothing needs to be waited for.
+        """
         if not self._skip_initial_data:
             return
-        with suppress(asyncio.TimeoutError):
-            ignored = await asyncio.wait_for(
-                reader.read(INITIAL_DATA_READ_SIZE),
-                timeout=INITIAL_DATA_TIMEOUT
-            )
-            if ignored:
-                response = LxpResponse(ignored)
-                _LOGGER.debug("ignored start data from dongle response=%s %s", response.info, ignored.hex())
+        for response in session.pop_unsolicited():
+            _LOGGER.debug("ignored unsolicited data from dongle response=%s", response.info)
+
+    @staticmethod
+    def _add_framing_stats(totals: dict, session: LxpFrameProtocol) -> None:
+        for key, value in session.get_stats().items():
+            totals[key] = totals.get(key, 0) + value
+
+    def get_framing_stats(self) -> dict:
+        """Get the framing statistics of every session, the open persistent one included."""
+        totals = dict(self._framing_totals)
+        if self._session is not None:
+            self._add_framing_stats(totals, self._session)
+        return totals
+
+    def get_stats(self) -> dict:
+        """Get session statistics for monitoring and debugging."""
+        return {
+            "persistent": self._persistent,
+            "connections_opened": self._connections_opened,
+            "sessions_reused": self._sessions_reused,
+            "reconnects": self._reconnects,
+        }
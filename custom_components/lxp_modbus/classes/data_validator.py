@@ -1,44 +1,181 @@
-"""Data sanity validation for Modbus register values."""
+"""Data sanity validation for Modbus register values.
+
+Each register with known plausible values has a rule: upper limits on bit
+fields of its raw value (the whole value, or e.g. the hour and minute bytes
+of a time register), and lower limits that hold while another register of
+the same block shows they must (a grid frequency while there is grid
+voltage). Only physical and format limits are checked: hold settings
+outside the range the entities offer are still values the inverter holds.
+Blocks are checked against the rules of the registers they cover, so only
+the implausible registers of a reply are dropped.
+"""
 import logging
+import re
+from collections.abc import Mapping, Sequence
+from dataclasses import dataclass
 
-from ..constants.hold_registers import (
-    H_AC_CHARGE_START_TIME, H_AC_CHARGE_END_TIME, H_AC_CHARGE_START_TIME_1, H_AC_CHARGE_END_TIME_1,
-    H_AC_CHARGE_START_TIME_2, H_AC_CHARGE_END_TIME_2, H_AC_FIRST_START_TIME, H_AC_FIRST_END_TIME,
-    H_AC_FIRST_START_TIME_1, H_AC_FIRST_END_TIME_1, H_PEAK_SHAVING_START_TIME, H_PEAK_SHAVING_END_TIME,
-    H_PEAK_SHAVING_START_TIME_1, H_PEAK_SHAVING_END_TIME_1
+from ..constants import hold_registers
+from ..constants.input_registers import (
+    I_FAC, I_FEPS, I_SOC_SOH, I_VAC_R, I_VAC_S, I_VAC_T, I_VBAT, I_VEPS_R, I_VEPS_S, I_VEPS_T,
+    I_VPV1, I_VPV2, I_VPV3, I_VPV4, I_VPV5, I_VPV6,
 )
 
 _LOGGER = logging.getLogger(__name__)
 
-HOLD_TIME_REGISTERS = {
-    H_AC_CHARGE_START_TIME,
-    H_AC_CHARGE_END_TIME,
-    H_AC_CHARGE_START_TIME_1,
-    H_AC_CHARGE_END_TIME_1,
-    H_AC_CHARGE_START_TIME_2,
-    H_AC_CHARGE_END_TIME_2,
-    H_AC_FIRST_START_TIME,
-    H_AC_FIRST_END_TIME,
-    H_AC_FIRST_START_TIME_1,
-    H_AC_FIRST_END_TIME_1,
-    H_PEAK_SHAVING_START_TIME,
-    H_PEAK_SHAVING_END_TIME,
-    H_PEAK_SHAVING_START_TIME_1,
-    H_PEAK_SHAVING_END_TIME_1,
-}
+
+@dataclass(frozen=True, slots=True)
+class FieldLimit:
+    """Upper limit of a bit field of a register value: (value >> shift) & mask <= maximum."""
+
+    shift: int
+    mask: int
+    maximum: int
+
+
+@dataclass(frozen=True, slots=True)
+class DependentMinimum:
+    """Lower limit of a register value while another register is high: value >= minimum if other >= threshold."""
+
+    other: int
+    threshold: int
+    minimum: int
+
+
+def value_limit(maximum: int) -> tuple[FieldLimit, ...]:
+    """Return the rule limiting the whole register value."""
+    return (FieldLimit(0, 0xFFFF, maximum),)
+
+
+# Time registers are packed as Hour | (Minute << 8)
+TIME_LIMITS = (FieldLimit(0, 0xFF, 23), FieldLimit(8, 0xFF, 59))
+# SOC in the low byte, SOH in the high byte, both in %
+SOC_SOH_LIMITS = (FieldLimit(0, 0xFF, 100), FieldLimit(8, 0xFF, 100))
+
+# Hold registers named like H_AC_CHARGE_START_TIME_1 or H_AC_CHG_TIME1_START_MON hold a time
+# of day; the SOC limit and start time registers pack other values with it
+_TIME_REGISTER_NAME = re.compile(r"^H_(?!.*_AND_).*(_(START|END)_TIME(_\d+)?|_TIME\d_(START|END)_[A-Z]{3})$")
+
+HOLD_TIME_REGISTERS = frozenset(
+    register for name, register in vars(hold_registers).items()
+    if _TIME_REGISTER_NAME.match(name) and isinstance(register, int)
+)
 INPUT_TIME_REGISTERS = set()
 
+HOLD_RULES = {register: TIME_LIMITS for register in HOLD_TIME_REGISTERS}
+
+# Generous physical bounds, far beyond what a residential system reports
+INPUT_RULES = {
+    I_SOC_SOH: SOC_SOH_LIMITS,
+    **dict.fromkeys((I_VPV1, I_VPV2, I_VPV3, I_VPV4, I_VPV5, I_VPV6), value_limit(15000)),  # 1500.0 V
+    I_VBAT: value_limit(6000),  # 600.0 V
+    **dict.fromkeys((I_VAC_R, I_VAC_S, I_VAC_T, I_VEPS_R, I_VEPS_S, I_VEPS_T), value_limit(3500)),  # 350.0 V
+    # 0 when there is no grid or off-grid output
+    **dict.fromkeys((I_FAC, I_FEPS), value_limit(7000)),  # 70.00 Hz
+}
+
+# A grid or off-grid output with voltage (80.0 V and up) runs at 40 Hz or more, never at 0 Hz
+INPUT_DEPENDENT_RULES = {
+    I_FAC: (DependentMinimum(I_VAC_R, 800, 4000),),
+    I_FEPS: (DependentMinimum(I_VEPS_R, 800, 4000),),
+}
+
+REGISTER_RULES = {"hold": HOLD_RULES, "input": INPUT_RULES}
+DEPENDENT_RULES = {"input": INPUT_DEPENDENT_RULES}
+
+
+class BlockValidator:
+    """Checks blocks of consecutive registers against the rules of one register type.
+
+    The checks of a block are compiled once per (start, count) into flat
+    tuples of (offset, shift, mask, maximum) and (offset, other offset,
+    threshold, minimum), so validating a reply is a single pass over the
+    registers that have a rule. Dependent minimums are only checked when
+    the block holds both registers.
+    """
+
+    def __init__(self, rules: Mapping[int, tuple[FieldLimit, ...]],
+                 dependent_rules: Mapping[int, tuple[DependentMinimum, ...]] | None = None):
+        """Initialize the validator with the rules keyed by register."""
+        self._register_checks = tuple(
+            (register, limit.shift, limit.mask, limit.maximum)
+            for register, limits in sorted(rules.items())
+            for limit in limits
+        )
+        self._dependent_checks = tuple(
+            (register, limit.other, limit.threshold, limit.minimum)
+            for register, limits in sorted((dependent_rules or {}).items())
+            for limit in limits
+        )
+        self._checks = {}
+
+    def _block_checks(self, start: int, count: int) -> tuple[tuple, tuple]:
+        checks = self._checks.get((start, count))
+        if checks is None:
+            end = start + count
+            checks = (
+                tuple(
+                    (register - start, shift, mask, maximum)
+                    for register, shift, mask, maximum in self._register_checks
+                    if start <= register < end
+                ),
+                tuple(
+                    (register - start, other - start, threshold, minimum)
+                    for register, other, threshold, minimum in self._dependent_checks
+                    if start <= register < end and start <= other < end
+                ),
+            )
+            self._checks[(start, count)] = checks
+        return checks
+
+    def invalid_registers(self, start: int, values: Sequence[int]) -> list[int]:
+        """Return the registers of the block from start whose value breaks its rule."""
+        checks, dependent_checks = self._block_checks(start, len(values))
+        invalid = [
+            start + offset for offset, shift, mask, maximum in checks
+            if (values[offset] >> shift) & mask > maximum
+        ]
+        if dependent_checks:
+            invalid += [
+                start + offset for offset, other, threshold, minimum in dependent_checks
+                if values[other] >= threshold and values[offset] < minimum
+            ]
+        # A register breaking several limits is reported once
+        return sorted(set(invalid)) if len(invalid) > 1 else invalid
+
+    def invalid_in(self, registers: Mapping[int, int]) -> list[int]:
+        """Return the registers of a mapping whose value breaks its rule."""
+        get = registers.get
+        invalid = [
+            register for register, shift, mask, maximum in self._register_checks
+            if (value := get(register)) is not None and (value >> shift) & mask > maximum
+        ]
+        invalid += [
+            register for register, other, threshold, minimum in self._dependent_checks
+            if (value := get(register)) is not None and get(other, 0) >= threshold and value < minimum
+        ]
+        return sorted(set(invalid)) if len(invalid) > 1 else invalid
+
+
+_VALIDATORS = {
+    register_type: BlockValidator(rules, DEPENDENT_RULES.get(register_type))
+    for register_type, rules in REGISTER_RULES.items()
+}
+
+
+def invalid_registers(start: int, values: Sequence[int], register_type: str) -> list[int]:
+    """Return the registers of a block read from start whose value is implausible."""
+    validator = _VALIDATORS.get(register_type)
+    if validator is None:
+        return []
+    return validator.invalid_registers(start, values)
+
 
 def is_data_sane(registers: dict, register_type: str) -> bool:
     """Performs a sanity check on key values to detect data corruption."""
-    time_registers = HOLD_TIME_REGISTERS if register_type == "hold" else INPUT_TIME_REGISTERS
-
-    for register, value in registers.items():
-        if register in time_registers:
-            # The value is packed as Hour | (Minute << 8)
-            hour = value & 0xFF
-            minute = (value >> 8) & 0xFF
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                _LOGGER.debug("Sanity check failed for %s register %s value: %s: H=%s, M=%s", register_type, register, value, hour, minute)
-                return False
-    return True
+    validator = _VALIDATORS.get(register_type)
+    if validator is None:
+        return True
+    invalid = validator.invalid_in(registers)
+    if invalid:
+        _LOGGER.debug("Sanity check failed for %s registers %s", register_type, invalid)
+    return not invalid
@@ -0,0 +1,32 @@
+"""Facts about an inverter derived from its registers, shared by all of its entities."""
+from dataclasses import dataclass
+
+from ..constants.input_registers import I_MASTER_SLAVE_PARALLEL_STATUS
+from ..utils import format_firmware_version
+
+# Parallel role in bits 0-1 of I_MASTER_SLAVE_PARALLEL_STATUS
+PARALLEL_ROLE_SLAVE = 2
+
+
+@dataclass(frozen=True, slots=True)
+class DeviceFacts:
+    """Firmware version and parallel role of an inverter."""
+
+    firmware_version: str | None
+    parallel_status: int | None
+
+    @property
+    def is_master(self) -> bool:
+        """Return True if the inverter is the master or standalone."""
+        if self.parallel_status is None:
+            return True  # Assume master if status is unavailable
+        return self.parallel_status & 3 != PARALLEL_ROLE_SLAVE
+
+
+def derive_device_facts(data: dict | None) -> DeviceFacts:
+    """Return the facts of an inverter from a coordinator data snapshot."""
+    data = data or {}
+    return DeviceFacts(
+        firmware_version=format_firmware_version(data.get("hold", {})),
+        parallel_status=data.get("input", {}).get(I_MASTER_SLAVE_PARALLEL_STATUS),
+    )
@@ -0,0 +1,195 @@
+"""Event-driven framing of the dongle byte stream."""
+import asyncio
+import logging
+from collections import deque
+from typing import Callable
+
+from .lxp_request_builder import LxpRequestBuilder
+from .lxp_response import LxpResponse
+from ..const import MAX_PACKET_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+# Prefix (2) + protocol number (2) + frame length (2), as parsed by LxpResponse
+FRAME_HEADER_LENGTH = 6
+# Smallest frame LxpResponse can make sense of
+MIN_FRAME_LENGTH = 8
+# Unsolicited frames kept for inspection, older ones are dropped
+MAX_UNSOLICITED_FRAMES = 20
+
+ResponseMatcher = Callable[[LxpResponse], bool]
+
+
+class LxpFrameProtocol(asyncio.Protocol):
+    """Splits the dongle byte stream into A11A frames and routes them to waiting requests.
+
+    Frames are cut on the A11A prefix and the frame length from the header, the
+    same fields LxpResponse uses. Each complete frame is offered to the pending
+    requests in the order they were registered and handed to the first whose
+    matcher accepts it. Frames nobody is waiting for (connection greetings,
+    cloud traffic, late replies) are filed as unsolicited.
+    """
+
+    def __init__(self):
+        """Initialize the protocol."""
+        self.transport = None
+        self._buffer = bytearray()
+        self._waiters: list[tuple[ResponseMatcher, asyncio.Future]] = []
+        self._unsolicited = deque(maxlen=MAX_UNSOLICITED_FRAMES)
+        self._connection_lost = False
+        self._closed = asyncio.Event()
+
+        # Framing statistics
+        self.frames_received = 0
+        self.unsolicited_frames = 0
+        self.bytes_discarded = 0
+        self.crc_errors = 0
+
+    # --- asyncio.Protocol callbacks ---
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        self._buffer += data
+        self._process_buffer()
+
+    def eof_received(self) -> bool:
+        # Let the transport close itself, connection_lost will fail pending requests
+        return False
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        self._connection_lost = True
+        self._closed.set()
+        error = exc or ConnectionResetError("Connection closed by dongle")
+        for _, future in self._waiters:
+            if not future.done():
+                future.set_exception(error)
+        self._waiters.clear()
+
+    # --- Framing ---
+
+    def _discard(self, count: int) -> None:
+        """Drop bytes from the start of the buffer that are not part of a frame."""
+        if count > 0:
+            del self._buffer[:count]
+            self.bytes_discarded += count
+
+    def _process_buffer(self) -> None:
+        """Extract every complete frame currently in the buffer."""
+        buf = self._buffer
+        prefix = LxpRequestBuilder.PREFIX
+        while buf:
+            start = buf.find(prefix)
+            if start == -1:
+                # Keep a trailing first prefix byte, the rest of the prefix may still arrive
+                self._discard(len(buf) - 1 if buf[-1] == prefix[0] else len(buf))
+                return
+            self._discard(start)
+
+            if len(buf) < FRAME_HEADER_LENGTH:
+                return
+
+            packet_length = int.from_bytes(buf[4:6], 'little') + FRAME_HEADER_LENGTH
+            if packet_length < MIN_FRAME_LENGTH or packet_length > MAX_PACKET_SIZE:
+                # Not a real header, resynchronise on the next prefix
+                self._discard(len(prefix))
+                continue
+
+            if len(buf) < packet_length:
+                return
+
+            frame = bytes(buf[:packet_length])
+            del buf[:packet_length]
+            self._dispatch(LxpResponse(frame))
+
+    def _dispatch(self, response: LxpResponse) -> None:
+        """Hand a frame to the first request waiting for it, or file it as unsolicited."""
+        self.frames_received += 1
+        if response.packet_error and response.tcp_function == LxpRequestBuilder.TRANSLATED_DATA:
+            # Failed the CRC (or is too short to hold one), no request matches it
+            self.crc_errors += 1
+        for index, (matcher, future) in enumerate(self._waiters):
+            if not future.done() and matcher(response):
+                del self._waiters[index]
+                future.set_result(response)
+                return
+
+        self.unsolicited_frames += 1
+        self._unsolicited.append(response)
+        _LOGGER.debug("Unsolicited frame from dongle: %s", response.info)
+
+    # --- Request API ---
+
+    @property
+    def is_alive(self) -> bool:
+        """Return True if the connection can still be used for a request."""
+        return (
+            self.transport is not None
+            and not self._connection_lost
+            and not self.transport.is_closing()
+        )
+
+    @property
+    def pending_requests(self) -> int:
+        """Number of requests still waiting for their response."""
+        return len(self._waiters)
+
+    def expect(self, matcher: ResponseMatcher) -> asyncio.Future:
+        """Register interest in the next frame accepted by matcher."""
+        future = asyncio.get_running_loop().create_future()
+        if self._connection_lost:
+            future.set_exception(ConnectionResetError("Connection closed by dongle"))
+        else:
+            self._waiters.append((matcher, future))
+        return future
+
+    def forget(self, future: asyncio.Future) -> None:
+        """Stop waiting for a response, e.g. after a timeout."""
+        self._waiters = [waiter for waiter in self._waiters if waiter[1] is not future]
+        if not future.done():
+            future.cancel()
+
+    def send(self, packet: bytes) -> None:
+        """Write a request packet to the dongle."""
+        if not self.is_alive:
+            raise ConnectionResetError("Connection to dongle is closed")
+        self.transport.write(packet)
+
+    async def async_request(self, packet: bytes, matcher: ResponseMatcher, timeout: float) -> LxpResponse:
+        """Send a packet and wait for the matching response.
+
+        Raises asyncio.TimeoutError if no matching frame arrives in time.
+        """
+        future = self.expect(matcher)
+        try:
+            self.send(packet)
+            return await asyncio.wait_for(future, timeout=timeout)
+        finally:
+            self.forget(future)
+
+    def pop_unsolicited(self) -> list[LxpResponse]:
+        """Return and clear the unsolicited frames received so far."""
+        frames = list(self._unsolicited)
+        self._unsolicited.clear()
+        return frames
+
+    def close(self) -> None:
+        """Close the underlying transport."""
+        if self.transport is not None:
+            self.transport.close()
+
+    async def wait_closed(self) -> None:
+        """Wait until the connection is fully closed."""
+        if self.transport is None:
+            return
+        await self._closed.wait()
+
+    def get_stats(self) -> dict:
+        """Get framing statistics for monitoring and debugging."""
+        return {
+            "frames_received": self.frames_received,
+            "unsolicited_frames": self.unsolicited_frames,
+            "bytes_discarded": self.bytes_discarded,
+            "crc_errors": self.crc_errors,
+        }
@@ -1,36 +1,40 @@
 """Inverter model discovery via Modbus connection."""
-import asyncio
-
+from .connection_manager import ModbusConnectionManager
 from .lxp_request_builder import LxpRequestBuilder
-from .lxp_response import LxpResponse
+from ..const import READ_TIMEOUT
 from ..utils import decode_model_from_registers
 
 # Discovery-specific constants
 MODEL_REGISTER_START = 7
 MODEL_REGISTER_COUNT = 2
 HOLD_REGISTER_READ_FUNCTION = 3
-DISCOVERY_BUFFER_SIZE = 512
 
 
 async def get_inverter_model_from_device(host, port, dongle_serial, inverter_serial):
     """Attempt to connect to the inverter and read the model."""
+    connection_manager = ModbusConnectionManager(host, port, connection_retries=1)
+    session = None
     try:
-        reader, writer = await asyncio.open_connection(host, port)
+        session = await connection_manager.async_connect()
         req = LxpRequestBuilder.prepare_packet_for_read(
             dongle_serial.encode(), inverter_serial.encode(),
             MODEL_REGISTER_START, MODEL_REGISTER_COUNT, HOLD_REGISTER_READ_FUNCTION
         )
-        writer.write(req)
-        await writer.drain()
-        response_buf = await reader.read(DISCOVERY_BUFFER_SIZE)
-        writer.close()
-        await writer.wait_closed()
-        if not response_buf:
-            return None
-        response = LxpResponse(response_buf)
+        # Greeting frames sent by the dongle on connect are skipped by the matcher
+        response = await session.async_request(
+            req,
+            lambda resp: (
+                resp.tcp_function == LxpRequestBuilder.TRANSLATED_DATA
+                and resp.device_function == HOLD_REGISTER_READ_FUNCTION
+                and resp.register == MODEL_REGISTER_START
+            ),
+            READ_TIMEOUT,
+        )
         if response.packet_error:
             return None
         model = decode_model_from_registers(response.parsed_values_dictionary)
         return model
     except Exception:
         return None
+    finally:
+        await connection_manager.async_close(session)
@@ -36,17 +36,13 @@ class LxpBatteries:
         parsed = self.response.parsed_values_dictionary
 
         # Extract serial number (zero-terminated UTF-8 string)
-        serial_bytes = self.response.value[start + (B_SERIAL_START * 2):start + (B_SERIAL_START * 2) + B_SERIAL_LEN + 1]
+        serial_bytes = bytes(self.response.value[start + (B_SERIAL_START * 2):start + (B_SERIAL_START * 2) + B_SERIAL_LEN + 1])
         zero_index = serial_bytes.find(b'\x00')
         data['serial'] = (serial_bytes if zero_index == -1 else serial_bytes[:zero_index]).decode("utf-8")
 
-        # Remove serial registers from parsed dict (they're not numeric values)
-        for n in range(B_SERIAL_START, 27):
-            parsed.pop(start_reg + n, None)
-
-        # Keep remaining block registers as numeric data
+        # Keep the block registers as numeric data, except the serial registers (not numeric values)
         for reg in range(start_reg, start_reg + 30):
-            if reg in parsed:
+            if reg in parsed and not B_SERIAL_START <= reg - start_reg < 27:
                 data[reg - start_reg] = parsed[reg]
 
         return data
@@ -1,12 +1,40 @@
+CRC_INIT = 0xFFFF
+CRC_POLYNOMIAL = 0xA001  # CRC-16/Modbus, reflected
+
+
+def _crc_table() -> tuple[int, ...]:
+    """Return the CRC of every byte value, as used by the table-driven update."""
+    table = []
+    for byte in range(256):
+        crc = byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ CRC_POLYNOMIAL if crc & 1 else crc >> 1
+        table.append(crc)
+    return tuple(table)
+
+
+CRC_TABLE = _crc_table()
+
+
 class LxpPacketUtils:
     @staticmethod
-    def compute_crc(data: bytes) -> int:
-        crc = 0xFFFF
-        for pos in data:
-            crc ^= pos
-            for _ in range(8):
-                if (crc & 1) != 0:
-                    crc = (crc >> 1) ^ 0xA001
-                else:
-                    crc >>= 1
-        return crc & 0xFFFF
\ No newline at end of file
+    def compute_crc(data: bytes | bytearray | memoryview) -> int:
+        """Return the CRC-16/Modbus of data.
+
+        Any bytes-like object is accepted; slices of a memoryview are read in
+        place, without copying.
+        """
+        return LxpPacketUtils.update_crc(CRC_INIT, data)
+
+    @staticmethod
+    def update_crc(crc: int, data: bytes | bytearray | memoryview) -> int:
+        """Continue a CRC-16/Modbus with more data.
+
+        Starting from CRC_INIT and feeding a frame in pieces gives the same
+        result as compute_crc over the whole frame, so partial frames can be
+        checked as they arrive.
+        """
+        table = CRC_TABLE
+        for byte in data:
+            crc = (crc >> 8) ^ table[(crc ^ byte) & 0xFF]
+        return crc
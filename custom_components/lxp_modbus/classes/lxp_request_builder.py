@@ -1,4 +1,6 @@
-from .lxp_packet_utils import LxpPacketUtils
+from collections.abc import Sequence
+
+from .lxp_packet_utils import CRC_INIT, LxpPacketUtils
 
 class LxpRequestBuilder:
     PREFIX = bytes([0xA1, 0x1A])
@@ -8,6 +10,14 @@ class LxpRequestBuilder:
     TRANSLATED_DATA = 194
     ACTION_WRITE = 0
     WRITE_SINGLE = 6
+    WRITE_MULTI = 16
+    # Write multiple requests carry a value length byte, announced by protocol 2
+    PROTOCOL_WRITE_MULTI = 2
+
+    @staticmethod
+    def encode_value(value: int) -> bytes:
+        """Encode a register value as unsigned 16 bit, negative values in two's complement."""
+        return (value & 0xFFFF).to_bytes(2, 'little')
 
     @staticmethod
     def prepare_packet_for_read(
@@ -61,9 +71,90 @@ class LxpRequestBuilder:
         buf += LxpRequestBuilder.WRITE_SINGLE.to_bytes(1, 'little')
         buf += serial_number
         buf += register.to_bytes(2, 'little')
-        buf += value.to_bytes(2, 'little', signed=True)
+        buf += LxpRequestBuilder.encode_value(value)
 
         data_frame = bytes(buf[20:36])  # always 16 bytes
         crc = LxpPacketUtils.compute_crc(data_frame)
         buf += crc.to_bytes(2, 'little')
-        return bytes(buf)
\ No newline at end of file
+        return bytes(buf)
+
+    @staticmethod
+    def prepare_packet_for_write_multi(
+        dongle_serial: bytes, serial_number: bytes, start_register: int, values: Sequence[int]
+    ) -> bytes:
+        if len(dongle_serial) != 10:
+            raise ValueError("dongle_serial must be 10 bytes")
+        if len(serial_number) != 10:
+            raise ValueError("serial_number must be 10 bytes")
+        if not values:
+            raise ValueError("values must not be empty")
+
+        data_frame = bytearray()
+        data_frame += LxpRequestBuilder.ACTION_WRITE.to_bytes(1, 'little')
+        data_frame += LxpRequestBuilder.WRITE_MULTI.to_bytes(1, 'little')
+        data_frame += serial_number
+        data_frame += start_register.to_bytes(2, 'little')
+        data_frame += len(values).to_bytes(2, 'little')
+        data_frame += (2 * len(values)).to_bytes(1, 'little')
+        for value in values:
+            data_frame += LxpRequestBuilder.encode_value(value)
+
+        buf = bytearray()
+        buf += LxpRequestBuilder.PREFIX
+        buf += LxpRequestBuilder.PROTOCOL_WRITE_MULTI.to_bytes(2, 'little')
+        buf += (14 + len(data_frame) + 2).to_bytes(2, 'little')  # everything after the frame length
+        buf += (1).to_bytes(1, 'little')
+        buf += LxpRequestBuilder.TRANSLATED_DATA.to_bytes(1, 'little')
+        buf += dongle_serial
+        buf += (len(data_frame) + 2).to_bytes(2, 'little')
+        buf += data_frame
+        buf += LxpPacketUtils.compute_crc(bytes(data_frame)).to_bytes(2, 'little')
+        return bytes(buf)
+
+class LxpRequestCache:
+    """Request packets for one dongle/inverter pair, built once and reused.
+
+    A read packet only depends on (function, start, count), so each one is
+    built on first use and cached. Write packets are patched from a template
+    in which only the register, value and CRC change; the CRC of the fixed
+    part is computed once and continued over the patched bytes.
+    """
+
+    # Cached read packets; the poll schedule only needs a few dozen
+    MAX_READS = 256
+
+    def __init__(self, dongle_serial: bytes, serial_number: bytes):
+        self._dongle_serial = dongle_serial
+        self._serial_number = serial_number
+        self._reads: dict[tuple[int, int, int], bytes] = {}
+        self._write_prefix = None
+        self._write_crc = None
+
+    def read(self, start_register: int, register_count: int = 1, function_code: int = 3) -> bytes:
+        """Return the packet reading register_count registers from start_register."""
+        key = (function_code, start_register, register_count)
+        packet = self._reads.get(key)
+        if packet is None:
+            packet = LxpRequestBuilder.prepare_packet_for_read(
+                self._dongle_serial, self._serial_number, start_register, register_count, function_code
+            )
+            if len(self._reads) >= self.MAX_READS:
+                self._reads.clear()
+            self._reads[key] = packet
+        return packet
+
+    def write(self, register: int, value: int) -> bytes:
+        """Return the packet writing value to a single register."""
+        if self._write_prefix is None:
+            template = LxpRequestBuilder.prepare_packet_for_write(self._dongle_serial, self._serial_number, 0, 0)
+            self._write_prefix = template[:32]  # everything up to the register
+            self._write_crc = LxpPacketUtils.update_crc(CRC_INIT, template[20:32])
+        tail = register.to_bytes(2, 'little') + LxpRequestBuilder.encode_value(value)
+        crc = LxpPacketUtils.update_crc(self._write_crc, tail)
+        return self._write_prefix + tail + crc.to_bytes(2, 'little')
+
+    def write_multi(self, start_register: int, values: Sequence[int]) -> bytes:
+        """Return the packet writing values to consecutive registers from start_register."""
+        return LxpRequestBuilder.prepare_packet_for_write_multi(
+            self._dongle_serial, self._serial_number, start_register, values
+        )
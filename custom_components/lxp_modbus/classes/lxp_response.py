@@ -1,3 +1,6 @@
+import sys
+from array import array
+
 from .lxp_packet_utils import LxpPacketUtils
 from .lxp_request_builder import LxpRequestBuilder
 
@@ -5,6 +8,12 @@ from ..const import RESPONSE_OVERHEAD
 
 
 class LxpResponse:
+    """Decodes one A11A frame.
+
+    The packet is not copied: data_frame and value are memoryviews into it,
+    registers reinterprets value as 16-bit words, and the register dict is
+    built once, on first use. The serials are small and kept as bytes.
+    """
 
     def __init__(self, packet: bytes):
         self.packet_error = True
@@ -13,6 +22,7 @@ class LxpResponse:
         self.protocol_number = -1
         self.tcp_function = -1
         self.register = -1
+        self.register_count = 0
         self.device_function = -1
         self.frame_length = -1
         self.data_length = -1
@@ -20,6 +30,12 @@ class LxpResponse:
         self.dongle_serial = None
         self.serial_number = None
         self.value = bytes()  # Initialize empty value to prevent AttributeError
+        self._parsed_values_dictionary = None
+
+        if isinstance(packet, bytearray):
+            # A view would pin a buffer the caller may still resize
+            packet = bytes(packet)
+        view = memoryview(packet)
 
         if len(packet) < 8:
             self.error_type = "Packet too small"
@@ -46,24 +62,31 @@ class LxpResponse:
             self.dongle_serial = packet[8:18]
             self.data_length = int.from_bytes(packet[18:20], 'little')
 
-            if not self.__get_data_frame(packet, 20):
-               return            
+            if not self.__get_data_frame(view, 20):
+               return
 
             self.address_action = self.data_frame[0]
             self.device_function = self.data_frame[1]
-            self.serial_number = self.data_frame[2:12]
+            self.serial_number = bytes(self.data_frame[2:12])
             self.register = int.from_bytes(self.data_frame[12:14], 'little')
 
             self.value_length_byte_present = (
-                self.protocol_number in [2, 5] and (self.device_function != 6 and self.device_function < 0x80)
+                self.protocol_number in [2, 5]
+                and self.device_function not in (LxpRequestBuilder.WRITE_SINGLE, LxpRequestBuilder.WRITE_MULTI)
+                and self.device_function < 0x80
             )
             if self.value_length_byte_present:
                 self.value_length = self.data_frame[14]
                 self.value = self.data_frame[15:15+self.value_length]
+            elif self.device_function == LxpRequestBuilder.WRITE_MULTI:
+                # Acknowledges the start register and the number of registers written
+                self.value_length = 0
+                self.value = bytes()
+                self.register_count = int.from_bytes(self.data_frame[14:16], 'little')
             elif self.device_function >= 0x80:
                 self.value_length = 0 
-                self.value = []
-                self.exception = self.data_frame[14] 
+                self.value = bytes()
+                self.exception = self.data_frame[14]
             else:
                 self.value_length = 2
                 self.value = self.data_frame[14:16]
@@ -77,13 +100,13 @@ class LxpResponse:
             self.dongle_serial = packet[8:18]
 
             # Messages found have single byte, dont appear to any validation
-            self.value = packet[18:]
+            self.value = view[18:]
             self.value_length = len(self.value)
         else:
             self.packet_error = True
             # Unknown how the crc is calculated on other packet types
             # the function is called but returning wrong, at this moment cant know if it came with a CRC....
-            if not self.__get_data_frame(packet, 8):
+            if not self.__get_data_frame(view, 8):
                self.error_type = f"Unsupported tcp_function={self.tcp_function} {self.error_type}"
                return
                
@@ -106,20 +129,27 @@ class LxpResponse:
         return True
 
     @property
-    def parsed_values(self):
+    def registers(self) -> memoryview | array:
+        """Register values as unsigned 16-bit words, a view of value on little-endian hosts."""
         if len(self.value) % 2 != 0 or self.exception:
-            return []
-        return [self.value[i] | (self.value[i+1] << 8) for i in range(0, len(self.value), 2)]
+            return array('H')
+        if sys.byteorder == "little":
+            return memoryview(self.value).cast('H')
+        registers = array('H', bytes(self.value))
+        registers.byteswap()
+        return registers
+
+    @property
+    def parsed_values(self):
+        return self.registers.tolist()
 
     @property
     def parsed_values_dictionary(self):
-        if len(self.value) % 2 != 0 or self.exception:
-            return {}
-        start_register = self.register
-        return {
-            start_register + i: self.value[2*i] | (self.value[2*i+1] << 8)
-            for i in range(len(self.value) // 2)
-        }
+        """Register values keyed by register number, built on first access and shared after."""
+        if self._parsed_values_dictionary is None:
+            registers = self.registers
+            self._parsed_values_dictionary = dict(zip(range(self.register, self.register + len(registers)), registers))
+        return self._parsed_values_dictionary
 
     @property
     def info(self):
@@ -2,153 +2,507 @@
 import asyncio
 import logging
 import time as time_lib
+from collections import deque
 
 from homeassistant.helpers.update_coordinator import UpdateFailed
 
 from ..const import (
     BATTERY_INFO_START_REGISTER,
+    BLOCK_READ_RETRIES,
+    BLOCK_READ_TIMEOUT,
     DEFAULT_CONNECTION_RETRIES,
+    DEFAULT_PIPELINE_WINDOW,
+    HOLD_SENTINEL_COUNT,
+    HOLD_SENTINEL_MAX_SKIPS,
+    HOLD_SENTINEL_START,
     INITIAL_RETRY_DELAY,
     MAX_CACHED_DATA_FAILURES,
     MAX_EMPTY_DATA_FAILURES,
+    POLL_RESUME_LIMIT,
+    POLL_TIERS,
     READ_TIMEOUT,
-    RESPONSE_OVERHEAD,
     RETRY_BACKOFF_MULTIPLIER,
+    TIER_ENERGY,
+    TIER_HOLD,
     TOTAL_REGISTERS,
-    WRITE_RESPONSE_LENGTH,
+    WRITE_MULTI_MAX_REGISTERS,
     WRITE_RETRY_DELAY,
 )
 from ..constants.input_registers import I_BAT_PARALLEL_NUM
 from .connection_manager import ModbusConnectionManager
-from .data_validator import is_data_sane
+from .data_validator import invalid_registers
 from .lxp_batteries import LxpBatteries
-from .lxp_request_builder import LxpRequestBuilder
+from .lxp_packet_utils import LxpPacketUtils
+from .lxp_request_builder import LxpRequestBuilder, LxpRequestCache
 from .lxp_response import LxpResponse
-from .packet_recovery import PacketRecoveryHandler
+from .read_plan import compile_read_plan, full_read_plan, merge_ranges
+from .register_store import RegisterBlock, RegisterStore
+from .request_scheduler import PRIORITY_POLL, PRIORITY_READ, PRIORITY_WRITE, RequestScheduler
+from .transport import LxpTransport
 
 _LOGGER = logging.getLogger(__name__)
 
+# Modbus exception code of a function the inverter does not support
+ILLEGAL_FUNCTION = 1
+
 # Backward-compatible re-exports for tests
 from .data_validator import HOLD_TIME_REGISTERS  # noqa: F401
 
 
+def _contiguous_blocks(values: dict[int, int], max_count: int) -> list[tuple[int, list[int]]]:
+    """Group register values, sorted by register, into (start, values) runs of at most max_count."""
+    blocks = []
+    for register, value in values.items():
+        if blocks and register == blocks[-1][0] + len(blocks[-1][1]) and len(blocks[-1][1]) < max_count:
+            blocks[-1][1].append(value)
+        else:
+            blocks.append((register, [value]))
+    return blocks
+
+
 class LxpModbusApiClient:
     """A client for communicating with a LuxPower inverter.
 
     Orchestrates register reading and writing using composed dependencies:
-    - ModbusConnectionManager: TCP connection lifecycle
-    - PacketRecoveryHandler: Malformed packet recovery
-    - Data validation via is_data_sane()
+    - ModbusConnectionManager: TCP connection lifecycle, framing and response routing
+    - Data validation via invalid_registers(), dropping implausible registers
     """
 
-    def __init__(self, host: str, port: int, dongle_serial: str, inverter_serial: str, lock: asyncio.Lock,
+    def __init__(self, host: str, port: int, dongle_serial: str, inverter_serial: str, lock: RequestScheduler,
                  block_size: int = 125, connection_retries: int = DEFAULT_CONNECTION_RETRIES,
-                 skip_initial_data: bool = True, request_battery_data: bool = False):
-        """Initialize the API client."""
+                 skip_initial_data: bool = True, request_battery_data: bool = False,
+                 persistent_connection: bool = False,
+                 connection_manager: ModbusConnectionManager | None = None,
+                 pipeline_window: int = DEFAULT_PIPELINE_WINDOW,
+                 hold_sentinel_check: bool = False,
+                 transport: LxpTransport | None = None):
+        """Initialize the API client.
+
+        lock schedules the polls and writes of every client sharing the
+        dongle connection. A connection_manager can be passed in to share one session between
+        several clients talking to the same dongle. transport replaces the
+        TCP connection to host:port, e.g. with a dongle simulator. pipeline_window is the
+        number of block reads kept in flight at once, 1 reads them serially.
+        With hold_sentinel_check a few frequently changed hold registers are
+        read first, and the rest only if they changed or were skipped
+        HOLD_SENTINEL_MAX_SKIPS times in a row.
+        """
         self._dongle_serial = dongle_serial
         self._inverter_serial = inverter_serial
         self._lock = lock
+        # Slot of the poll in progress, which lets waiting writes run between its block reads
+        self._poll_slot = None
         self._block_size = block_size
         self._connection_retries = connection_retries
         self._request_battery_data = request_battery_data
-        self._last_good_input_regs = {}
-        self._last_good_hold_regs = {}
+        self._last_good_input_regs = RegisterStore()
+        self._last_good_hold_regs = RegisterStore()
         self._last_good_battery_data = {}
+        # Registers (and battery serials) whose value changed, until pop_changes()
+        self._changes = {"input": set(), "hold": set(), "battery": set()}
         self._connection_retry_count = 0
         self._last_successful_connection = None
         self._connection_failure_count = 0
 
-        # Composed dependencies
-        self._connection_manager = ModbusConnectionManager(
-            host, port, connection_retries, skip_initial_data
-        )
-        self._packet_recovery = PacketRecoveryHandler()
-
-    async def async_safe_packet_recovery(self, reader, response_buf: bytes,
-                                         expected_length: int, request_type: str,
-                                         function_code: int) -> LxpResponse:
-        """Delegate packet recovery to the PacketRecoveryHandler."""
-        return await self._packet_recovery.async_attempt_recovery(
-            reader, response_buf, expected_length, request_type, function_code
-        )
+        # Descriptions of the entities in use, None sweeps every register
+        self._plan_descriptions = None
+        # Compiled read plans keyed by the set of tiers polled together
+        self._read_plans = {}
+        # Hold register cache: _last_good_hold_regs is kept current by confirmed
+        # writes and revalidated with the hold tier, fully when a refresh is requested
+        self._hold_refresh_requested = False
+        self._hold_sentinel_check = hold_sentinel_check
+        self._hold_checksum = None
+        self._hold_cache_hits = 0
+        self._hold_cache_misses = 0
+        self._hold_forced_reads = 0
+        # Hold polls answered from the cache since the last full hold read
+        self._hold_skips = 0
+
+        # Pipelined reads
+        self._pipeline_window = max(1, pipeline_window)
+        self._pipeline_fallback = False
+        self._pipelined_requests = 0
+        self._pipeline_timeouts = 0
+
+        # Block reads by (request type, start register): reads, retries and failures
+        self._block_stats = {}
+        self._poll_resumes = 0
+
+        # Cleared once the inverter rejects write multiple (0x10) requests
+        self._write_multi_supported = True
 
-    async def async_request_registers(self, writer, reader, reg, request_type, function_code) -> dict:
-        """Request a block of registers and return parsed values."""
-        count = min(self._block_size, TOTAL_REGISTERS - reg)
-        req = LxpRequestBuilder.prepare_packet_for_read(
-            self._dongle_serial.encode(), self._inverter_serial.encode(),
-            reg, count, function_code
+        # Composed dependencies
+        self._connection_manager = connection_manager or ModbusConnectionManager(
+            host, port, connection_retries, skip_initial_data, persistent_connection, transport
         )
-        expected_length = RESPONSE_OVERHEAD + (count * 2)
-        writer.write(req)
-        await writer.drain()
-        response_buf = await asyncio.wait_for(reader.read(expected_length), timeout=READ_TIMEOUT)
-
+        self._requests = LxpRequestCache(dongle_serial.encode(), inverter_serial.encode())
+
+    def _response_matcher(self, function_code: int, register: int):
+        """Build a matcher accepting the reply (or exception) to a request for function_code/register."""
+        inverter_serial = self._inverter_serial.encode()
+
+        def matcher(response: LxpResponse) -> bool:
+            return (
+                response.tcp_function == LxpRequestBuilder.TRANSLATED_DATA
+                and not response.packet_error
+                and (response.device_function & 0x7F) == function_code
+                and response.register == register
+                and response.serial_number == inverter_serial
+            )
+
+        return matcher
+
+    def _prepare_read(self, reg: int, function_code: int, count: int | None = None) -> tuple[int, bytes]:
+        """Return the register count and request packet for the block starting at reg."""
+        if count is None:
+            count = min(self._block_size, TOTAL_REGISTERS - reg)
+        return count, self._requests.read(reg, count, function_code)
+
+    def _parse_block(self, response: LxpResponse, req: bytes, reg: int, count: int,
+                     request_type: str, function_code: int) -> dict:
+        """Validate a block read reply and return its plausible values, or {} if unusable."""
         _LOGGER.debug(
-            "Polling %s(%d) %d-%d: Req[%d]: %s, Resp[%d/%d]: %s",
+            "Polling %s(%d) %d-%d: Req[%d]: %s, Resp: %s",
             request_type,
             function_code,
             reg, reg + count - 1,
             len(req),
             req.hex(),
-            len(response_buf) if response_buf else 0,
-            expected_length,
-            response_buf.hex() if response_buf else "None"
+            response.info
         )
 
-        if response_buf and len(response_buf) > RESPONSE_OVERHEAD:
-            response = LxpResponse(response_buf)
-
-            # Attempt safe packet recovery if needed
-            if response.packet_error and response.packet_length_calced > expected_length:
-                response = await self.async_safe_packet_recovery(
-                    reader, response_buf, expected_length, request_type, function_code
-                )
+        if (not response.packet_error
+           and response.serial_number == self._inverter_serial.encode()
+           and function_code == response.device_function
+           and reg == response.register
+           ):
+
+            if len(response.parsed_values_dictionary) != count:
+                _LOGGER.debug("%s(%s) response has different register count (%s) than requested (%s)",
+                              request_type, function_code, len(response.parsed_values_dictionary), count)
+
+            # Battery data needs special decoding — returns dict keyed by serial
+            if response.register == BATTERY_INFO_START_REGISTER:
+                bat_dict = LxpBatteries(response).get_battery_info()
+                _LOGGER.debug("Battery data decoded: %s", list(bat_dict.keys()))
+                return bat_dict
+
+            registers = response.registers
+            invalid = invalid_registers(reg, registers, request_type)
+            if invalid:
+                # Keep the plausible registers, the dropped ones keep their last good value
+                _LOGGER.debug("Dropping implausible %s registers %s: %s", request_type, invalid,
+                              [registers[register - reg] for register in invalid])
+                invalid = set(invalid)
+                return {register: value for register, value in zip(range(reg, reg + len(registers)), registers)
+                        if register not in invalid}
+
+            return RegisterBlock(reg, registers)
+
+        _LOGGER.debug("ignoring %s(%s) packet for regs %s-%s : response=%s",
+                      request_type, function_code, reg, reg + count - 1, response.info)
+        return {}
 
-            if (not response.packet_error
-               and response.serial_number == self._inverter_serial.encode()
-               and function_code == response.device_function
-               and reg == response.register
-               and is_data_sane(response.parsed_values_dictionary, request_type)
-               ):
+    async def async_request_registers(self, session, reg, request_type, function_code, count=None) -> dict:
+        """Request a block of registers and return parsed values.
 
-                if len(response.parsed_values_dictionary) != count:
-                    _LOGGER.debug("%s(%s) response has different register count (%s) than requested (%s)",
-                                  request_type, function_code, len(response.parsed_values_dictionary), count)
+        count defaults to a full block, clipped to the register space.
+        """
+        count, req = self._prepare_read(reg, function_code, count)
+        response = await session.async_request(
+            req, self._response_matcher(function_code, reg), BLOCK_READ_TIMEOUT
+        )
+        return self._parse_block(response, req, reg, count, request_type, function_code)
+
+    async def async_request_blocks(self, session, blocks, request_type, function_code, values=None,
+                                   read=None) -> dict:
+        """Request several (start, count) register blocks and return their merged parsed values.
+
+        Values are merged into the values dict when one is given, so blocks
+        read before a timeout are kept by the caller. The start register of
+        each block read is added to the read set when one is given, and
+        blocks already in it are skipped, so a poll can resume where it
+        stopped.
+
+        With a pipeline window above 1 up to that many requests are in flight
+        at once. Blocks whose pipelined request timed out are read again one
+        at a time, and the client stays in serial mode from then on.
+        """
+        if values is None:
+            values = {}
+        if read is None:
+            read = set()
+        remaining = [block for block in blocks if block[0] not in read]
+
+        if self._pipeline_window > 1 and not self._pipeline_fallback and len(remaining) > 1:
+            timeouts = self._pipeline_timeouts
+            remaining = await self._async_request_pipelined(
+                session, remaining, request_type, function_code, values, read)
+            if self._pipeline_timeouts > timeouts:
+                self._pipeline_fallback = True
+                _LOGGER.warning("Dongle did not answer pipelined %s requests in time, "
+                                "falling back to one request at a time", request_type)
+
+        for reg, count in remaining:
+            await self._async_yield_to_writes(session)
+            values.update(await self._async_read_block(session, reg, request_type, function_code, count))
+            read.add(reg)
+        return values
+
+    def _block_read_stats(self, request_type: str, reg: int) -> dict:
+        stats = self._block_stats.get((request_type, reg))
+        if stats is None:
+            stats = self._block_stats[(request_type, reg)] = {"reads": 0, "retries": 0, "failures": 0}
+        return stats
+
+    async def _async_read_block(self, session, reg, request_type, function_code, count) -> dict:
+        """Read one block, retrying it up to BLOCK_READ_RETRIES times if it timed out or was unusable.
+
+        Returns {} if every reply was unusable. Raises asyncio.TimeoutError if
+        the last attempt got no reply either, as the connection is likely gone,
+        and OSError (e.g. ConnectionResetError) at once if the connection closed.
+        """
+        stats = self._block_read_stats(request_type, reg)
+        for attempt in range(BLOCK_READ_RETRIES + 1):
+            if attempt:
+                stats["retries"] += 1
+                _LOGGER.debug("Retrying %s(%d) block %d-%d (attempt %d/%d)", request_type, function_code,
+                              reg, reg + count - 1, attempt + 1, BLOCK_READ_RETRIES + 1)
+            try:
+                block = await self.async_request_registers(session, reg, request_type, function_code, count)
+            except asyncio.TimeoutError:
+                if attempt == BLOCK_READ_RETRIES:
+                    stats["failures"] += 1
+                    raise
+                continue
+            except OSError:
+                # Retrying on a closed connection can't help, the poll reconnects
+                stats["failures"] += 1
+                raise
+            if block:
+                stats["reads"] += 1
+                return block
+        stats["failures"] += 1
+        return {}
 
-                # Battery data needs special decoding — returns dict keyed by serial
-                if response.register == BATTERY_INFO_START_REGISTER:
-                    bat_dict = LxpBatteries(response).get_battery_info()
-                    _LOGGER.debug("Battery data decoded: %s", list(bat_dict.keys()))
-                    return bat_dict
+    async def _async_yield_to_writes(self, session) -> None:
+        """Let waiting writes use the session of the poll in progress, between two block reads."""
+        slot = self._poll_slot
+        if slot is not None and not await slot.async_yield(session):
+            # A write timed out on it, a late reply could still arrive
+            raise asyncio.TimeoutError("Session failed during a write")
+
+    async def _async_request_pipelined(self, session, blocks, request_type, function_code, values, read) -> list:
+        """Read blocks keeping up to pipeline_window requests in flight.
+
+        Replies are routed to their request by function code and start
+        register, so they may arrive in any order. Each request has its own
+        READ_TIMEOUT counted from when it was sent: the dongle answers queued
+        requests one after the other, so a reply also waits for the replies
+        ahead of it, and the shorter BLOCK_READ_TIMEOUT would expire on a
+        full window. Blocks it misses are read again serially with
+        BLOCK_READ_TIMEOUT and retries. After the first timeout no
+        new requests are sent; the timed out, unusable and unsent blocks are
+        returned.
+        """
+        loop = asyncio.get_running_loop()
+        in_flight = deque()
+        unanswered = []
+        next_index = 0
+        stalled = False
 
-                return response.parsed_values_dictionary
-            else:
-                _LOGGER.debug("ignoring %s(%s) packet for regs %s-%s : response=%s",
-                              request_type, function_code, reg, reg + count - 1, response.info)
+        try:
+            while in_flight or (next_index < len(blocks) and not stalled):
+                while not stalled and next_index < len(blocks) and len(in_flight) < self._pipeline_window:
+                    # Replies in flight are routed by their matchers, a write can go in between
+                    await self._async_yield_to_writes(session)
+                    reg, count = blocks[next_index]
+                    next_index += 1
+                    count, req = self._prepare_read(reg, function_code, count)
+                    future = session.expect(self._response_matcher(function_code, reg))
+                    session.send(req)
+                    self._pipelined_requests += 1
+                    in_flight.append((reg, count, req, future, loop.time() + READ_TIMEOUT))
+
+                reg, count, req, future, deadline = in_flight.popleft()
+                try:
+                    response = await asyncio.wait_for(future, timeout=max(0, deadline - loop.time()))
+                except asyncio.TimeoutError:
+                    _LOGGER.debug("Pipelined %s(%d) request for reg %d timed out", request_type, function_code, reg)
+                    self._pipeline_timeouts += 1
+                    unanswered.append((reg, count))
+                    stalled = True
+                    continue
+                finally:
+                    session.forget(future)
+
+                block = self._parse_block(response, req, reg, count, request_type, function_code)
+                if not block:
+                    # Read again one at a time, with retries
+                    unanswered.append((reg, count))
+                    continue
+                values.update(block)
+                read.add(reg)
+                self._block_read_stats(request_type, reg)["reads"] += 1
+        finally:
+            for _, _, _, future, _ in in_flight:
+                session.forget(future)
+
+        return unanswered + list(blocks[next_index:])
+
+    async def async_discard_initial_data(self, session):
+        """Delegate initial data discard to the connection manager."""
+        await self._connection_manager.async_discard_initial_data(session)
 
-        return {}
+    @property
+    def hold_registers(self) -> RegisterStore:
+        """Last known hold register values, kept current by confirmed writes."""
+        return self._last_good_hold_regs
 
-    async def async_discard_initial_data(self, reader):
-        """Delegate initial data discard to the connection manager."""
-        await self._connection_manager.async_discard_initial_data(reader)
+    def get_scheduler_stats(self) -> dict:
+        """Get queue wait statistics of the polls and writes sharing the dongle."""
+        return self._lock.get_stats()
 
     def get_recovery_stats(self) -> dict:
-        """Get packet recovery statistics for monitoring and debugging."""
-        return self._packet_recovery.get_stats()
+        """Get statistics of the corrupt data the framing recovered from.
+
+        bytes_discarded counts bytes skipped to resynchronise on a frame
+        prefix, crc_errors the replies failing their CRC, over all sessions.
+        """
+        stats = self._connection_manager.get_framing_stats()
+        return {key: stats.get(key, 0) for key in ("frames_received", "bytes_discarded", "crc_errors")}
+
+    def get_connection_stats(self) -> dict:
+        """Get connection session statistics for monitoring and debugging."""
+        return self._connection_manager.get_stats()
+
+    def set_read_plan(self, descriptions) -> None:
+        """Poll only the registers used by the given entity descriptions.
+
+        Passing None goes back to sweeping every register.
+        """
+        self._plan_descriptions = list(descriptions) if descriptions is not None else None
+        self._read_plans = {}
+
+    def _read_plan_for(self, tiers: frozenset) -> dict:
+        """Return the (start, count) ranges to poll for the given tiers."""
+        plan = self._read_plans.get(tiers)
+        if plan is None:
+            if self._plan_descriptions is None:
+                plan = full_read_plan(self._block_size, tiers)
+            else:
+                plan = compile_read_plan(self._plan_descriptions, self._block_size, tiers)
+                _LOGGER.debug("Read plan for %s: input %s, hold %s",
+                              sorted(tiers), plan["input"], plan["hold"])
+            self._read_plans[tiers] = plan
+        return plan
+
+    def pop_changes(self) -> dict[str, set]:
+        """Return what changed since the last call: registers per type, and battery serials.
+
+        Covers the values merged by polls and the hold registers confirmed by
+        writes, which other entities on the same register have not shown yet.
+        """
+        changes, self._changes = self._changes, {"input": set(), "hold": set(), "battery": set()}
+        return changes
+
+    def request_hold_refresh(self) -> None:
+        """Read every hold register on the next poll, bypassing the cache."""
+        self._hold_refresh_requested = True
+
+    @staticmethod
+    def _sentinel_checksum(hold_regs: dict) -> int | None:
+        """Return a CRC of the sentinel hold registers, None if any is missing."""
+        data = bytearray()
+        for register in range(HOLD_SENTINEL_START, HOLD_SENTINEL_START + HOLD_SENTINEL_COUNT):
+            value = hold_regs.get(register)
+            if value is None:
+                return None
+            data += value.to_bytes(2, 'little')
+        return LxpPacketUtils.compute_crc(bytes(data))
+
+    async def _async_hold_cache_current(self, session, values: dict) -> bool:
+        """Return True if the sentinel registers show the cached hold registers are still current.
+
+        The sentinel values read are added to values either way.
+        """
+        if not self._hold_sentinel_check or self._hold_refresh_requested or self._hold_checksum is None:
+            self._hold_skips = 0
+            return False
+        if self._hold_skips >= HOLD_SENTINEL_MAX_SKIPS:
+            # Settings outside the sentinels (e.g. changed from the app) would never show otherwise
+            _LOGGER.debug("Hold registers read from the cache %s times, reading all of them", self._hold_skips)
+            self._hold_skips = 0
+            self._hold_forced_reads += 1
+            return False
+        sentinel = await self.async_request_registers(
+            session, HOLD_SENTINEL_START, "hold", 3, HOLD_SENTINEL_COUNT)
+        values.update(sentinel)
+        if self._sentinel_checksum(sentinel) == self._hold_checksum:
+            self._hold_cache_hits += 1
+            self._hold_skips += 1
+            return True
+        _LOGGER.debug("Sentinel hold registers changed, reading all hold registers")
+        self._hold_cache_misses += 1
+        self._hold_skips = 0
+        return False
 
-    async def async_get_data(self) -> dict:
-        """Fetch data from the inverter, backfilling with old data on partial failure."""
-        _LOGGER.debug("API Client: Polling the inverter for new data...")
+    def get_hold_cache_stats(self) -> dict:
+        """Get hold register cache statistics for monitoring and debugging."""
+        return {
+            "sentinel_check": self._hold_sentinel_check,
+            "cached_registers": len(self._last_good_hold_regs),
+            "hits": self._hold_cache_hits,
+            "misses": self._hold_cache_misses,
+            "forced_reads": self._hold_forced_reads,
+        }
+
+    def get_block_stats(self) -> dict:
+        """Get per block read statistics for monitoring and debugging."""
+        return {
+            "blocks": {
+                f"{request_type} {reg}": dict(stats)
+                for (request_type, reg), stats in sorted(self._block_stats.items())
+            },
+            "poll_resumes": self._poll_resumes,
+        }
+
+    def get_pipeline_stats(self) -> dict:
+        """Get pipelined read statistics for monitoring and debugging."""
+        return {
+            "window": self._pipeline_window,
+            "fallback_to_serial": self._pipeline_fallback,
+            "pipelined_requests": self._pipelined_requests,
+            "timeouts": self._pipeline_timeouts,
+        }
+
+    async def async_close(self) -> None:
+        """Close the persistent session, if any."""
+        async with self._lock.slot(PRIORITY_POLL):
+            await self._connection_manager.async_disconnect()
+
+    async def async_get_data(self, tiers=None) -> dict:
+        """Fetch data from the inverter, backfilling with old data on partial failure.
+
+        tiers limits the poll to the registers of those polling tiers, all
+        of them by default. Hold registers are added when a refresh was
+        requested.
+        """
+        tiers = set(POLL_TIERS if tiers is None else tiers)
+        if self._hold_refresh_requested:
+            tiers.add(TIER_HOLD)
+        tiers = frozenset(tiers)
+        _LOGGER.debug("API Client: Polling the inverter for new data (%s)...", ", ".join(sorted(tiers)))
 
         # Initialize connection state for this attempt
         connection_success = False
         connection_retry = False
         retry_delay = INITIAL_RETRY_DELAY
-        writer = None
+        session = None
 
         try:
-            async with self._lock:
+            async with self._lock.slot(PRIORITY_POLL) as slot:
                 # Try to establish a connection with retry logic
                 for retry in range(self._connection_retries):
                     try:
@@ -156,7 +510,7 @@ class LxpModbusApiClient:
                             _LOGGER.info("Connection retry attempt %s/%s...", retry, self._connection_retries)
                             connection_retry = True
 
-                        reader, writer = await self._connection_manager.async_connect()
+                        session = await self._connection_manager.async_acquire()
                         connection_success = True
                         break
                     except (asyncio.TimeoutError, ConnectionRefusedError, OSError) as e:
@@ -175,58 +529,67 @@ class LxpModbusApiClient:
                         self._connection_retry_count += 1
                         _LOGGER.info("Successfully reconnected after %s attempts", retry)
 
-                newly_polled_input_regs = {}
-                newly_polled_hold_regs = {}
+                newly_polled_input_regs = RegisterStore()
+                newly_polled_hold_regs = RegisterStore()
                 newly_polled_battery_data = {}
+                read_plan = self._read_plan_for(tiers)
 
-                await self._connection_manager.async_discard_initial_data(reader)
-
+                # Start registers of the blocks read, which a resumed poll skips
+                read = {"input": set(), "input/bat": set(), "hold": set()}
+                self._poll_slot = slot
                 try:
-                    # Poll INPUT registers (expecting function code 4)
-                    for reg in range(0, TOTAL_REGISTERS, self._block_size):
-                        reg_block = await self.async_request_registers(writer, reader, reg, "input", 4)
-                        if len(reg_block) > 0:
-                            newly_polled_input_regs.update(reg_block)
-
-                    # Poll battery data if enabled and inverter reports connected batteries
-                    # The decoding routine needs 120 registers for complete block processing
-                    if (self._request_battery_data
-                            and I_BAT_PARALLEL_NUM in newly_polled_input_regs
-                            and newly_polled_input_regs[I_BAT_PARALLEL_NUM] > 0
-                            and self._block_size >= 120):
-                        for reg in range(BATTERY_INFO_START_REGISTER,
-                                         BATTERY_INFO_START_REGISTER + 120,
-                                         self._block_size):
-                            bat_block = await self.async_request_registers(
-                                writer, reader, reg, "input/bat", 4)
-                            newly_polled_battery_data.update(bat_block)
-
-                    # Poll HOLD registers (expecting function code 3)
-                    for reg in range(0, TOTAL_REGISTERS, self._block_size):
-                        reg_block = await self.async_request_registers(writer, reader, reg, "hold", 3)
-                        if len(reg_block) > 0:
-                            newly_polled_hold_regs.update(reg_block)
-
-                except asyncio.TimeoutError:
-                    _LOGGER.debug("Timeout requesting data from inverter")
-
-                # Close the connection
-                await self._connection_manager.async_close(writer)
-
-            # Merge new data with the last known good data
+                    for resume in range(POLL_RESUME_LIMIT + 1):
+                        try:
+                            await self._async_poll_blocks(
+                                session, read_plan, tiers, read,
+                                newly_polled_input_regs, newly_polled_battery_data, newly_polled_hold_regs)
+                            break
+                        except (asyncio.TimeoutError, OSError) as ex:
+                            # The connection closed, or a late reply could still arrive on it: don't reuse it
+                            await self._connection_manager.async_release(session, failed=True)
+                            session = None
+                            reason = "Timeout" if isinstance(ex, asyncio.TimeoutError) else f"Connection lost ({ex})"
+                            if resume == POLL_RESUME_LIMIT:
+                                _LOGGER.debug("%s requesting data from inverter", reason)
+                                break
+                            _LOGGER.debug("%s requesting data from inverter, "
+                                          "reconnecting to resume at the first missing block", reason)
+                            try:
+                                session = await self._connection_manager.async_acquire()
+                            except (asyncio.TimeoutError, ConnectionRefusedError, OSError) as e:
+                                # Keep the blocks read so far
+                                _LOGGER.warning("Reconnecting to resume the poll failed: %s", e)
+                                break
+                            self._poll_resumes += 1
+                finally:
+                    self._poll_slot = None
+
+                # Close the connection, or keep it open for the next poll in persistent mode
+                if session is not None:
+                    await self._connection_manager.async_release(session, failed=False)
+                    session = None
+
+            # Merge new data with the last known good data, noting what changed
             if len(newly_polled_input_regs):
-                self._last_good_input_regs.update(newly_polled_input_regs)
+                self._changes["input"] |= self._last_good_input_regs.merge(newly_polled_input_regs)
 
             if len(newly_polled_battery_data):
+                self._changes["battery"].update(
+                    serial for serial, battery in newly_polled_battery_data.items()
+                    if self._last_good_battery_data.get(serial) != battery
+                )
                 self._last_good_battery_data.update(newly_polled_battery_data)
 
             if len(newly_polled_hold_regs):
-                self._last_good_hold_regs.update(newly_polled_hold_regs)
+                self._changes["hold"] |= self._last_good_hold_regs.merge(newly_polled_hold_regs)
+                self._hold_checksum = self._sentinel_checksum(self._last_good_hold_regs)
 
             # Always return a complete (though possibly stale) dataset
             return {"input": self._last_good_input_regs, "hold": self._last_good_hold_regs, "battery": self._last_good_battery_data}
 
         except Exception as ex:
+            if session:
+                await self._connection_manager.async_release(session, failed=True)
             self._connection_failure_count += 1
             last_success_str = "never"
             if self._last_successful_connection:
@@ -248,75 +611,190 @@ class LxpModbusApiClient:
                 else:
                     raise UpdateFailed(f"Error communicating with inverter: {ex}")
 
+    async def _async_poll_blocks(self, session, read_plan, tiers, read,
+                                 input_regs, battery_data, hold_regs) -> None:
+        """Read the blocks of the read plan not yet in read, merging them into the given stores.
+
+        Raises asyncio.TimeoutError when a block got no reply after its
+        retries, OSError when the connection closed; called again with a new
+        session, the poll resumes at the first block missing.
+        """
+        # Poll INPUT registers (expecting function code 4)
+        await self.async_request_blocks(session, read_plan["input"], "input", 4, input_regs, read["input"])
+
+        # Poll battery data if enabled and inverter reports connected batteries
+        # The decoding routine needs 120 registers for complete block processing
+        battery_count = input_regs.get(I_BAT_PARALLEL_NUM, self._last_good_input_regs.get(I_BAT_PARALLEL_NUM, 0))
+        if (self._request_battery_data
+                and TIER_ENERGY in tiers
+                and battery_count > 0
+                and self._block_size >= 120):
+            await self.async_request_blocks(
+                session, [(BATTERY_INFO_START_REGISTER, self._block_size)], "input/bat", 4,
+                battery_data, read["input/bat"])
+
+        # Poll HOLD registers (expecting function code 3), unless the cache is still current.
+        # A resumed poll that already read hold blocks goes on with the others.
+        if read_plan["hold"] and (read["hold"] or not await self._async_hold_cache_current(session, hold_regs)):
+            await self.async_request_blocks(session, read_plan["hold"], "hold", 3, hold_regs, read["hold"])
+        if TIER_HOLD in tiers:
+            self._hold_refresh_requested = False
+
     async def async_write_register(self, register: int, value: int) -> bool:
         """Write a single register value to the inverter with validation and retries."""
+        return await self.async_write_registers({register: value})
+
+    async def async_write_registers(self, values: dict[int, int]) -> bool:
+        """Write several hold register values to the inverter in one session, with validation and retries.
+
+        Contiguous registers are written together with a write multiple (0x10)
+        request, other registers and inverters rejecting 0x10 get single
+        writes. An attempt keeps the registers it confirmed, the next one only
+        writes those still pending.
+        """
+        # Registers are unsigned 16 bit, the inverter confirms negative values as such
+        pending = {register: value & 0xFFFF for register, value in sorted(values.items())}
         for attempt in range(self._connection_retries):
-            writer = None
-
-            try:
-                async with self._lock:
-                    _LOGGER.debug("Write attempt %s/%s for register %s with value %s",
-                                  attempt + 1, self._connection_retries, register, value)
-
+            if attempt:
+                await asyncio.sleep(WRITE_RETRY_DELAY)
+            # Writes go before waiting polls, and between the block reads of a poll in progress
+            async with self._lock.slot(PRIORITY_WRITE) as slot:
+                session = None
+                try:
+                    _LOGGER.debug("Write attempt %s/%s for registers %s",
+                                  attempt + 1, self._connection_retries, pending)
+
+                    # Use the session lent by a preempted poll, or open one
+                    session = slot.session
+                    if session is None:
+                        try:
+                            session = await self._connection_manager.async_acquire()
+                        except (asyncio.TimeoutError, ConnectionRefusedError, OSError) as e:
+                            _LOGGER.warning("Connection attempt failed during write: %s", e)
+                            continue
+
+                    session_failed = False
                     try:
-                        reader, writer = await self._connection_manager.async_connect()
-                    except (asyncio.TimeoutError, ConnectionRefusedError, OSError) as e:
-                        _LOGGER.warning("Connection attempt failed during write: %s", e)
-                        await asyncio.sleep(WRITE_RETRY_DELAY)
-                        continue
-
-                    await self._connection_manager.async_discard_initial_data(reader)
-
-                    req = LxpRequestBuilder.prepare_packet_for_write(
-                        self._dongle_serial.encode(), self._inverter_serial.encode(), register, value
-                    )
-                    writer.write(req)
-                    await writer.drain()
+                        for start, block in _contiguous_blocks(pending, WRITE_MULTI_MAX_REGISTERS):
+                            await self._async_write_block(session, start, block, pending, attempt)
+                    except asyncio.TimeoutError:
+                        _LOGGER.warning("Write attempt %d failed: Response not received", attempt + 1)
+                        session_failed = True
 
-                    response_buf = await reader.read(WRITE_RESPONSE_LENGTH)
+                    await self._async_release_slot_session(slot, session, session_failed)
+                    session = None  # Mark as released to prevent double-close in exception handler
 
-                    _LOGGER.debug(
-                        "Modbus WRITE: Sent to reg %s, value %s, resp: %s",
-                        register, value, response_buf.hex() if response_buf else "None"
-                    )
+                    if len(pending) < len(values):
+                        self._hold_checksum = self._sentinel_checksum(self._last_good_hold_regs)
+                    if not pending:
+                        return True
 
-                    # Close the connection
-                    await self._connection_manager.async_close(writer)
-                    writer = None  # Mark as closed to prevent double-close in exception handler
+                except Exception as ex:
+                    _LOGGER.error("Exception during write attempt %d for registers %s: %s",
+                                  attempt + 1, list(pending), ex)
+                    if session:
+                        await self._async_release_slot_session(slot, session, True)
 
-                    # --- Response Validation ---
-                    if not response_buf:
-                        _LOGGER.warning("Write attempt %d failed: Response not received", attempt + 1)
-                        await asyncio.sleep(WRITE_RETRY_DELAY)
-                        continue
-
-                    response = LxpResponse(response_buf)
-                    if response.packet_error:
-                        _LOGGER.warning("Write attempt %s failed: Inverter returned a packet error. %s",
-                                        attempt + 1, response.info)
-                        await asyncio.sleep(WRITE_RETRY_DELAY)
-                        continue
-
-                    response_dict = response.parsed_values_dictionary
-                    if register in response_dict:
-                        received_value = response_dict.get(register)
-                        if received_value == value:
-                            _LOGGER.info("Successfully wrote register %s with value %s.", register, value)
-                            return True
-
-                        _LOGGER.warning("Write attempt %s failed: Confirmation mismatch, sent=%s received=%s",
-                                        attempt + 1, value, received_value)
-                    else:
-                        _LOGGER.warning("Write attempt %s failed: Confirmation mismatch, written register %s not received on confirmation. %s",
-                                        attempt + 1, register, response.info)
-
-                    await asyncio.sleep(WRITE_RETRY_DELAY)
-
-            except Exception as ex:
-                _LOGGER.error("Exception during write attempt %d for register %s: %s", attempt + 1, register, ex)
-                if writer:
-                    await self._connection_manager.async_close(writer)
-                await asyncio.sleep(WRITE_RETRY_DELAY)
-
-        _LOGGER.error("Failed to write register %s after %d attempts.", register, self._connection_retries)
+        _LOGGER.error("Failed to write registers %s after %d attempts.", list(pending), self._connection_retries)
         return False
+
+    async def async_read_back(self, register_type: str, registers) -> dict:
+        """Read only the blocks covering registers, e.g. those a write can affect.
+
+        Runs before waiting polls, and between the block reads of a poll in
+        progress. The values read are merged into the last known data, their
+        changes reported by pop_changes(). Returns the values read, which
+        are incomplete if the read-back failed.
+        """
+        if register_type == "hold":
+            function_code, store = 3, self._last_good_hold_regs
+        else:
+            function_code, store = 4, self._last_good_input_regs
+        blocks = merge_ranges(registers, self._block_size)
+        values = RegisterStore()
+
+        async with self._lock.slot(PRIORITY_READ) as slot:
+            # Use the session lent by a preempted poll, or open one
+            session = slot.session
+            failed = False
+            try:
+                if session is None:
+                    session = await self._connection_manager.async_acquire()
+                for reg, count in blocks:
+                    values.update(await self.async_request_registers(session, reg, register_type, function_code, count))
+            except (asyncio.TimeoutError, ConnectionRefusedError, OSError) as ex:
+                _LOGGER.warning("Reading back %s registers %s failed: %s", register_type, blocks, ex)
+                failed = True
+            if session is not None:
+                await self._async_release_slot_session(slot, session, failed)
+
+        if len(values):
+            self._changes[register_type] |= store.merge(values)
+            if register_type == "hold":
+                self._hold_checksum = self._sentinel_checksum(self._last_good_hold_regs)
+        return dict(values)
+
+    async def _async_release_slot_session(self, slot, session, failed: bool) -> None:
+        """Close the session of a write or read-back, or hand a lent one back to its poll."""
+        if session is slot.session:
+            if failed:
+                slot.session_failed()
+            return
+        # Close the connection, dropping a persistent session that did not answer
+        await self._connection_manager.async_release(session, failed=failed)
+
+    async def _async_write_block(self, session, start: int, block: list[int], pending: dict, attempt: int) -> None:
+        """Write consecutive registers from start, removing the confirmed ones from pending."""
+        if len(block) > 1 and self._write_multi_supported:
+            response = await session.async_request(
+                self._requests.write_multi(start, block),
+                self._response_matcher(LxpRequestBuilder.WRITE_MULTI, start), READ_TIMEOUT
+            )
+            _LOGGER.debug("Modbus WRITE MULTI: Sent to regs %s-%s, values %s, resp: %s",
+                          start, start + len(block) - 1, block, response.info)
+
+            if response.device_function == LxpRequestBuilder.WRITE_MULTI and response.register_count == len(block):
+                _LOGGER.info("Successfully wrote registers %s-%s with values %s.", start, start + len(block) - 1, block)
+                for register, value in enumerate(block, start):
+                    self._confirm_write(register, value, pending)
+                return
+            if response.exception == ILLEGAL_FUNCTION:
+                _LOGGER.warning("Inverter does not support writing multiple registers, "
+                                "falling back to one write per register")
+                self._write_multi_supported = False
+            else:
+                _LOGGER.warning("Write attempt %s failed: Write multiple not confirmed for registers %s-%s. %s",
+                                attempt + 1, start, start + len(block) - 1, response.info)
+                return
+
+        for register, value in enumerate(block, start):
+            response = await session.async_request(
+                self._requests.write(register, value),
+                self._response_matcher(LxpRequestBuilder.WRITE_SINGLE, register), READ_TIMEOUT
+            )
+            _LOGGER.debug("Modbus WRITE: Sent to reg %s, value %s, resp: %s", register, value, response.info)
+
+            if response.packet_error:
+                _LOGGER.warning("Write attempt %s failed: Inverter returned a packet error. %s",
+                                attempt + 1, response.info)
+                continue
+
+            response_dict = response.parsed_values_dictionary
+            if register in response_dict:
+                received_value = response_dict.get(register)
+                if received_value == value:
+                    _LOGGER.info("Successfully wrote register %s with value %s.", register, value)
+                    self._confirm_write(register, received_value, pending)
+                    continue
+
+                _LOGGER.warning("Write attempt %s failed: Confirmation mismatch, sent=%s received=%s",
+                                attempt + 1, value, received_value)
+            else:
+                _LOGGER.warning("Write attempt %s failed: Confirmation mismatch, written register %s not received on confirmation. %s",
+                                attempt + 1, register, response.info)
+
+    def _confirm_write(self, register: int, value: int, pending: dict) -> None:
+        """Write-through: the confirmed value is the register's new value."""
+        pending.pop(register, None)
+        self._last_good_hold_regs[register] = value
+        self._changes["hold"].add(register)
@@ -0,0 +1,157 @@
+"""Compile the register ranges to poll from the entity descriptions in use."""
+from typing import Iterable
+
+from ..constants.hold_registers import (
+    H_FIRMWARE_CODE_0_1, H_FIRMWARE_CODE_2_3, H_SOFTWARE_VERSION_SLAVE_COM, H_SOFTWARE_VERSION_CNTL_FW,
+)
+from ..constants.input_registers import I_BAT_PARALLEL_NUM, I_MASTER_SLAVE_PARALLEL_STATUS
+from ..constants.register_pairs import INPUT_REGISTER_PAIRS
+from ..const import POLL_TIERS, TIER_ENERGY, TIER_HOLD, TIER_LIVE, TOTAL_REGISTERS
+
+# Registers the integration itself reads, whatever entities are enabled
+CORE_REGISTERS = {
+    # Battery polling decision and master/slave detection
+    "input": {I_BAT_PARALLEL_NUM, I_MASTER_SLAVE_PARALLEL_STATUS},
+    # Firmware version shown in the device info
+    "hold": {H_FIRMWARE_CODE_0_1, H_FIRMWARE_CODE_2_3, H_SOFTWARE_VERSION_SLAVE_COM, H_SOFTWARE_VERSION_CNTL_FW},
+}
+
+
+def description_tier(desc: dict) -> str:
+    """Return the polling tier of the registers an entity description reads.
+
+    Hold registers are settings and use the hold tier. Input registers behind
+    energy counters change slowly and use the energy tier, everything else
+    is a live value.
+    """
+    if desc.get("register_type") == "hold":
+        return TIER_HOLD
+    if desc.get("device_class") == "energy" or desc.get("state_class") == "total_increasing":
+        return TIER_ENERGY
+    return TIER_LIVE
+
+
+def _fastest(tier_a: str | None, tier_b: str) -> str:
+    """Return the more frequently polled of two tiers."""
+    if tier_a is None:
+        return tier_b
+    return min(tier_a, tier_b, key=POLL_TIERS.index)
+
+
+def collect_registers(descriptions: Iterable[dict]) -> dict[str, dict[int, str]]:
+    """Return the input and hold registers read by the given entity descriptions, with their tier.
+
+    Plain entities use their 'register', calculated sensors the input
+    registers listed in 'depends_on'. A register shared by entities of
+    different tiers gets the fastest one. Both halves of a 32-bit input
+    register pair are read if either is used. Battery entities are decoded
+    from the separate battery block and are not part of the plan.
+    """
+    registers = {
+        "input": dict.fromkeys(CORE_REGISTERS["input"], TIER_LIVE),
+        "hold": dict.fromkeys(CORE_REGISTERS["hold"], TIER_HOLD),
+    }
+    for desc in descriptions:
+        register_type = desc.get("register_type")
+        if register_type == "calculated":
+            used, register_type = desc.get("depends_on", ()), "input"
+        elif register_type in registers and desc.get("register") is not None:
+            used = (desc["register"],)
+        else:
+            continue
+        tier = description_tier(desc)
+        type_registers = registers[register_type]
+        for register in used:
+            type_registers[register] = _fastest(type_registers.get(register), tier)
+
+    input_registers = registers["input"]
+    for low, high in INPUT_REGISTER_PAIRS.items():
+        used_tiers = [input_registers[reg] for reg in (low, high) if reg in input_registers]
+        if used_tiers:
+            input_registers[low] = input_registers[high] = min(used_tiers, key=POLL_TIERS.index)
+    return registers
+
+
+def description_change_keys(desc: dict, battery_serial: str | None = None) -> frozenset | None:
+    """Return the (register type, register) keys whose change affects an entity description.
+
+    Calculated sensors depend on the input registers in 'depends_on', battery
+    entities on the whole block of their battery, keyed ("battery", serial).
+    None means the entity can't tell and is updated on every poll.
+    """
+    register_type = desc.get("register_type")
+    if register_type == "calculated":
+        return frozenset(("input", register) for register in desc.get("depends_on", ()))
+    if register_type in ("battery", "battery_calculated"):
+        return frozenset({("battery", battery_serial)})
+    if register_type in ("input", "hold") and desc.get("register") is not None:
+        return frozenset({(register_type, desc["register"])})
+    return None
+
+
+def merge_ranges(registers: Iterable[int], block_size: int,
+                 pairs: dict[int, int] | None = None) -> list[tuple[int, int]]:
+    """Merge registers into the fewest (start, count) ranges no longer than block_size.
+
+    Each range starts at the lowest register not yet covered and reaches the
+    last register within block_size of it, which gives the minimum number of
+    requests. Gaps inside a range are read along with it. The low register
+    of a {low: high} pair only joins a range its high register fits in too,
+    so both halves of a 32-bit value come from the same reply.
+    """
+    pairs = pairs or {}
+    ranges = []
+    start = last = None
+    for register in sorted(r for r in set(registers) if 0 <= r < TOTAL_REGISTERS):
+        if start is not None and pairs.get(register, register) - start < block_size:
+            last = register
+            continue
+        if start is not None:
+            ranges.append((start, last - start + 1))
+        start = last = register
+    if start is not None:
+        ranges.append((start, last - start + 1))
+    return ranges
+
+
+def compile_read_plan(descriptions: Iterable[dict], block_size: int,
+                      tiers: Iterable[str] = POLL_TIERS) -> dict[str, list[tuple[int, int]]]:
+    """Return the (start, count) ranges to poll per register type for the given descriptions.
+
+    Only registers in one of the given tiers are included; registers of
+    tiers polled together are merged into the same ranges.
+    """
+    tiers = set(tiers)
+    return {
+        register_type: merge_ranges(
+            (register for register, tier in type_registers.items() if tier in tiers), block_size,
+            INPUT_REGISTER_PAIRS if register_type == "input" else None,
+        )
+        for register_type, type_registers in collect_registers(descriptions).items()
+    }
+
+
+def full_read_plan(block_size: int, tiers: Iterable[str] = POLL_TIERS) -> dict[str, list[tuple[int, int]]]:
+    """Return the plan sweeping every register, used until entities are known.
+
+    Input registers are read on every poll, hold registers with the hold tier.
+    Input blocks never end between the halves of a 32-bit register pair.
+    """
+    return {
+        "input": _sweep(block_size, INPUT_REGISTER_PAIRS),
+        "hold": _sweep(block_size, {}) if TIER_HOLD in tiers else [],
+    }
+
+
+def _sweep(block_size: int, pairs: dict[int, int]) -> list[tuple[int, int]]:
+    """Return block_size ranges over every register, shortened to keep each pair in one range."""
+    ranges = []
+    start = 0
+    while start < TOTAL_REGISTERS:
+        count = min(block_size, TOTAL_REGISTERS - start)
+        last = start + count - 1
+        if pairs.get(last, last) > last and count > 1:
+            count -= 1
+        ranges.append((start, count))
+        start += count
+    return ranges
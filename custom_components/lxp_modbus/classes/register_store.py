@@ -0,0 +1,215 @@
+"""Array-backed storage for the input and hold register values of one inverter."""
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Iterator, Mapping, MutableMapping, Sequence
+from functools import lru_cache
+
+from ..const import TOTAL_REGISTERS
+
+
+@lru_cache(maxsize=8)
+def _pairs_struct(lows: tuple[int, ...]) -> struct.Struct:
+    """Return a struct reading the 32-bit value whose low word is at each of lows, in one unpack."""
+    parts, position = ["<"], 0
+    for low in lows:
+        parts.append(f"{2 * (low - position)}xI")
+        position = low + 2
+    return struct.Struct("".join(parts))
+
+
+class RegisterBlock(Mapping):
+    """Read-only mapping over the values of consecutive registers from start.
+
+    Wraps a decoded reply (e.g. LxpResponse.registers) without copying it, so
+    a RegisterStore can take the whole block in one slice copy.
+    """
+
+    __slots__ = ("start", "values")
+
+    def __init__(self, start: int, values: Sequence[int]):
+        self.start = start
+        self.values = values
+
+    def __getitem__(self, register: int) -> int:
+        index = register - self.start
+        if 0 <= index < len(self.values):
+            return self.values[index]
+        raise KeyError(register)
+
+    def get(self, register, default=None):
+        index = register - self.start
+        if 0 <= index < len(self.values):
+            return self.values[index]
+        return default
+
+    def __contains__(self, register) -> bool:
+        return type(register) is int and 0 <= register - self.start < len(self.values)
+
+    def __iter__(self) -> Iterator[int]:
+        return iter(range(self.start, self.start + len(self.values)))
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __repr__(self) -> str:
+        return f"RegisterBlock({self.start}, {len(self.values)} registers)"
+
+
+class RegisterStore(MutableMapping):
+    """Register values of one type (input or hold), keyed by register number.
+
+    Values live in a fixed array('H') with one slot per register, a presence
+    map marks the registers read so far and each register keeps the time it
+    was last updated. It behaves like the {register: value} dict it replaces,
+    so entities and the description lambdas use it unchanged, while merging a
+    block or another store is a slice copy instead of one insert per register.
+    """
+
+    def __init__(self, size: int = TOTAL_REGISTERS):
+        """Initialize an empty store for registers 0 to size - 1."""
+        self._size = size
+        self._values = array('H', bytes(2 * size))
+        self._present = bytearray(size)
+        self._updated = array('d', bytes(8 * size))
+        self._count = 0
+        # Bumped on every change, the combined 32-bit values are cached for one version
+        self._version = 0
+        self._combined = None
+
+    # --- Mapping interface ---
+
+    def __getitem__(self, register: int) -> int:
+        if type(register) is int and 0 <= register < self._size and self._present[register]:
+            return self._values[register]
+        raise KeyError(register)
+
+    def get(self, register, default=None):
+        if type(register) is int and 0 <= register < self._size and self._present[register]:
+            return self._values[register]
+        return default
+
+    def __contains__(self, register) -> bool:
+        return type(register) is int and 0 <= register < self._size and self._present[register] == 1
+
+    def __setitem__(self, register: int, value: int) -> None:
+        if type(register) is not int or not 0 <= register < self._size:
+            raise KeyError(register)
+        # Signed values are stored as the 16-bit word the inverter reports back
+        self._values[register] = value & 0xFFFF
+        self._version += 1
+        if not self._present[register]:
+            self._present[register] = 1
+            self._count += 1
+        self._updated[register] = time.time()
+
+    def __delitem__(self, register: int) -> None:
+        if register not in self:
+            raise KeyError(register)
+        self._present[register] = 0
+        self._count -= 1
+        self._version += 1
+
+    def __iter__(self) -> Iterator[int]:
+        present = self._present
+        return (register for register in range(self._size) if present[register])
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __repr__(self) -> str:
+        return f"RegisterStore({dict(self.items())})"
+
+    def clear(self) -> None:
+        self._present[:] = bytes(self._size)
+        self._count = 0
+        self._version += 1
+
+    # --- Bulk updates ---
+
+    def set_block(self, start: int, values: Sequence[int], timestamp: float | None = None) -> None:
+        """Store the values of consecutive registers from start.
+
+        values may be a memoryview cast to 'H', an array('H') or any sequence
+        of ints; the part beyond the register space is ignored.
+        """
+        end = min(start + len(values), self._size)
+        if start < 0 or end <= start:
+            return
+        count = end - start
+        if not (isinstance(values, memoryview) and values.format == 'H'
+                or isinstance(values, array) and values.typecode == 'H'):
+            values = array('H', values[:count])
+        memoryview(self._values)[start:end] = memoryview(values)[:count]
+        self._count += count - self._present.count(1, start, end)
+        self._present[start:end] = b"\x01" * count
+        self._updated[start:end] = array('d', (time.time() if timestamp is None else timestamp,)) * count
+        self._version += 1
+
+    def update(self, other=(), /, **kwargs) -> None:
+        """Merge registers from another store, a RegisterBlock or any mapping."""
+        if isinstance(other, RegisterStore):
+            self.merge(other)
+        elif isinstance(other, RegisterBlock):
+            self.set_block(other.start, other.values)
+        else:
+            super().update(other, **kwargs)
+
+    def merge(self, other: "RegisterStore") -> set[int]:
+        """Copy every run of registers present in other, with their timestamps.
+
+        Returns the registers that were missing or held a different value.
+        Runs that did not change are detected with one slice comparison.
+        """
+        changed = set()
+        present = other._present
+        end_of_store = min(self._size, other._size)
+        start = present.find(1, 0, end_of_store)
+        while start != -1:
+            end = present.find(0, start, end_of_store)
+            if end == -1:
+                end = end_of_store
+            old_values, new_values = self._values[start:end], other._values[start:end]
+            if old_values != new_values or self._present.count(1, start, end) != end - start:
+                old_present = self._present
+                changed.update(
+                    register for register, old, new in zip(range(start, end), old_values, new_values)
+                    if old != new or not old_present[register]
+                )
+            self._values[start:end] = new_values
+            self._present[start:end] = present[start:end]
+            self._updated[start:end] = other._updated[start:end]
+            start = present.find(1, end, end_of_store)
+        self._count = self._present.count(1)
+        self._version += 1
+        return changed
+
+    def combined(self, pairs: Mapping[int, int]) -> dict[int, int]:
+        """Return {low register: 32-bit value} for the given {low: high} register pairs.
+
+        Pairs of consecutive registers are decoded together, with one struct
+        unpack over the value array, and the result is cached until the store
+        changes. Pairs with a half missing are left out.
+        """
+        cached = self._combined
+        if cached is not None and cached[0] == self._version and cached[1] is pairs:
+            return cached[2]
+        lows = tuple(sorted(low for low, high in pairs.items() if high == low + 1 and 0 <= low < self._size - 1))
+        values = self._values
+        if sys.byteorder != "little":
+            values = array('H', values)
+            values.byteswap()
+        present = self._present
+        combined = {
+            low: value for low, value in zip(lows, _pairs_struct(lows).unpack_from(values))
+            if present[low] and present[low + 1]
+        }
+        self._combined = (self._version, pairs, combined)
+        return combined
+
+    def updated_at(self, register: int) -> float | None:
+        """Return the time.time() at which a register was last updated, None if never read."""
+        if register in self:
+            return self._updated[register]
+        return None
@@ -0,0 +1,154 @@
+"""Priority scheduling of the operations sharing a dongle connection."""
+import asyncio
+import heapq
+import itertools
+import time
+
+# Lower values go first
+PRIORITY_WRITE = 0  # control writes
+PRIORITY_READ = 1  # targeted reads, e.g. reading back written registers
+PRIORITY_POLL = 2  # background polling
+
+PRIORITY_NAMES = {PRIORITY_WRITE: "write", PRIORITY_READ: "read", PRIORITY_POLL: "poll"}
+
+# Yielded holders resume before waiters of their own priority
+_RESUME, _NEW = 0, 1
+
+
+class RequestSlot:
+    """The turn of one operation (a poll, a write) on the dongle.
+
+    Used as an async context manager, it waits until the scheduler grants it
+    and gives it up on exit. A long operation calls async_yield between
+    requests to let waiting higher priority operations run in the middle of
+    it, lending them its open session.
+    """
+
+    __slots__ = ("_scheduler", "priority", "session")
+
+    def __init__(self, scheduler: "RequestScheduler", priority: int):
+        self._scheduler = scheduler
+        self.priority = priority
+        # Session lent by the operation this one preempted, None if it must open its own
+        self.session = None
+
+    async def __aenter__(self) -> "RequestSlot":
+        await self._scheduler._async_acquire(self)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:
+        self._scheduler._release(self)
+
+    def session_failed(self) -> None:
+        """Report that the lent session must not be used any more, e.g. after a timeout."""
+        self._scheduler._lent_session_failed = True
+
+    async def async_yield(self, session) -> bool:
+        """Let waiting higher priority operations run first, lending them session.
+
+        Returns False if one of them reported the session as failed.
+        """
+        return await self._scheduler._async_yield(self, session)
+
+
+class RequestScheduler:
+    """Grants the dongle to one operation at a time, by priority.
+
+    Replaces a plain lock: waiting writes go before waiting reads and polls,
+    and a poll holding the dongle lets them run between its block reads on
+    the same session. Wait times are recorded per priority.
+    """
+
+    def __init__(self):
+        """Initialize an idle scheduler."""
+        self._holder = None
+        # (priority, resume/new, sequence, future, slot)
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._lent_session = None
+        self._lent_session_failed = False
+
+        # Statistics
+        self._stats = {
+            name: {"granted": 0, "wait_total": 0.0, "wait_max": 0.0} for name in PRIORITY_NAMES.values()
+        }
+        self._preemptions = 0
+
+    def slot(self, priority: int = PRIORITY_POLL) -> RequestSlot:
+        """Return a slot to wait for the dongle with (async with scheduler.slot(...))."""
+        return RequestSlot(self, priority)
+
+    async def _async_acquire(self, slot: RequestSlot) -> None:
+        started = time.monotonic()
+        if self._holder is not None or self._pending_waiters():
+            await self._async_wait(slot, _NEW)
+        else:
+            self._holder = slot
+        self._record_wait(slot.priority, time.monotonic() - started)
+
+    async def _async_wait(self, slot: RequestSlot, order: int) -> None:
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (slot.priority, order, next(self._sequence), future, slot))
+        try:
+            await future
+        except asyncio.CancelledError:
+            # Granted just before being cancelled: pass the turn on
+            if future.done() and not future.cancelled():
+                self._release(slot)
+            raise
+
+    def _pending_waiters(self) -> bool:
+        """Drop cancelled waiters from the head of the queue, return True if any are left."""
+        waiters = self._waiters
+        while waiters and waiters[0][3].done():
+            heapq.heappop(waiters)
+        return bool(waiters)
+
+    def _grant_next(self) -> None:
+        self._holder = None
+        if self._pending_waiters():
+            _, _, _, future, slot = heapq.heappop(self._waiters)
+            self._holder = slot
+            slot.session = self._lent_session
+            future.set_result(None)
+
+    def _release(self, slot: RequestSlot) -> None:
+        if self._holder is slot:
+            slot.session = None
+            self._grant_next()
+
+    async def _async_yield(self, slot: RequestSlot, session) -> bool:
+        if self._holder is not slot or not self._pending_waiters() or self._waiters[0][0] >= slot.priority:
+            return True
+
+        self._preemptions += 1
+        self._lent_session = session
+        self._lent_session_failed = False
+        self._grant_next()
+        try:
+            await self._async_wait(slot, _RESUME)
+        finally:
+            self._lent_session = None
+            slot.session = None
+        return not self._lent_session_failed
+
+    def _record_wait(self, priority: int, wait: float) -> None:
+        stats = self._stats[PRIORITY_NAMES[priority]]
+        stats["granted"] += 1
+        stats["wait_total"] += wait
+        stats["wait_max"] = max(stats["wait_max"], wait)
+
+    def get_stats(self) -> dict:
+        """Get queue wait statistics per priority, for monitoring and debugging."""
+        return {
+            **{
+                name: {
+                    "granted": stats["granted"],
+                    "wait_avg": stats["wait_total"] / stats["granted"] if stats["granted"] else 0.0,
+                    "wait_max": stats["wait_max"],
+                }
+                for name, stats in self._stats.items()
+            },
+            "preemptions": self._preemptions,
+            "waiting": sum(1 for waiter in self._waiters if not waiter[3].done()),
+        }
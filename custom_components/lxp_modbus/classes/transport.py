@@ -0,0 +1,49 @@
+"""Transports opening framed connections to a dongle."""
+from abc import ABC, abstractmethod
+import asyncio
+
+from .frame_protocol import LxpFrameProtocol
+
+# Connection constants
+CONNECTION_TIMEOUT = 10
+
+
+class LxpTransport(ABC):
+    """Opens connections to a dongle.
+
+    A connection is an LxpFrameProtocol whose transport carries the A11A byte
+    stream. ModbusConnectionManager only depends on this interface, so the
+    dongle can be swapped for another implementation (e.g. a simulator).
+    """
+
+    @abstractmethod
+    async def async_open(self) -> LxpFrameProtocol:
+        """Open a new connection and return its protocol."""
+
+    @property
+    @abstractmethod
+    def description(self) -> str:
+        """Human readable target of the transport, for logging."""
+
+
+class TcpTransport(LxpTransport):
+    """Connects to the dongle over TCP."""
+
+    def __init__(self, host: str, port: int, timeout: float = CONNECTION_TIMEOUT):
+        """Initialize the transport."""
+        self._host = host
+        self._port = port
+        self._timeout = timeout
+
+    async def async_open(self) -> LxpFrameProtocol:
+        """Establish a TCP connection with timeout."""
+        loop = asyncio.get_running_loop()
+        _, session = await asyncio.wait_for(
+            loop.create_connection(LxpFrameProtocol, self._host, self._port),
+            timeout=self._timeout
+        )
+        return session
+
+    @property
+    def description(self) -> str:
+        return f"{self._host}:{self._port}"
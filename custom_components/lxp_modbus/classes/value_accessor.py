@@ -0,0 +1,101 @@
+"""Compile entity descriptions into accessors reading an entity's value from coordinator data."""
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from .calculation_graph import CalculationGraph
+
+# read(data, entry, battery_serial) -> value, or None if unknown
+ValueReader = Callable[[dict, Any, str | None], Any]
+
+
+@dataclass(frozen=True, slots=True)
+class ValueAccessor:
+    """Reads the value of one entity description.
+
+    read is composed once from the description (register lookup, extract,
+    then options or scale), so evaluating an entity is a single call
+    instead of walking the description dict on every state update.
+    """
+
+    register_type: str
+    register: int | None
+    read: ValueReader
+
+
+def _source(desc: dict, calculations: CalculationGraph | None) -> ValueReader:
+    """Return a reader of the raw (extracted, unscaled) value of a description."""
+    register_type = desc.get("register_type", "")
+    extract = desc.get("extract")
+    register = desc.get("register")
+
+    if register_type == "calculated" and calculations is not None:
+        # Reuse the result until one of the input registers it depends on changes
+        def read(data, entry, battery_serial):
+            return calculations.evaluate(desc, data.get("input", {}), entry)
+    elif register_type == "calculated":
+        # Calculated sensors compute their value from the input registers
+        def read(data, entry, battery_serial):
+            return extract(data.get("input", {}), entry)
+    elif register_type == "battery":
+        def read(data, entry, battery_serial):
+            value = data.get("battery", {}).get(battery_serial, {}).get(register)
+            return None if value is None else extract(value)
+    elif register_type == "battery_calculated":
+        def read(data, entry, battery_serial):
+            return extract(data.get("battery", {}).get(battery_serial, {}), entry)
+    else:
+        # Standard register sensors, extract parses the value (e.g. packed bits)
+        def read(data, entry, battery_serial):
+            value = data.get(register_type, {}).get(register)
+            return None if value is None else extract(value)
+
+    return read
+
+
+def _clean_number(value):
+    """Return a whole number as int, anything else unchanged."""
+    if isinstance(value, float) and not value.is_integer():
+        return value
+    return int(value)
+
+
+def compile_sensor_description(desc: dict, calculations: CalculationGraph | None = None) -> ValueAccessor:
+    """Compile a sensor description: raw value, then its options map or scale factor.
+
+    Calculated descriptions are evaluated through calculations if given.
+    """
+    source = _source(desc, calculations)
+
+    if "options" in desc:
+        # Text sensor (like Inverter State)
+        options = desc["options"]
+        default = desc.get("default", "Unknown")
+
+        def read(data, entry, battery_serial):
+            raw = source(data, entry, battery_serial)
+            return None if raw is None else options.get(raw, default)
+    elif "scale" in desc:
+        scale = desc["scale"]
+
+        def read(data, entry, battery_serial):
+            raw = source(data, entry, battery_serial)
+            return None if raw is None else _clean_number(raw * scale)
+    else:
+        # Codes and other raw values
+        read = source
+
+    return ValueAccessor(desc.get("register_type", ""), desc.get("register"), read)
+
+
+def compile_readonly_description(desc: dict, render: Callable[[int, dict], Any] | None) -> ValueAccessor:
+    """Compile a control description shown as a read-only sensor, rendered from its raw register."""
+    register_type = desc.get("register_type", "")
+    register = desc.get("register")
+
+    def read(data, entry, battery_serial):
+        value = data.get(register_type, {}).get(register)
+        if value is None or render is None:
+            return value
+        return render(value, desc)
+
+    return ValueAccessor(register_type, register, read)
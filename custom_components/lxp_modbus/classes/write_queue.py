@@ -0,0 +1,136 @@
+"""Debounced queue coalescing hold register writes before they reach the inverter."""
+import asyncio
+import logging
+from typing import Callable
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class WriteQueue:
+    """Collects register writes for a debounce window and writes them together.
+
+    Within the window the last value queued for a register wins, and every
+    caller waiting on that register gets the result of the write that
+    replaced its value, as confirmed by the inverter. Values equal to the
+    cached register value are not written, unless a write to that register
+    is still in flight. The window starts with the
+    first queued write and is not extended by later ones, so a dragged
+    slider is written at most once per window. All registers queued in a
+    window go to the inverter in one async_write_registers call, i.e. one
+    session.
+    """
+
+    def __init__(self, client, debounce: float):
+        """Initialize the queue writing through client after debounce seconds."""
+        self._client = client
+        self._debounce = debounce
+        self._pending: dict[int, int] = {}
+        # Values of the flushes in progress, not yet confirmed
+        self._inflight: dict[int, int] = {}
+        self._waiters: dict[int, list[asyncio.Future]] = {}
+        self._flush_handle = None
+        self._flush_tasks = set()
+
+        # Statistics
+        self._queued = 0
+        self._coalesced = 0
+        self._skipped = 0
+        self._flushes = 0
+
+    def _current_value(self, register: int) -> int | None:
+        """Return the value the register will have once the queued and in-flight writes are done."""
+        if register in self._pending:
+            return self._pending[register]
+        if register in self._inflight:
+            return self._inflight[register]
+        return self._client.hold_registers.get(register)
+
+    async def async_write(self, register: int, value: int | Callable[[int], int]) -> bool:
+        """Queue a register write and wait for the write that carries it.
+
+        value can be a function composing the new value from the current one
+        (e.g. to set bits), which then sees the values still queued or being
+        written. Returns True once the register holds the last queued value.
+        """
+        if callable(value):
+            value = value(self._current_value(register) or 0)
+        # Registers hold 16 bits, signed values are written in two's complement
+        value &= 0xFFFF
+
+        if (register not in self._pending and register not in self._inflight
+                and self._client.hold_registers.get(register) == value):
+            self._skipped += 1
+            _LOGGER.debug("Register %s already holds %s, not writing it", register, value)
+            return True
+
+        self._queued += 1
+        if register in self._pending:
+            self._coalesced += 1
+        self._pending[register] = value
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(register, []).append(future)
+
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self._debounce, self._start_flush)
+        return await future
+
+    def _start_flush(self) -> None:
+        self._flush_handle = None
+        task = asyncio.get_running_loop().create_task(self.async_flush())
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def async_flush(self) -> None:
+        """Write the queued values now."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, waiters = self._pending, self._waiters
+        self._pending, self._waiters = {}, {}
+        if not pending:
+            return
+
+        # A later value may have brought a register back to what the inverter holds,
+        # unless a write in progress is about to change it
+        hold_registers = self._client.hold_registers
+        values = {
+            register: value for register, value in pending.items()
+            if register in self._inflight or hold_registers.get(register) != value
+        }
+        self._skipped += len(pending) - len(values)
+
+        if values:
+            self._flushes += 1
+            self._inflight.update(values)
+            try:
+                await self._client.async_write_registers(values)
+            except Exception as ex:
+                _LOGGER.error("Queued write of registers %s failed: %s", list(values), ex)
+            finally:
+                for register, value in values.items():
+                    # A later flush of the register keeps its own entry
+                    if self._inflight.get(register) == value:
+                        del self._inflight[register]
+
+        # Confirmed writes are written through to the cache, so each register has its own result
+        for register, futures in waiters.items():
+            success = hold_registers.get(register) == pending[register]
+            for future in futures:
+                if not future.done():
+                    future.set_result(success)
+
+    async def async_shutdown(self) -> None:
+        """Write what is still queued, then wait for the writes in progress."""
+        await self.async_flush()
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def get_stats(self) -> dict:
+        """Get write queue statistics for monitoring and debugging."""
+        return {
+            "debounce": self._debounce,
+            "queued_writes": self._queued,
+            "coalesced_writes": self._coalesced,
+            "skipped_writes": self._skipped,
+            "flushes": self._flushes,
+        }
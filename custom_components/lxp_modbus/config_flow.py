@@ -18,6 +18,12 @@ from .const import (
     CONF_CONNECTION_RETRIES,
     CONF_ENABLE_DEVICE_GROUPING,
     CONF_BATTERY_ENTITIES,
+    CONF_PERSISTENT_CONNECTION,
+    CONF_PIPELINE_WINDOW,
+    CONF_ENERGY_POLL_INTERVAL,
+    CONF_HOLD_POLL_INTERVAL,
+    CONF_HOLD_SENTINEL_CHECK,
+    CONF_WRITE_DEBOUNCE,
     DEFAULT_POLL_INTERVAL,
     DEFAULT_ENTITY_PREFIX,
     DEFAULT_RATED_POWER,
@@ -26,6 +32,12 @@ from .const import (
     DEFAULT_CONNECTION_RETRIES,
     DEFAULT_ENABLE_DEVICE_GROUPING,
     DEFAULT_BATTERY_ENTITIES,
+    DEFAULT_PERSISTENT_CONNECTION,
+    DEFAULT_PIPELINE_WINDOW,
+    DEFAULT_ENERGY_POLL_INTERVAL,
+    DEFAULT_HOLD_POLL_INTERVAL,
+    DEFAULT_HOLD_SENTINEL_CHECK,
+    DEFAULT_WRITE_DEBOUNCE,
     LEGACY_REGISTER_BLOCK_SIZE,
     SERIAL_LENGTH,
 )
@@ -87,6 +99,9 @@ class LxpModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_DONGLE_SERIAL): str,
             vol.Required(CONF_INVERTER_SERIAL): str,
             vol.Required(CONF_POLL_INTERVAL, default=DEFAULT_POLL_INTERVAL): vol.All(int, vol.Range(min=2, max=600)),
+            vol.Optional(CONF_ENERGY_POLL_INTERVAL, default=DEFAULT_ENERGY_POLL_INTERVAL): vol.All(int, vol.Range(min=2, max=3600)),
+            vol.Optional(CONF_HOLD_POLL_INTERVAL, default=DEFAULT_HOLD_POLL_INTERVAL): vol.All(int, vol.Range(min=10, max=86400)),
+            vol.Optional(CONF_HOLD_SENTINEL_CHECK, default=DEFAULT_HOLD_SENTINEL_CHECK): bool,
             vol.Optional(CONF_ENTITY_PREFIX, default=DEFAULT_ENTITY_PREFIX): str,
             vol.Required(CONF_RATED_POWER, default=DEFAULT_RATED_POWER): vol.All(int, vol.Range(min=1000, max=100000)),
             vol.Optional(CONF_READ_ONLY, default=DEFAULT_READ_ONLY): bool,
@@ -94,6 +109,9 @@ class LxpModbusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             vol.Required(CONF_CONNECTION_RETRIES, default=DEFAULT_CONNECTION_RETRIES): vol.All(int, vol.Range(min=1, max=10)),
             vol.Optional(CONF_ENABLE_DEVICE_GROUPING, default=DEFAULT_ENABLE_DEVICE_GROUPING): bool,
             vol.Optional(CONF_BATTERY_ENTITIES, default=DEFAULT_BATTERY_ENTITIES): str,
+            vol.Optional(CONF_PERSISTENT_CONNECTION, default=DEFAULT_PERSISTENT_CONNECTION): bool,
+            vol.Optional(CONF_PIPELINE_WINDOW, default=DEFAULT_PIPELINE_WINDOW): vol.All(int, vol.Range(min=1, max=8)),
+            vol.Optional(CONF_WRITE_DEBOUNCE, default=DEFAULT_WRITE_DEBOUNCE): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
         })
         return self.async_show_form(step_id="user", data_schema=self.add_suggested_values_to_schema(data_schema, user_input), errors=errors)
 
@@ -145,6 +163,9 @@ class LxpModbusOptionsFlow(config_entries.OptionsFlow):
             vol.Required(CONF_DONGLE_SERIAL, default=current_config.get(CONF_DONGLE_SERIAL)): str,
             vol.Required(CONF_INVERTER_SERIAL, default=current_config.get(CONF_INVERTER_SERIAL)): str,
             vol.Required(CONF_POLL_INTERVAL, default=current_config.get(CONF_POLL_INTERVAL)): vol.All(int, vol.Range(min=2, max=600)),
+            vol.Optional(CONF_ENERGY_POLL_INTERVAL, default=current_config.get(CONF_ENERGY_POLL_INTERVAL, DEFAULT_ENERGY_POLL_INTERVAL)): vol.All(int, vol.Range(min=2, max=3600)),
+            vol.Optional(CONF_HOLD_POLL_INTERVAL, default=current_config.get(CONF_HOLD_POLL_INTERVAL, DEFAULT_HOLD_POLL_INTERVAL)): vol.All(int, vol.Range(min=10, max=86400)),
+            vol.Optional(CONF_HOLD_SENTINEL_CHECK, default=current_config.get(CONF_HOLD_SENTINEL_CHECK, DEFAULT_HOLD_SENTINEL_CHECK)): bool,
             vol.Optional(CONF_ENTITY_PREFIX, default=current_config.get(CONF_ENTITY_PREFIX, '')): vol.All(str),
             vol.Required(CONF_RATED_POWER, default=current_config.get(CONF_RATED_POWER)): vol.All(int, vol.Range(min=1000, max=100000)),
             vol.Optional(CONF_READ_ONLY, default=DEFAULT_READ_ONLY): bool,
@@ -152,6 +173,9 @@ class LxpModbusOptionsFlow(config_entries.OptionsFlow):
             vol.Required(CONF_CONNECTION_RETRIES, default=current_config.get(CONF_CONNECTION_RETRIES, DEFAULT_CONNECTION_RETRIES)): vol.All(int, vol.Range(min=1, max=10)),
             vol.Optional(CONF_ENABLE_DEVICE_GROUPING, default=current_config.get(CONF_ENABLE_DEVICE_GROUPING, DEFAULT_ENABLE_DEVICE_GROUPING)): bool,
             vol.Optional(CONF_BATTERY_ENTITIES, default=current_config.get(CONF_BATTERY_ENTITIES, DEFAULT_BATTERY_ENTITIES)): str,
+            vol.Optional(CONF_PERSISTENT_CONNECTION, default=current_config.get(CONF_PERSISTENT_CONNECTION, DEFAULT_PERSISTENT_CONNECTION)): bool,
+            vol.Optional(CONF_PIPELINE_WINDOW, default=current_config.get(CONF_PIPELINE_WINDOW, DEFAULT_PIPELINE_WINDOW)): vol.All(int, vol.Range(min=1, max=8)),
+            vol.Optional(CONF_WRITE_DEBOUNCE, default=current_config.get(CONF_WRITE_DEBOUNCE, DEFAULT_WRITE_DEBOUNCE)): vol.All(vol.Coerce(float), vol.Range(min=0, max=10)),
         })
 
         return self.async_show_form(
@@ -3,6 +3,12 @@ from homeassistant.const import Platform
 
 DOMAIN = "lxp_modbus"
 
+# Service reading all hold registers of every entry right away
+SERVICE_REFRESH_SETTINGS = "refresh_settings"
+
+# hass.data key for connections shared by entries that talk to the same dongle
+DATA_SHARED_SESSIONS = f"{DOMAIN}_shared_sessions"
+
 PLATFORMS: Final = [
     Platform.SENSOR,
     Platform.BINARY_SENSOR,
@@ -25,6 +31,12 @@ CONF_REGISTER_BLOCK_SIZE = "register_block_size"
 CONF_CONNECTION_RETRIES = "connection_retries"
 CONF_ENABLE_DEVICE_GROUPING = "enable_device_grouping"
 CONF_BATTERY_ENTITIES = "battery_entities"
+CONF_PERSISTENT_CONNECTION = "persistent_connection"
+CONF_PIPELINE_WINDOW = "pipeline_window"
+CONF_ENERGY_POLL_INTERVAL = "energy_poll_interval"
+CONF_HOLD_POLL_INTERVAL = "hold_poll_interval"
+CONF_HOLD_SENTINEL_CHECK = "hold_sentinel_check"
+CONF_WRITE_DEBOUNCE = "write_debounce"
 
 INTEGRATION_TITLE = "LuxPower Inverter (Modbus)"
 
@@ -38,27 +50,52 @@ DEFAULT_REGISTER_BLOCK_SIZE = 125
 DEFAULT_CONNECTION_RETRIES = 3
 DEFAULT_ENABLE_DEVICE_GROUPING = True
 DEFAULT_BATTERY_ENTITIES = "none"  # User must explicitly enable; not all batteries provide data
+DEFAULT_PERSISTENT_CONNECTION = False
+DEFAULT_PIPELINE_WINDOW = 1  # Requests in flight at once, 1 reads blocks one by one
+DEFAULT_ENERGY_POLL_INTERVAL = 60  # seconds
+DEFAULT_HOLD_POLL_INTERVAL = 600  # seconds
+DEFAULT_HOLD_SENTINEL_CHECK = False
+DEFAULT_WRITE_DEBOUNCE = 0.5  # seconds number values are collected before they are written
 
 # Legacy firmware may only support smaller block sizes
 LEGACY_REGISTER_BLOCK_SIZE = 40
 TOTAL_REGISTERS = 750 # Total number of registers available
 
-# Packet recovery constants
-MAX_PACKET_RECOVERY_ATTEMPTS = 3
+# Polling tiers: live values every poll, energy counters and battery data at
+# the energy interval, hold (configuration) registers at the hold interval
+TIER_LIVE = "live"
+TIER_ENERGY = "energy"
+TIER_HOLD = "hold"
+POLL_TIERS = (TIER_LIVE, TIER_ENERGY, TIER_HOLD)  # Fastest first
+
+# Hold registers checked to decide whether cached settings are still current:
+# function enable bits (21) through the charge/discharge schedule (up to 84),
+# the settings most often changed from the LuxPower app
+HOLD_SENTINEL_START = 21
+HOLD_SENTINEL_COUNT = 64
+# Hold polls answered from the cache in a row before all hold registers are read
+# anyway, picking up settings changed outside the sentinels (about hourly by default)
+HOLD_SENTINEL_MAX_SKIPS = 5
+
 MAX_PACKET_SIZE = 1024  # Maximum reasonable packet size in bytes
-PACKET_RECOVERY_TIMEOUT = 2  # Timeout for packet recovery operations
 
 RESPONSE_OVERHEAD: Final = 37  # Minimum response length from inverter (protocol overhead)
 WRITE_RESPONSE_LENGTH = 76  # Based on documentation for a single write ack
+WRITE_MULTI_MAX_REGISTERS = 32  # Registers per write multiple (0x10) request, well below the Modbus limit
 
 BATTERY_INFO_START_REGISTER = 5000  # Start of battery info register range
 
 # Communication timeouts (seconds)
 READ_TIMEOUT = 3
+BLOCK_READ_TIMEOUT = 2  # A lost block reply is retried rather than waited for
 WRITE_RETRY_DELAY = 1
 INITIAL_RETRY_DELAY = 30
 RETRY_BACKOFF_MULTIPLIER = 1.5
 
+# Block read retries
+BLOCK_READ_RETRIES = 2  # Retries of a block that timed out or came back unusable
+POLL_RESUME_LIMIT = 2  # Reconnects per poll to resume at the first missing block
+
 # Failure thresholds for cached/empty data fallback
 MAX_CACHED_DATA_FAILURES = 5
 MAX_EMPTY_DATA_FAILURES = 3
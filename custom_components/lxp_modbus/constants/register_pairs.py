@@ -0,0 +1,22 @@
+#
+# Luxpower Inverter Modbus RTU Protocol - 32-bit Register Pairs
+#
+# 32-bit values (energy counters, fault and warning bitmasks, running time)
+# are split over a low and a high input register. Every NAME_L / NAME_H pair
+# declared in input_registers.py is listed here, keyed by its low register.
+#
+
+from . import input_registers
+
+
+def _declared_pairs(module) -> dict[int, int]:
+    """Return {low register: high register} for each NAME_L / NAME_H pair in a constants module."""
+    names = {name: value for name, value in vars(module).items() if name.isupper() and isinstance(value, int)}
+    return {
+        value: names[f"{name[:-2]}_H"]
+        for name, value in sorted(names.items(), key=lambda item: item[1])
+        if name.endswith("_L") and f"{name[:-2]}_H" in names
+    }
+
+
+INPUT_REGISTER_PAIRS = _declared_pairs(input_registers)
@@ -4,10 +4,24 @@ import time as time_lib
 from datetime import timedelta
 
 from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
 from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
 
-from .const import INTEGRATION_TITLE
+from .classes.calculation_graph import CalculationGraph
+from .classes.device_facts import DeviceFacts, derive_device_facts
+from .const import (
+    CONF_ENABLE_DEVICE_GROUPING,
+    CONF_INVERTER_SERIAL,
+    DEFAULT_ENABLE_DEVICE_GROUPING,
+    DEFAULT_ENERGY_POLL_INTERVAL,
+    DEFAULT_HOLD_POLL_INTERVAL,
+    DOMAIN,
+    INTEGRATION_TITLE,
+    TIER_ENERGY,
+    TIER_HOLD,
+    TIER_LIVE,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -21,10 +35,17 @@ RECOVERY_ESCALATION_HIGH = 20
 
 
 class LxpModbusDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching LuxPower Modbus data."""
+    """Class to manage fetching LuxPower Modbus data.
 
-    def __init__(self, hass: HomeAssistant, api_client, poll_interval: int, entry_title: str):
-        """Initialize the coordinator."""
+    Updates run every poll_interval and always read the live tier. Energy
+    counters and hold registers are only read once their own, longer,
+    interval has elapsed; the client merges each poll into one snapshot.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_client, poll_interval: int, entry_title: str,
+                 energy_poll_interval: int = DEFAULT_ENERGY_POLL_INTERVAL,
+                 hold_poll_interval: int = DEFAULT_HOLD_POLL_INTERVAL, entry=None):
+        """Initialize the coordinator, entry is the config entry of the inverter."""
         super().__init__(
             hass,
             _LOGGER,
@@ -39,10 +60,220 @@ class LxpModbusDataUpdateCoordinator(DataUpdateCoordinator):
         self._recovery_interval = None
         self._original_poll_interval = poll_interval
 
+        # Interval of each polling tier and when it was last read (monotonic)
+        self._tier_intervals = {
+            TIER_LIVE: poll_interval,
+            TIER_ENERGY: energy_poll_interval,
+            TIER_HOLD: hold_poll_interval,
+        }
+        self._tier_last_polled = {}
+
+        # Descriptions of the entities currently added, keyed by id() with a use count
+        self._descriptions = {}
+        self._read_plan_dirty = False
+
+        # Keys changed by the last update, None notifies every listener
+        self._changes = None
+        # Listeners by the (register type, register) keys in their context, rebuilt when listeners change
+        self._change_index = None
+
+        # Calculated sensor results, re-evaluated when one of their input registers changes
+        self.calculations = CalculationGraph()
+
+        # Derived from each update and shared by all entities, device_info is cached per device_group
+        self._entry = entry
+        self._device_facts = None
+        self._device_infos = {}
+
+    @callback
+    def async_add_description(self, desc: dict):
+        """Track the description of an added entity so its registers are polled.
+
+        Entities call this from async_added_to_hass, which Home Assistant only
+        does for entities enabled in the entity registry. Returns a callback
+        that stops tracking it.
+        """
+        key = id(desc)
+        count = self._descriptions.get(key, (desc, 0))[1]
+        self._descriptions[key] = (desc, count + 1)
+        self._read_plan_dirty = True
+
+        @callback
+        def remove_description():
+            tracked, uses = self._descriptions[key]
+            if uses > 1:
+                self._descriptions[key] = (tracked, uses - 1)
+            else:
+                del self._descriptions[key]
+            self._read_plan_dirty = True
+
+        return remove_description
+
+    @callback
+    def async_add_listener(self, update_callback, context=None):
+        """Listen for data updates; context is the set of keys the listener depends on."""
+        remove_listener = super().async_add_listener(update_callback, context)
+        self._change_index = None
+
+        @callback
+        def remove():
+            remove_listener()
+            self._change_index = None
+
+        return remove
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners whose registers changed in the last update.
+
+        Listeners without a context, and every listener after a failure,
+        a recovery or a manual update, are always notified.
+        """
+        changes, self._changes = self._changes, None
+        if changes is None:
+            super().async_update_listeners()
+            return
+
+        self._async_notify(changes)
+
+    @callback
+    def _async_notify(self, changes) -> None:
+        """Notify the listeners without a context and those depending on one of the changed keys."""
+        if self._change_index is None:
+            self._change_index = self._build_change_index()
+        always, by_key = self._change_index
+        notify = dict.fromkeys(always)
+        for key in changes:
+            notify.update(dict.fromkeys(by_key.get(key, ())))
+        for update_callback in notify:
+            update_callback()
+
+    def _pop_client_changes(self) -> set:
+        """Take the registers the client saw change, dropping the calculations depending on them."""
+        changes = self.api_client.pop_changes()
+        self.calculations.invalidate(changes["input"])
+        return {(register_type, key) for register_type, keys in changes.items() for key in keys}
+
+    @callback
+    def async_notify_changes(self) -> None:
+        """Notify the entities depending on registers changed outside an update, e.g. by a confirmed write."""
+        self._async_notify(self._pop_client_changes())
+
+    async def async_read_back(self, register_type: str, registers) -> None:
+        """Read back the registers a control can affect, then notify only the entities depending on them.
+
+        Takes one request per block instead of a full refresh.
+        """
+        await self.api_client.async_read_back(register_type, registers)
+        self.async_notify_changes()
+
+    def _build_change_index(self) -> tuple[list, dict]:
+        """Return the listeners without a context, and the others by key."""
+        always, by_key = [], {}
+        for update_callback, context in self._listeners.values():
+            if context is None:
+                always.append(update_callback)
+                continue
+            for key in context:
+                by_key.setdefault(key, []).append(update_callback)
+        return always, by_key
+
+    @property
+    def device_facts(self) -> DeviceFacts:
+        """Return the firmware version and parallel role of the inverter as of the last update."""
+        if self._device_facts is None:
+            self._device_facts = derive_device_facts(self.data)
+        return self._device_facts
+
+    def device_info(self, device_group: str | None = None) -> dict:
+        """Return the device info of the inverter, or of one of its sub-devices if grouping is enabled."""
+        if not self._entry.data.get(CONF_ENABLE_DEVICE_GROUPING, DEFAULT_ENABLE_DEVICE_GROUPING):
+            device_group = None
+        info = self._device_infos.get(device_group)
+        if info is None:
+            info = self._device_infos[device_group] = self._build_device_info(device_group)
+        return info
+
+    def _build_device_info(self, device_group: str | None) -> dict:
+        entry = self._entry
+        main_device_id = (DOMAIN, entry.entry_id)
+        model = entry.data.get("model") or "Unknown"
+        if device_group:
+            # Sub-device grouped under the main inverter
+            return {
+                "identifiers": {(DOMAIN, f"{entry.entry_id}_{device_group}")},
+                "name": f"{entry.title or INTEGRATION_TITLE} - {device_group}",
+                "manufacturer": "LuxpowerTek",
+                "model": model,
+                "via_device": main_device_id,
+            }
+        return {
+            "identifiers": {main_device_id},
+            "name": entry.title or INTEGRATION_TITLE,
+            "manufacturer": "LuxpowerTek",
+            "model": model,
+            "serial_number": entry.data.get(CONF_INVERTER_SERIAL),
+            "sw_version": self.device_facts.firmware_version,
+        }
+
+    def _update_device_facts(self, data: dict) -> None:
+        """Derive the device facts of a new snapshot, updating the device registry if the firmware changed."""
+        previous = self._device_facts
+        self._device_facts = facts = derive_device_facts(data)
+        if previous is None or previous.firmware_version == facts.firmware_version:
+            return
+        self._device_infos.clear()
+        if self._entry is None or facts.firmware_version is None:
+            return
+        registry = dr.async_get(self.hass)
+        device = registry.async_get_device(identifiers={(DOMAIN, self._entry.entry_id)})
+        if device is not None and device.sw_version != facts.firmware_version:
+            _LOGGER.info("Firmware changed to %s", facts.firmware_version)
+            registry.async_update_device(device.id, sw_version=facts.firmware_version)
+
+    def _update_read_plan(self):
+        """Recompile the client's read plan if the set of entities changed."""
+        if not self._read_plan_dirty:
+            return
+        self._read_plan_dirty = False
+        descriptions = [desc for desc, _ in self._descriptions.values()]
+        # Until entities are added (first refresh) every register is polled
+        self.api_client.set_read_plan(descriptions or None)
+
+    async def async_refresh_hold_registers(self):
+        """Read every hold register now instead of waiting for the hold tier."""
+        self.api_client.request_hold_refresh()
+        self._tier_last_polled.pop(TIER_HOLD, None)
+        await self.async_request_refresh()
+
+    def _due_tiers(self, now: float) -> set:
+        """Return the tiers whose interval has elapsed.
+
+        Updates are only scheduled every poll interval, so a tier is taken as
+        due up to half a poll interval early rather than a whole poll late.
+        """
+        slack = self._original_poll_interval / 2
+        return {
+            tier for tier, interval in self._tier_intervals.items()
+            if tier == TIER_LIVE
+            or tier not in self._tier_last_polled
+            or now - self._tier_last_polled[tier] >= interval - slack
+        }
+
     async def _async_update_data(self):
         """Fetch data from API endpoint."""
         try:
-            data = await self.api_client.async_get_data()
+            self._update_read_plan()
+            now = time_lib.monotonic()
+            tiers = self._due_tiers(now)
+            data = await self.api_client.async_get_data(tiers)
+            changes = self._pop_client_changes()
+            # After a failure entities also need to become available again
+            if self.last_update_success:
+                self._changes = changes
+            self._update_device_facts(data)
+            for tier in tiers:
+                self._tier_last_polled[tier] = now
             self._failed_updates = 0
             self._last_success = time_lib.time()
 
@@ -58,6 +289,7 @@ class LxpModbusDataUpdateCoordinator(DataUpdateCoordinator):
 
             return data
         except UpdateFailed as err:
+            self._changes = None
             self._failed_updates += 1
 
             # Start recovery mode if we're not already in it
@@ -0,0 +1,95 @@
+"""Lazy loading of the entity description tables, with startup timings per platform."""
+import importlib
+import logging
+import sys
+import time
+from types import ModuleType
+
+from homeassistant.const import Platform
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# Module in entity_descriptions holding the description tables of each platform
+DESCRIPTION_MODULES: dict[Platform, str] = {
+    Platform.SENSOR: "sensor_types",
+    Platform.BINARY_SENSOR: "binary_sensor_types",
+    Platform.NUMBER: "number_types",
+    Platform.TIME: "time_types",
+    Platform.SELECT: "selectbox_types",
+    Platform.BUTTON: "button_types",
+    Platform.SWITCH: "switch_types",
+}
+
+_PACKAGE = f"{__package__}.entity_descriptions"
+
+
+def _module_name(platform: Platform) -> str:
+    return f"{_PACKAGE}.{DESCRIPTION_MODULES[platform]}"
+
+
+def descriptions_loaded(platform: Platform) -> bool:
+    """Return True if the description tables of a platform are already imported."""
+    return _module_name(platform) in sys.modules
+
+
+def load_descriptions(platform: Platform) -> ModuleType:
+    """Import the description module of a platform.
+
+    The tables are built once per process and shared by every config entry.
+    Importing the larger modules builds thousands of dicts and lambdas, so
+    from the event loop use async_load_descriptions instead.
+    """
+    return importlib.import_module(_module_name(platform))
+
+
+async def async_load_descriptions(hass, entry, platform: Platform) -> ModuleType:
+    """Return the description module of a platform, importing it in the executor the first time.
+
+    The import time is added to the startup timings of the entry that paid for it.
+    """
+    if descriptions_loaded(platform):
+        return load_descriptions(platform)
+
+    started = time.perf_counter()
+    module = await hass.async_add_executor_job(load_descriptions, platform)
+    timings = _startup_timings(hass, entry).setdefault(platform, {})
+    timings["import"] = timings.get("import", 0.0) + time.perf_counter() - started
+    return module
+
+
+def record_platform_setup(hass, entry, platform: Platform, started: float, entities: int) -> None:
+    """Record the time a platform took to set up its entities since started (time.perf_counter())."""
+    timings = _startup_timings(hass, entry).setdefault(platform, {})
+    timings["setup"] = time.perf_counter() - started
+    timings["entities"] = entities
+
+
+def _startup_timings(hass, entry) -> dict:
+    return hass.data[DOMAIN][entry.entry_id].setdefault("startup_timings", {})
+
+
+def format_startup_timings(timings: dict) -> str:
+    """Describe the import and setup cost of each platform, slowest first.
+
+    Setup times include the description imports made during the setup.
+    """
+    parts = []
+    for platform, timing in sorted(timings.items(), key=lambda item: -item[1].get("setup", item[1].get("import", 0))):
+        part = f"{platform}: import {timing.get('import', 0.0) * 1000:.0f} ms"
+        if "setup" in timing:
+            part += f", setup {timing['setup'] * 1000:.0f} ms ({timing['entities']} entities)"
+        parts.append(part)
+    return "; ".join(parts) or "no platforms"
+
+
+def log_startup_timings(hass, entry, elapsed: float) -> None:
+    """Log the startup timing report of an entry once all its platforms are set up.
+
+    Platforms are set up concurrently, elapsed is the wall time for all of them.
+    """
+    _LOGGER.info(
+        "Platforms of %s set up in %.0f ms: %s",
+        entry.title, elapsed * 1000, format_startup_timings(_startup_timings(hass, entry)),
+    )
@@ -2,9 +2,7 @@
 import logging
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, CoordinatorEntity
 from homeassistant.helpers.entity import generate_entity_id
-from .utils import format_firmware_version
-from .const import DOMAIN, INTEGRATION_TITLE, CONF_INVERTER_SERIAL, CONF_ENABLE_DEVICE_GROUPING, DEFAULT_ENABLE_DEVICE_GROUPING
-from .constants.input_registers import I_MASTER_SLAVE_PARALLEL_STATUS
+from .classes.read_plan import description_change_keys
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -58,6 +56,14 @@ class ModbusBridgeEntity(CoordinatorEntity):
             else:
                 self._attr_unique_id = f"{entity_prefix}_{self._register}_{id_name}"
 
+        # The coordinator only notifies the entity when one of these registers changed
+        self.coordinator_context = description_change_keys(self._desc, self._battery_serial)
+
+    async def async_added_to_hass(self) -> None:
+        """Register this entity's registers with the coordinator's read plan."""
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_description(self._desc))
+
     @property
     def extra_state_attributes(self):
         """Return the state attributes."""
@@ -68,54 +74,12 @@ class ModbusBridgeEntity(CoordinatorEntity):
             "register_type": self._register_type,
         }
 
-
     @property
     def device_info(self):
-        """Return device information for all entities."""
-
-        # Get the hold registers from the coordinator's data
-        hold_registers = self.coordinator.data.get("hold", {})
-
-        # Specifically check for the registers required for the firmware version
-        required_fw_regs = {k: hold_registers.get(k) for k in [7, 8, 9, 10]}
-
-        # Use the helper function to format the firmware version
-        firmware_version = format_firmware_version(hold_registers)
-
-        # Check if device grouping is enabled in configuration
-        enable_device_grouping = self._entry.data.get(CONF_ENABLE_DEVICE_GROUPING, DEFAULT_ENABLE_DEVICE_GROUPING)
-
-        # Check if entity has a device group (sub-device) and if grouping is enabled
-        device_group = self._desc.get("device_group")
-
-        if device_group and enable_device_grouping:
-            # Create sub-device grouped under main inverter
-            main_device_id = (DOMAIN, self._entry.entry_id)
-            sub_device_id = (DOMAIN, f"{self._entry.entry_id}_{device_group}")
-
-            return {
-                "identifiers": {sub_device_id},
-                "name": f"{self._entry.title or INTEGRATION_TITLE} - {device_group}",
-                "manufacturer": "LuxpowerTek",
-                "model": self._entry.data.get("model") or "Unknown",
-                "via_device": main_device_id,  # Link to parent device
-            }
-        else:
-            # Main inverter device (either no device_group or grouping disabled)
-            return {
-                "identifiers": {(DOMAIN, self._entry.entry_id)},
-                "name": self._entry.title or INTEGRATION_TITLE,
-                "manufacturer": "LuxpowerTek",
-                "model": self._entry.data.get("model") or "Unknown",
-                "serial_number": self._entry.data.get(CONF_INVERTER_SERIAL),
-                "sw_version": firmware_version,
-            }
+        """Return device information for all entities, shared through the coordinator."""
+        return self.coordinator.device_info(self._desc.get("device_group"))
 
     @property
     def is_master(self) -> bool:
         """Return True if the inverter is the master or standalone."""
-        parallel_status = self.coordinator.data.get("input", {}).get(I_MASTER_SLAVE_PARALLEL_STATUS)
-        if parallel_status is None:
-            return True # Assume master if status is unavailable
-        role = parallel_status & 3 # Extract bits 0-1
-        return role != 2 # Not a slave
+        return self.coordinator.device_facts.is_master
@@ -8,7 +8,12 @@ from ..constants.battery_registers import *
 from ..constants.fault_codes import FAULT_CODES
 from ..constants.warning_codes import WARNING_CODES
 from ..const import CONF_RATED_POWER
-from ..utils import decode_bitmask_to_string, get_highest_set_bit
+from ..utils import bitmask_attributes, decode_bitmask_to_string, get_highest_set_bit
+from ..classes.calculation_graph import combined_u32, register_sum
+
+# Intermediates shared by several calculated sensors, computed once per change of their registers
+PV_POWER = register_sum("pv_power", [I_PPV1, I_PPV2, I_PPV3, I_PPV4, I_PPV5, I_PPV6])
+GRID_POWER_TO_USER = register_sum("grid_power_to_user", [I_PTOUSER, I_PTOUSER_S, I_PTOUSER_T, I_PTOUSER_L1N, I_PTOUSER_L2N])
 
 SENSOR_TYPES = [
     # --- Calculated Sensors ---
@@ -44,13 +49,7 @@ SENSOR_TYPES = [
         "enabled": True,
         "visible": True,
         "extract": lambda registers, entry: (
-            lambda battery_discharge, grid_power_total, pv_total: (
-                pv_total + grid_power_total - battery_discharge
-            )
-        )(
-            registers.get(I_PDISCHARGE, 0),
-            sum(registers.get(grid_reg, 0) for grid_reg in [I_PTOUSER, I_PTOUSER_S, I_PTOUSER_T, I_PTOUSER_L1N, I_PTOUSER_L2N]),
-            sum(registers.get(pv_reg, 0) for pv_reg in [I_PPV1, I_PPV2, I_PPV3, I_PPV4, I_PPV5, I_PPV6])
+            PV_POWER(registers) + GRID_POWER_TO_USER(registers) - registers.get(I_PDISCHARGE, 0)
         ),
         "master_only": False,
     },
@@ -459,10 +458,7 @@ SENSOR_TYPES = [
         "name": "PV Power",
         "register_type": "calculated",
         "depends_on": [I_PPV1, I_PPV2, I_PPV3, I_PPV4, I_PPV5, I_PPV6],
-        "extract": lambda registers, entry: (
-            registers.get(I_PPV1, 0) + registers.get(I_PPV2, 0) + registers.get(I_PPV3, 0)
-            + registers.get(I_PPV4, 0) + registers.get(I_PPV5, 0) + registers.get(I_PPV6, 0)
-        ),
+        "extract": lambda registers, entry: PV_POWER(registers),
         "unit": "W",
         "device_class": "power",
         "state_class": "measurement",
@@ -2153,7 +2149,7 @@ SENSOR_TYPES = [
         "enabled": True,
         "visible": True,
         "extract": lambda registers, entry: get_highest_set_bit(
-            (registers.get(I_FAULT_CODE_H, 0) << 16) | registers.get(I_FAULT_CODE_L, 0)
+            combined_u32(I_FAULT_CODE_L, I_FAULT_CODE_H)(registers)
         ),
         "master_only": False,
     },
@@ -2165,10 +2161,13 @@ SENSOR_TYPES = [
         "enabled": True,
         "visible": True,
         "extract": lambda registers, entry: decode_bitmask_to_string(
-            (registers.get(I_FAULT_CODE_H, 0) << 16) | registers.get(I_FAULT_CODE_L, 0),
+            combined_u32(I_FAULT_CODE_L, I_FAULT_CODE_H)(registers),
             FAULT_CODES,
             "No Faults"
         ),
+        "attributes": lambda registers, entry: bitmask_attributes(
+            combined_u32(I_FAULT_CODE_L, I_FAULT_CODE_H)(registers), FAULT_CODES
+        ),
         "master_only": False,
     },
     {
@@ -2179,7 +2178,7 @@ SENSOR_TYPES = [
         "enabled": True,
         "visible": True,
         "extract": lambda registers, entry: get_highest_set_bit(
-            (registers.get(I_WARNING_CODE_H, 0) << 16) | registers.get(I_WARNING_CODE_L, 0)
+            combined_u32(I_WARNING_CODE_L, I_WARNING_CODE_H)(registers)
         ),
         "master_only": False,
     },
@@ -2191,10 +2190,13 @@ SENSOR_TYPES = [
         "enabled": True,
         "visible": True,
         "extract": lambda registers, entry: decode_bitmask_to_string(
-            (registers.get(I_WARNING_CODE_H, 0) << 16) | registers.get(I_WARNING_CODE_L, 0),
+            combined_u32(I_WARNING_CODE_L, I_WARNING_CODE_H)(registers),
             WARNING_CODES,
             "No Warnings"
         ),
+        "attributes": lambda registers, entry: bitmask_attributes(
+            combined_u32(I_WARNING_CODE_L, I_WARNING_CODE_H)(registers), WARNING_CODES
+        ),
         "master_only": False,
     },
 
@@ -2267,7 +2269,7 @@ SENSOR_TYPES = [
         "name": "Total Running Time",
         "register_type": "calculated",
         "depends_on": [I_RUNNING_TIME_L, I_RUNNING_TIME_H],
-        "extract": lambda registers, entry: (registers.get(I_RUNNING_TIME_H, 0) << 16) | registers.get(I_RUNNING_TIME_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_RUNNING_TIME_L, I_RUNNING_TIME_H)(registers),
         "unit": "s",
         "device_class": "duration",
         "state_class": "total_increasing",
@@ -2281,7 +2283,7 @@ SENSOR_TYPES = [
         "name": "PV1 Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EPV1_ALL_L, I_EPV1_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EPV1_ALL_H, 0) << 16) | registers.get(I_EPV1_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EPV1_ALL_L, I_EPV1_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2297,7 +2299,7 @@ SENSOR_TYPES = [
         "name": "PV2 Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EPV2_ALL_L, I_EPV2_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EPV2_ALL_H, 0) << 16) | registers.get(I_EPV2_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EPV2_ALL_L, I_EPV2_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2313,7 +2315,7 @@ SENSOR_TYPES = [
         "name": "PV3 Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EPV3_ALL_L, I_EPV3_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EPV3_ALL_H, 0) << 16) | registers.get(I_EPV3_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EPV3_ALL_L, I_EPV3_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2329,7 +2331,7 @@ SENSOR_TYPES = [
         "name": "PV4 Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EPV4_ALL_L, I_EPV4_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EPV4_ALL_H, 0) << 16) | registers.get(I_EPV4_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EPV4_ALL_L, I_EPV4_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2345,7 +2347,7 @@ SENSOR_TYPES = [
          "name": "PV5 Energy Total",
          "register_type": "calculated",
          "depends_on": [I_EPV5_ALL_L, I_EPV5_ALL_H],
-         "extract": lambda registers, entry: (registers.get(I_EPV5_ALL_H, 0) << 16) | registers.get(I_EPV5_ALL_L, 0),
+         "extract": lambda registers, entry: combined_u32(I_EPV5_ALL_L, I_EPV5_ALL_H)(registers),
          "unit": "kWh",
          "device_class": "energy",
          "state_class": "total_increasing",
@@ -2361,7 +2363,7 @@ SENSOR_TYPES = [
          "name": "PV6 Energy Total",
          "register_type": "calculated",
          "depends_on": [I_EPV6_ALL_L, I_EPV6_ALL_H],
-         "extract": lambda registers, entry: (registers.get(I_EPV6_ALL_H, 0) << 16) | registers.get(I_EPV6_ALL_L, 0),
+         "extract": lambda registers, entry: combined_u32(I_EPV6_ALL_L, I_EPV6_ALL_H)(registers),
          "unit": "kWh",
          "device_class": "energy",
          "state_class": "total_increasing",
@@ -2385,12 +2387,12 @@ SENSOR_TYPES = [
             I_EPV6_ALL_L, I_EPV6_ALL_H,
         ],
         "extract": lambda registers, entry: (
-            ((registers.get(I_EPV1_ALL_H, 0) << 16) | registers.get(I_EPV1_ALL_L, 0))
-            + ((registers.get(I_EPV2_ALL_H, 0) << 16) | registers.get(I_EPV2_ALL_L, 0))
-            + ((registers.get(I_EPV3_ALL_H, 0) << 16) | registers.get(I_EPV3_ALL_L, 0))
-            + ((registers.get(I_EPV4_ALL_H, 0) << 16) | registers.get(I_EPV4_ALL_L, 0))
-            + ((registers.get(I_EPV5_ALL_H, 0) << 16) | registers.get(I_EPV5_ALL_L, 0))
-            + ((registers.get(I_EPV6_ALL_H, 0) << 16) | registers.get(I_EPV6_ALL_L, 0))
+            combined_u32(I_EPV1_ALL_L, I_EPV1_ALL_H)(registers)
+            + combined_u32(I_EPV2_ALL_L, I_EPV2_ALL_H)(registers)
+            + combined_u32(I_EPV3_ALL_L, I_EPV3_ALL_H)(registers)
+            + combined_u32(I_EPV4_ALL_L, I_EPV4_ALL_H)(registers)
+            + combined_u32(I_EPV5_ALL_L, I_EPV5_ALL_H)(registers)
+            + combined_u32(I_EPV6_ALL_L, I_EPV6_ALL_H)(registers)
         ),
         "unit": "kWh",
         "device_class": "energy",
@@ -2407,7 +2409,7 @@ SENSOR_TYPES = [
         "name": "Inverter Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EINV_ALL_L, I_EINV_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EINV_ALL_H, 0) << 16) | registers.get(I_EINV_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EINV_ALL_L, I_EINV_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2422,7 +2424,7 @@ SENSOR_TYPES = [
         "name": "AC Charge Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EREC_ALL_L, I_EREC_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EREC_ALL_H, 0) << 16) | registers.get(I_EREC_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EREC_ALL_L, I_EREC_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2437,7 +2439,7 @@ SENSOR_TYPES = [
         "name": "Charge Energy Total",
         "register_type": "calculated",
         "depends_on": [I_ECHG_ALL_L, I_ECHG_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_ECHG_ALL_H, 0) << 16) | registers.get(I_ECHG_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_ECHG_ALL_L, I_ECHG_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2452,7 +2454,7 @@ SENSOR_TYPES = [
         "name": "Discharge Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EDISCHG_ALL_L, I_EDISCHG_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EDISCHG_ALL_H, 0) << 16) | registers.get(I_EDISCHG_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EDISCHG_ALL_L, I_EDISCHG_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2467,7 +2469,7 @@ SENSOR_TYPES = [
         "name": "EPS Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EEPS_ALL_L, I_EEPS_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EEPS_ALL_H, 0) << 16) | registers.get(I_EEPS_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EEPS_ALL_L, I_EEPS_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2483,7 +2485,7 @@ SENSOR_TYPES = [
         "name": "EPS Energy Total L1N",
         "register_type": "calculated",
         "depends_on": [I_EEPS_L1N_ALL_L, I_EEPS_L1N_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EEPS_L1N_ALL_H, 0) << 16) | registers.get(I_EEPS_L1N_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EEPS_L1N_ALL_L, I_EEPS_L1N_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2499,7 +2501,7 @@ SENSOR_TYPES = [
         "name": "EPS Energy Total L2N",
         "register_type": "calculated",
         "depends_on": [I_EEPS_L2N_ALL_L, I_EEPS_L2N_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EEPS_L2N_ALL_H, 0) << 16) | registers.get(I_EEPS_L2N_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EEPS_L2N_ALL_L, I_EEPS_L2N_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2515,7 +2517,7 @@ SENSOR_TYPES = [
         "name": "Energy to Grid Total",
         "register_type": "calculated",
         "depends_on": [I_ETOGRID_ALL_L, I_ETOGRID_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_ETOGRID_ALL_H, 0) << 16) | registers.get(I_ETOGRID_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_ETOGRID_ALL_L, I_ETOGRID_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2531,7 +2533,7 @@ SENSOR_TYPES = [
         "name": "Energy from Grid Total",
         "register_type": "calculated",
         "depends_on": [I_ETOUSER_ALL_L, I_ETOUSER_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_ETOUSER_ALL_H, 0) << 16) | registers.get(I_ETOUSER_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_ETOUSER_ALL_L, I_ETOUSER_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2547,7 +2549,7 @@ SENSOR_TYPES = [
         "name": "Generator Energy Total",
         "register_type": "calculated",
         "depends_on": [I_EGEN_ALL_L, I_EGEN_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_EGEN_ALL_H, 0) << 16) | registers.get(I_EGEN_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_EGEN_ALL_L, I_EGEN_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
@@ -2563,7 +2565,7 @@ SENSOR_TYPES = [
         "name": "Load Consumption Total",
         "register_type": "calculated",
         "depends_on": [I_ELOAD_ALL_L, I_ELOAD_ALL_H],
-        "extract": lambda registers, entry: (registers.get(I_ELOAD_ALL_H, 0) << 16) | registers.get(I_ELOAD_ALL_L, 0),
+        "extract": lambda registers, entry: combined_u32(I_ELOAD_ALL_L, I_ELOAD_ALL_H)(registers),
         "unit": "kWh",
         "device_class": "energy",
         "state_class": "total_increasing",
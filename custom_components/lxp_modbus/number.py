@@ -1,32 +1,44 @@
 import logging
+import time
 
 from homeassistant.components.number import NumberEntity, NumberMode
+from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN, CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX
+from .descriptions import async_load_descriptions, record_platform_setup
 from .entity import ModbusBridgeEntity
-from .entity_descriptions.number_types import NUMBER_TYPES
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up number entities from a config entry."""
+    started = time.perf_counter()
+    descriptions = await async_load_descriptions(hass, entry, Platform.NUMBER)
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entity_prefix = hass.data[DOMAIN][entry.entry_id]['settings'].get(CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX)
     api_client = hass.data[DOMAIN][entry.entry_id]["api_client"]
+    write_queue = hass.data[DOMAIN][entry.entry_id]["write_queue"]
     
     entities = [
-        ModbusBridgeNumber(coordinator, entry, desc, entity_prefix, api_client)
-        for desc in NUMBER_TYPES
+        ModbusBridgeNumber(coordinator, entry, desc, entity_prefix, api_client, write_queue)
+        for desc in descriptions.NUMBER_TYPES
     ]
     async_add_entities(entities)
+    record_platform_setup(hass, entry, Platform.NUMBER, started, len(entities))
 
 class ModbusBridgeNumber(ModbusBridgeEntity, NumberEntity):
     """Represents a number entity that reads and writes a register value."""
 
-    def __init__(self, coordinator: DataUpdateCoordinator, entry, desc: dict, entity_prefix: str, api_client):
-        """Initialize the number entity."""
+    def __init__(self, coordinator: DataUpdateCoordinator, entry, desc: dict, entity_prefix: str, api_client,
+                 write_queue=None):
+        """Initialize the number entity.
+
+        Values are written through write_queue if given, so quick successive
+        values (e.g. a dragged slider) are coalesced into one write.
+        """
         super().__init__(coordinator, entry, desc, entity_prefix, api_client)
+        self._write_queue = write_queue
         
         # Set number-specific attributes from the description
         self._attr_native_min_value = desc["min"]
@@ -68,20 +80,33 @@ class ModbusBridgeNumber(ModbusBridgeEntity, NumberEntity):
         # Scale the UI value up to the raw integer value for writing to the register
         value_to_write = int(value * self._multiplier)
 
+        if not self._api_client:
+            _LOGGER.error("API client not found, cannot write to number '%s'", self.name)
+            return
+
+        if self._write_queue is not None:
+            # Compose against the queued value, another number may share the register
+            if self._compose_fn:
+                compose = self._compose_fn
+                success = await self._write_queue.async_write(
+                    self._register, lambda current: compose(current, value_to_write))
+            else:
+                success = await self._write_queue.async_write(self._register, value_to_write)
+            if success:
+                # The confirmed value is already written through to the coordinator data
+                self.coordinator.async_notify_changes()
+            return
+
         # Apply compose function if defined (for handling signed values, bit manipulation, etc.)
         if self._compose_fn:
             # Get current register value for compose function
             current_value = self.coordinator.data.get(self._register_type, {}).get(self._register, 0)
             value_to_write = self._compose_fn(current_value, value_to_write)
 
-        if not self._api_client:
-            _LOGGER.error("API client not found, cannot write to number '%s'", self.name)
-            return
-
         # Call the write method on the API client
         success = await self._api_client.async_write_register(self._register, value_to_write)
         
         if success:
-            # Optimistically update the coordinator's data and refresh the entity
-            self.coordinator.data[self._register_type][self._register] = value_to_write
-            self.async_write_ha_state()
\ No newline at end of file
+            # The confirmed value is written through to the coordinator data, update every
+            # entity reading the register
+            self.coordinator.async_notify_changes()
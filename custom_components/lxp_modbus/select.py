@@ -1,25 +1,30 @@
 import logging
+import time
 
 from homeassistant.components.select import SelectEntity
+from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN, CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX
+from .descriptions import async_load_descriptions, record_platform_setup
 from .entity import ModbusBridgeEntity
-from .entity_descriptions.selectbox_types import SELECTBOX_TYPES
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up select entities from a config entry."""
+    started = time.perf_counter()
+    descriptions = await async_load_descriptions(hass, entry, Platform.SELECT)
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entity_prefix = hass.data[DOMAIN][entry.entry_id]['settings'].get(CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX)
     api_client = hass.data[DOMAIN][entry.entry_id]["api_client"]
     
     entities = [
         ModbusBridgeSelect(coordinator, entry, desc, entity_prefix, api_client)
-        for desc in SELECTBOX_TYPES
+        for desc in descriptions.SELECTBOX_TYPES
     ]
     async_add_entities(entities)
+    record_platform_setup(hass, entry, Platform.SELECT, started, len(entities))
 
 class ModbusBridgeSelect(ModbusBridgeEntity, SelectEntity):
     """Represents a select entity that maps a register value to a list of options."""
@@ -68,6 +73,6 @@ class ModbusBridgeSelect(ModbusBridgeEntity, SelectEntity):
         success = await self._api_client.async_write_register(self._register, new_register_value)
         
         if success:
-            # Optimistically update the coordinator's data and refresh the entity
-            self.coordinator.data[self._register_type][self._register] = new_register_value
-            self.async_write_ha_state()
\ No newline at end of file
+            # The confirmed value is written through to the coordinator data, update every
+            # entity reading the register
+            self.coordinator.async_notify_changes()
\ No newline at end of file
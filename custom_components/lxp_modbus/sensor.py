@@ -1,4 +1,5 @@
 import logging
+import time
 from datetime import time as dt_time
 
 from homeassistant.components.sensor import SensorEntity
@@ -15,17 +16,16 @@ from .const import (
     DEFAULT_ENTITY_PREFIX,
     DEFAULT_BATTERY_ENTITIES,
 )
+from .classes.value_accessor import compile_readonly_description, compile_sensor_description
+from .descriptions import async_load_descriptions, record_platform_setup
 from .entity import ModbusBridgeEntity
-from .entity_descriptions.sensor_types import SENSOR_TYPES, BATTERY_SENSOR_TYPES
-from .entity_descriptions.number_types import NUMBER_TYPES
-from .entity_descriptions.selectbox_types import SELECTBOX_TYPES
-from .entity_descriptions.switch_types import SWITCH_TYPES
-from .entity_descriptions.time_types import TIME_TYPES
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up sensor entities from a config entry."""
+    started = time.perf_counter()
+    descriptions = await async_load_descriptions(hass, entry, Platform.SENSOR)
     is_read_only = entry.data.get(CONF_READ_ONLY, DEFAULT_READ_ONLY)
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entity_prefix = hass.data[DOMAIN][entry.entry_id]['settings'].get(CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX)
@@ -39,23 +39,24 @@ async def async_setup_entry(hass, entry, async_add_entities):
     # Create a list to hold all the entities we're about to create
     entities = [
         ModbusBridgeSensor(coordinator, entry, desc, entity_prefix, api_client)
-        for desc in SENSOR_TYPES
+        for desc in descriptions.SENSOR_TYPES
     ]
 
     # If in read-only mode, create read-only sensors for all the control types
     if is_read_only:
         _LOGGER.info("Read-only mode: creating sensors for numbers, switches, selects, and times.")
 
-        # Combine all control type descriptions into one list to iterate through
+        # The control descriptions are only loaded in read-only mode, where their platforms are not
         readonly_types = (
-            (NUMBER_TYPES, Platform.NUMBER),
-            (SWITCH_TYPES, Platform.SWITCH),
-            (SELECTBOX_TYPES, Platform.SELECT),
-            (TIME_TYPES, Platform.TIME),
+            (Platform.NUMBER, "NUMBER_TYPES"),
+            (Platform.SWITCH, "SWITCH_TYPES"),
+            (Platform.SELECT, "SELECTBOX_TYPES"),
+            (Platform.TIME, "TIME_TYPES"),
         )
 
-        for descriptions, platform in readonly_types:
-            for desc in descriptions:
+        for platform, table in readonly_types:
+            control_descriptions = await async_load_descriptions(hass, entry, platform)
+            for desc in getattr(control_descriptions, table):
                 entities.append(ModbusBridgeReadOnlySensor(coordinator, entry, desc, entity_prefix, platform))
 
     # --- Battery entity setup ---
@@ -65,7 +66,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         """Create battery sensor entities for a given battery serial."""
         known_batteries.add(serial)
         bat_entities = []
-        for generic_desc in BATTERY_SENSOR_TYPES:
+        for generic_desc in descriptions.BATTERY_SENSOR_TYPES:
             desc = dict(generic_desc)
             desc["device_group"] = f"Battery {serial}"
             bat_entities.append(
@@ -88,6 +89,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
             entities.extend(_create_battery_sensors(serial))
 
     async_add_entities(entities)
+    record_platform_setup(hass, entry, Platform.SENSOR, started, len(entities))
 
     # If auto-discovery is enabled, register a coordinator listener
     if 'auto' in battery_entities_cfg:
@@ -104,6 +106,9 @@ class ModbusBridgeSensor(ModbusBridgeEntity, SensorEntity):
         # Call the parent __init__ to handle all the common setup
         super().__init__(coordinator, entry, desc, entity_prefix, api_client)
 
+        # Evaluated on every state update, compiled once from the description
+        self._accessor = compile_sensor_description(self._desc, coordinator.calculations)
+
         # Set sensor-specific attributes from the description dictionary
         self._attr_state_class = self._desc.get("state_class")
         self._attr_suggested_display_precision = self._desc.get("suggested_display_precision")
@@ -123,49 +128,15 @@ class ModbusBridgeSensor(ModbusBridgeEntity, SensorEntity):
         # Don't return a value until the coordinator has fetched data for the first time
         if not self.coordinator.data:
             return None
+        return self._accessor.read(self.coordinator.data, self._entry, self._battery_serial)
 
-        raw_val = None
-
-        # Determine the raw (unscaled) value based on the sensor type
-        if self._register_type == "calculated":
-            # For calculated sensors, call the special 'extract' lambda
-            input_data = self.coordinator.data.get("input", {})
-            calculation_func = self._desc["extract"]
-            raw_val = calculation_func(input_data, self._entry)
-        elif self._register_type == "battery":
-            battery_data = self.coordinator.data.get("battery", {}).get(self._battery_serial, {})
-            value = battery_data.get(self._register)
-            if value is not None:
-                raw_val = self._desc["extract"](value)
-        elif self._register_type == "battery_calculated":
-            battery_data = self.coordinator.data.get("battery", {}).get(self._battery_serial, {})
-            calculation_func = self._desc["extract"]
-            raw_val = calculation_func(battery_data, self._entry)
-        else:
-            # For standard register-based sensors, get the value from the coordinator's data
-            registers = self.coordinator.data.get(self._register_type, {})
-            value = registers.get(self._register)
-            if value is not None:
-                # Use the 'extract' lambda to parse the value (e.g., for packed bits)
-                raw_val = self._desc["extract"](value)
-
-        # If we still couldn't determine a raw value, return an unknown state
-        if raw_val is None:
-            return None
-
-        # If the sensor has an 'options' map, use it to return a text state
-        if "options" in self._desc:
-            return self._desc["options"].get(raw_val, self._desc.get("default", "Unknown"))
-
-        # If the sensor has a 'scale' factor, apply it
-        if "scale" in self._desc:
-            scale = self._desc["scale"]
-            scaled_value = raw_val * scale
-            # Return a clean integer if it's a whole number, otherwise return the float
-            return int(scaled_value) if scaled_value == int(scaled_value) else scaled_value
-
-        # For any other sensor (like a code), return the raw value directly
-        return raw_val
+    @property
+    def extra_state_attributes(self):
+        """Return the state attributes, with those the description derives from the input registers."""
+        attributes = super().extra_state_attributes
+        if "attributes" in self._desc and self.coordinator.data:
+            attributes = {**attributes, **self._desc["attributes"](self.coordinator.data.get("input", {}), self._entry)}
+        return attributes
 
 
 class ModbusBridgeBatterySensor(ModbusBridgeSensor):
@@ -223,18 +194,12 @@ class ModbusBridgeReadOnlySensor(ModbusBridgeEntity, SensorEntity):
         self._platform = platform
         self._attr_icon = self._desc.get("icon")
         self._attr_unique_id = f"{super().unique_id}_readonly"
+        self._accessor = compile_readonly_description(self._desc, _READONLY_RENDERERS.get(platform))
 
     @property
     def native_value(self):
         """Return the state of the sensor, formatted correctly for its original type."""
-        register_value = self.coordinator.data.get(self._register_type, {}).get(self._register)
-        if register_value is None:
-            return None
-
-        renderer = _READONLY_RENDERERS.get(self._platform)
-        if renderer:
-            return renderer(register_value, self._desc)
-        return register_value
+        return self._accessor.read(self.coordinator.data, self._entry, None)
 
     @property
     def native_unit_of_measurement(self) -> str | None:
@@ -1,25 +1,30 @@
 import logging
+import time
 
 from homeassistant.components.switch import SwitchEntity
+from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN, CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX
+from .descriptions import async_load_descriptions, record_platform_setup
 from .entity import ModbusBridgeEntity
-from .entity_descriptions.switch_types import SWITCH_TYPES
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up switch entities from a config entry."""
+    started = time.perf_counter()
+    descriptions = await async_load_descriptions(hass, entry, Platform.SWITCH)
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entity_prefix = hass.data[DOMAIN][entry.entry_id]['settings'].get(CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX)
     api_client = hass.data[DOMAIN][entry.entry_id]["api_client"]
 
     entities = [
         ModbusBridgeSwitch(coordinator, entry, desc, entity_prefix, api_client)
-        for desc in SWITCH_TYPES
+        for desc in descriptions.SWITCH_TYPES
     ]
     async_add_entities(entities)
+    record_platform_setup(hass, entry, Platform.SWITCH, started, len(entities))
 
 class ModbusBridgeSwitch(ModbusBridgeEntity, SwitchEntity):
     """Represents a switch entity that controls a bit in a register."""
@@ -69,7 +74,6 @@ class ModbusBridgeSwitch(ModbusBridgeEntity, SwitchEntity):
         success = await self._api_client.async_write_register(self._register, new_register_value)
         
         if success:
-            # Optimistically update the coordinator's data with the new register value
-            self.coordinator.data[self._register_type][self._register] = new_register_value
-            # Tell HA to update the state of this entity immediately
-            self.async_write_ha_state()
\ No newline at end of file
+            # The confirmed value is written through to the coordinator data, update every
+            # entity reading the register (other bits of it included)
+            self.coordinator.async_notify_changes()
\ No newline at end of file
@@ -1,26 +1,31 @@
 import logging
+import time
 from datetime import time as dt_time
 
 from homeassistant.components.time import TimeEntity
+from homeassistant.const import Platform
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
 from .const import DOMAIN, CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX
+from .descriptions import async_load_descriptions, record_platform_setup
 from .entity import ModbusBridgeEntity
-from .entity_descriptions.time_types import TIME_TYPES
 
 _LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     """Set up time entities from a config entry."""
+    started = time.perf_counter()
+    descriptions = await async_load_descriptions(hass, entry, Platform.TIME)
     coordinator = hass.data[DOMAIN][entry.entry_id]["coordinator"]
     entity_prefix = hass.data[DOMAIN][entry.entry_id]['settings'].get(CONF_ENTITY_PREFIX, DEFAULT_ENTITY_PREFIX)
     api_client = hass.data[DOMAIN][entry.entry_id]["api_client"]
     
     entities = [
         ModbusBridgeTime(coordinator, entry, desc, entity_prefix, api_client)
-        for desc in TIME_TYPES
+        for desc in descriptions.TIME_TYPES
     ]
     async_add_entities(entities)
+    record_platform_setup(hass, entry, Platform.TIME, started, len(entities))
 
 class ModbusBridgeTime(ModbusBridgeEntity, TimeEntity):
     """Represents a time entity that reads and writes a time value to a register."""
@@ -66,6 +71,6 @@ class ModbusBridgeTime(ModbusBridgeEntity, TimeEntity):
         success = await self._api_client.async_write_register(self._register, new_register_value)
         
         if success:
-            # Optimistically update the coordinator's data and refresh the entity
-            self.coordinator.data[self._register_type][self._register] = new_register_value
-            self.async_write_ha_state()
\ No newline at end of file
+            # The confirmed value is written through to the coordinator data, update every
+            # entity reading the register
+            self.coordinator.async_notify_changes()
\ No newline at end of file
@@ -1,3 +1,5 @@
+from functools import lru_cache
+
 def decode_model_from_registers(registers: dict) -> str:
     """
     Decode inverter model from 2 HOLD registers (7 and 8).
@@ -23,15 +25,53 @@ def set_bits(orig_value: int, start_bit: int, bit_count: int, new_bits: int) ->
     # Set new bits
     return cleared | ((new_bits & mask) << start_bit)
 
+# Decoders by id() of their code map; holding the map keeps its id from being reused
+_BITMASK_DECODERS: dict[int, tuple[dict, tuple]] = {}
+
+def _bitmask_tables(code_map: dict) -> tuple:
+    """Return, for each byte of a 32-bit mask, the (bit, message) codes active for every byte value."""
+    decoder = _BITMASK_DECODERS.get(id(code_map))
+    if decoder is None:
+        tables = tuple(
+            tuple(
+                tuple((bit, message) for bit, message in sorted(code_map.items())
+                      if 0 <= bit - 8 * index < 8 and (byte >> (bit - 8 * index)) & 1)
+                for byte in range(256)
+            )
+            for index in range(4)
+        )
+        decoder = _BITMASK_DECODERS[id(code_map)] = (code_map, tables)
+    return decoder[1]
+
+@lru_cache(maxsize=256)
+def _decode_bitmask(map_id: int, value: int) -> tuple[tuple[int, str], ...]:
+    tables = _BITMASK_DECODERS[map_id][1]
+    return (
+        tables[0][value & 0xFF] + tables[1][(value >> 8) & 0xFF]
+        + tables[2][(value >> 16) & 0xFF] + tables[3][(value >> 24) & 0xFF]
+    )
+
+def decode_bitmask(value, code_map: dict) -> tuple[tuple[int, str], ...]:
+    """Return the (bit, message) codes of code_map set in a 32-bit bitmask, lowest bit first.
+
+    Decoding is 4 lookups in per-byte tables built once per code map, and
+    the last few hundred (code map, value) results are cached.
+    """
+    if not value:
+        return ()
+    _bitmask_tables(code_map)
+    return _decode_bitmask(id(code_map), value & 0xFFFFFFFF)
+
 def decode_bitmask_to_string(value, code_map, default_string="OK"):
     """Decodes a 32-bit bitmask into a comma-separated string."""
-    if value is None or value == 0:
+    active_codes = decode_bitmask(value, code_map)
+    if not active_codes:
         return default_string
-    active_messages = []
-    for bit, message in code_map.items():
-        if (value >> bit) & 1:
-            active_messages.append(message)
-    return ", ".join(active_messages) if active_messages else default_string
+    return ", ".join(message for _, message in active_codes)
+
+def bitmask_attributes(value, code_map) -> dict:
+    """Return the active codes of a bitmask as state attributes."""
+    return {"active_codes": [{"bit": bit, "message": message} for bit, message in decode_bitmask(value, code_map)]}
 
 def format_firmware_version(hold_registers: dict) -> str | None:
     """Formats the firmware version string from hold registers to match the app's format."""
@@ -0,0 +1,321 @@
+"""Benchmarks for the protocol hot paths, checked against a stored baseline.
+
+Measures CRC, request building, response parsing, battery decoding and the
+sanity check on the 125-register frames from test_data.py, plus a full poll
+through LxpModbusApiClient against the dongle simulator on a local TCP port.
+For each benchmark the best of several runs is reported in operations per
+second, with the peak memory allocated by one operation (tracemalloc).
+
+Speeds are compared relative to a fixed pure-Python calibration loop, so a
+baseline recorded on one machine can be checked on another. Allocations are
+compared as measured.
+
+    python tests/benchmark.py                  # compare with the baseline, exit 1 on regression
+    python tests/benchmark.py --update         # store the current results as the baseline
+    python tests/benchmark.py --only crc,poll  # run the benchmarks whose name contains crc or poll
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.calculation_graph import CalculationGraph
+from custom_components.lxp_modbus.classes.data_validator import HOLD_TIME_REGISTERS, invalid_registers, is_data_sane
+from custom_components.lxp_modbus.classes.lxp_batteries import LxpBatteries
+from custom_components.lxp_modbus.classes.lxp_packet_utils import LxpPacketUtils
+from custom_components.lxp_modbus.classes.lxp_request_builder import LxpRequestBuilder, LxpRequestCache
+from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
+from custom_components.lxp_modbus.classes.modbus_client import LxpModbusApiClient
+from custom_components.lxp_modbus.classes.register_store import RegisterStore
+from custom_components.lxp_modbus.classes.request_scheduler import RequestScheduler
+from custom_components.lxp_modbus.classes.value_accessor import compile_sensor_description
+from custom_components.lxp_modbus.const import BATTERY_INFO_START_REGISTER, CONF_RATED_POWER, TOTAL_REGISTERS
+from custom_components.lxp_modbus.constants.battery_registers import B_SERIAL_START
+from custom_components.lxp_modbus.constants.input_registers import I_BAT_PARALLEL_NUM, I_STATE
+from custom_components.lxp_modbus.constants.register_pairs import INPUT_REGISTER_PAIRS
+from custom_components.lxp_modbus.entity_descriptions.sensor_types import SENSOR_TYPES
+
+from dongle_simulator import DongleSimulator, build_response, READ_HOLD, READ_INPUT
+from test_data import INPUT_RESPONSES, HOLD_RESPONSES
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "benchmark_baseline.json")
+# Allowed slowdown (relative speed) and allocation growth before a result is a regression
+DEFAULT_TOLERANCE = 0.3
+# Allocation differences below this many bytes are noise
+ALLOCATION_SLACK = 1024
+
+DONGLE = b"DG44302247"
+INVERTER = b"4434280298"
+BATTERY_COUNT = 4
+
+
+def captured_registers(sample: dict, sample_serial: bytes) -> dict[int, int]:
+    """Decode the registers of a captured 125-register response from test_data.py.
+
+    These samples are cut short or fail their CRC on purpose (they exercise
+    packet recovery), so the payload is read directly after the inverter serial.
+    """
+    packet = bytes.fromhex(sample["response_hex"])
+    start = packet.index(sample_serial) + 10
+    register = int.from_bytes(packet[start:start + 2], 'little')
+    payload = packet[start + 3:start + 3 + packet[start + 2]]
+    return {register + i: payload[2 * i] | (payload[2 * i + 1] << 8) for i in range(len(payload) // 2)}
+
+
+def registers_frame(registers: dict[int, int], function_code: int, start: int, count: int) -> bytes:
+    """Build a valid reply frame carrying count registers from start."""
+    payload = b"".join(registers.get(reg, 0).to_bytes(2, 'little') for reg in range(start, start + count))
+    return build_response(DONGLE, INVERTER, function_code, start, payload)
+
+
+def battery_registers(count: int = BATTERY_COUNT) -> dict[int, int]:
+    """Battery block registers (30 per battery) with a serial number in each block."""
+    registers = {}
+    for block in range(count):
+        start = BATTERY_INFO_START_REGISTER + block * 30
+        registers.update({start + n: 100 + n for n in range(30)})
+        serial = f"BAT{block:011d}".encode() + b"\x00\x00"
+        for n in range(0, 16, 2):
+            registers[start + B_SERIAL_START + n // 2] = serial[n] | (serial[n + 1] << 8)
+    return registers
+
+
+INPUT_REGISTERS = captured_registers(INPUT_RESPONSES["DUMMY_INVERTER_287"], INVERTER)
+# The captured hold sample has out of range schedule times, which would fail the sanity check
+HOLD_REGISTERS = {
+    **captured_registers(HOLD_RESPONSES["DUMMY_INVERTER_1_HOLD"], b"DUMMY00001"),
+    **dict.fromkeys(HOLD_TIME_REGISTERS, 0),
+}
+INPUT_FRAME = registers_frame(INPUT_REGISTERS, READ_INPUT, 0, 125)
+HOLD_FRAME = registers_frame(HOLD_REGISTERS, READ_HOLD, 0, 125)
+HOLD_BLOCK = LxpResponse(HOLD_FRAME).registers
+BATTERY_FRAME = registers_frame(battery_registers(), READ_INPUT, BATTERY_INFO_START_REGISTER, 125)
+
+
+def _calibration():
+    total = 0
+    for i in range(1000):
+        total += i * i
+    return total
+
+
+class _PollBenchmark:
+    """Full polls through the client against the simulator on a local TCP port."""
+
+    def __init__(self):
+        simulator = DongleSimulator(
+            input_registers={**INPUT_REGISTERS, **battery_registers()}, hold_registers=HOLD_REGISTERS,
+        )
+        simulator.input_registers[I_BAT_PARALLEL_NUM] = BATTERY_COUNT
+        self._simulator = simulator
+        self._loop = asyncio.new_event_loop()
+        host, port = self._loop.run_until_complete(simulator.async_start())
+        self._client = self._loop.run_until_complete(self._async_client(host, port))
+
+    @staticmethod
+    async def _async_client(host, port):
+        return LxpModbusApiClient(
+            host, port, DONGLE.decode(), INVERTER.decode(), RequestScheduler(),
+            skip_initial_data=False, request_battery_data=True, persistent_connection=True,
+        )
+
+    def __call__(self):
+        # Every tier: input, battery and hold blocks
+        self._client.request_hold_refresh()
+        return self._loop.run_until_complete(self._client.async_get_data())
+
+    def close(self):
+        self._loop.run_until_complete(self._client.async_close())
+        self._loop.run_until_complete(self._simulator.async_stop())
+        self._loop.close()
+
+
+def _store_merge():
+    polled = RegisterStore()
+    for start in range(0, TOTAL_REGISTERS, 125):
+        polled.set_block(start, LxpResponse(INPUT_FRAME).registers)
+    merged = RegisterStore()
+    return lambda: merged.update(polled)
+
+
+def _sensor_values():
+    """Evaluate every inverter sensor once, as a coordinator update does."""
+    data = {"input": RegisterStore(), "hold": RegisterStore(), "battery": {}}
+    data["input"].update(INPUT_REGISTERS)
+    data["hold"].update(HOLD_REGISTERS)
+    entry = SimpleNamespace(data={CONF_RATED_POWER: 5000})
+    accessors = [compile_sensor_description(desc) for desc in SENSOR_TYPES]
+    return lambda: [accessor.read(data, entry, None) for accessor in accessors]
+
+
+def _calculated_sensors():
+    """Re-evaluate the calculated sensors after a poll that changed the live power registers."""
+    registers = RegisterStore()
+    registers.update(INPUT_REGISTERS)
+    entry = SimpleNamespace(data={CONF_RATED_POWER: 5000})
+    graph = CalculationGraph()
+    calculated = [desc for desc in SENSOR_TYPES if desc.get("register_type") == "calculated"]
+    live = range(0, 40)
+
+    def evaluate():
+        graph.invalidate(live)
+        return [graph.evaluate(desc, registers, entry) for desc in calculated]
+
+    return evaluate
+
+
+def _combined_pairs():
+    """Decode every declared 32-bit pair of a store that changed since the last decode."""
+    store = RegisterStore()
+    store.update(INPUT_REGISTERS)
+
+    def decode():
+        store[I_STATE] = store[I_STATE]
+        return store.combined(INPUT_REGISTER_PAIRS)
+
+    return decode
+
+
+def benchmarks() -> dict:
+    """Return the benchmarks as name -> factory of the callable to measure."""
+    crc_data = INPUT_FRAME[20:-2]
+    requests = LxpRequestCache(DONGLE, INVERTER)
+
+    return {
+        "calibration": lambda: _calibration,
+        "crc_125_registers": lambda: lambda: LxpPacketUtils.compute_crc(crc_data),
+        "build_read_request": lambda: lambda: LxpRequestBuilder.prepare_packet_for_read(DONGLE, INVERTER, 0, 125, 4),
+        "build_write_request": lambda: lambda: LxpRequestBuilder.prepare_packet_for_write(DONGLE, INVERTER, 66, 80),
+        "cached_read_request": lambda: lambda: requests.read(0, 125, 4),
+        "cached_write_request": lambda: lambda: requests.write(66, 80),
+        "parse_response_125": lambda: lambda: LxpResponse(INPUT_FRAME),
+        # Fresh responses: the register dict is cached per response
+        "parsed_values_dictionary_125": lambda: lambda: LxpResponse(INPUT_FRAME).parsed_values_dictionary,
+        "battery_info_4_batteries": lambda: lambda: LxpBatteries(LxpResponse(BATTERY_FRAME)).get_battery_info(),
+        "register_store_merge_750": _store_merge,
+        "sensor_values_all": _sensor_values,
+        "calculated_sensors_live_change": _calculated_sensors,
+        "combined_register_pairs": _combined_pairs,
+        "is_data_sane_hold_125": lambda: lambda: is_data_sane(HOLD_REGISTERS, "hold"),
+        "invalid_registers_hold_125": lambda: lambda: invalid_registers(0, HOLD_BLOCK, "hold"),
+        "poll_full_tcp": _PollBenchmark,
+    }
+
+
+def _timed(operation, number: int) -> float:
+    started = time.perf_counter()
+    for _ in range(number):
+        operation()
+    return time.perf_counter() - started
+
+
+def measure(operation, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """Return the best ops/sec over repeat runs of at least min_time, and the peak bytes of one call."""
+    operation()  # warm up caches and connections
+    number = 1
+    elapsed = _timed(operation, number)
+    while elapsed < min_time:
+        number = max(number * 2, int(number * min_time / max(elapsed, 1e-9)))
+        elapsed = _timed(operation, number)
+    best = elapsed / number
+    for _ in range(repeat - 1):
+        best = min(best, _timed(operation, number) / number)
+
+    tracemalloc.start()
+    try:
+        operation()  # allocations made once per process are not counted
+        before, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"ops_per_sec": round(1 / best, 1), "peak_bytes": peak - before}
+
+
+def run_benchmarks(only: list[str] | None = None, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """Run the selected benchmarks (the calibration always runs) and return their results."""
+    results = {}
+    for name, factory in benchmarks().items():
+        if only and name != "calibration" and not any(part in name for part in only):
+            continue
+        operation = factory()
+        try:
+            results[name] = measure(operation, min_time, repeat)
+        finally:
+            if hasattr(operation, "close"):
+                operation.close()
+    return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float = DEFAULT_TOLERANCE) -> list[str]:
+    """Return a description of every result that regressed against the baseline.
+
+    Speeds are compared relative to their run's calibration; benchmarks
+    missing from either side are not compared.
+    """
+    scale = results["calibration"]["ops_per_sec"] / baseline["calibration"]["ops_per_sec"]
+    regressions = []
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if name == "calibration" or expected is None:
+            continue
+        relative = result["ops_per_sec"] / (expected["ops_per_sec"] * scale)
+        if relative < 1 - tolerance:
+            regressions.append(f"{name}: {relative:.0%} of baseline speed")
+        if result["peak_bytes"] > expected["peak_bytes"] * (1 + tolerance) + ALLOCATION_SLACK:
+            regressions.append(f"{name}: peak allocation {result['peak_bytes']} bytes, "
+                               f"baseline {expected['peak_bytes']}")
+    return regressions
+
+
+def _main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the protocol hot paths.")
+    parser.add_argument("--update", action="store_true", help="store the results as the new baseline")
+    parser.add_argument("--only", default="", help="comma separated name filters")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timing run")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    args = parser.parse_args()
+
+    results = run_benchmarks([part for part in args.only.split(",") if part], args.min_time)
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    scale = results["calibration"]["ops_per_sec"] / baseline["calibration"]["ops_per_sec"] if baseline else 1
+
+    print(f"{'benchmark':32} {'ops/sec':>12} {'vs baseline':>12} {'peak bytes':>12}")
+    for name, result in results.items():
+        expected = baseline.get(name)
+        relative = f"{result['ops_per_sec'] / (expected['ops_per_sec'] * scale):.0%}" if expected else "-"
+        print(f"{name:32} {result['ops_per_sec']:12.1f} {relative:>12} {result['peak_bytes']:12d}")
+
+    if args.update:
+        with open(args.baseline, "w") as file:
+            json.dump({**baseline, **results}, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+
+    if not baseline:
+        print("No baseline to compare with, run with --update to create one")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(_main())
@@ -0,0 +1,368 @@
+"""Simulated LuxPower WiFi dongle for tests and benchmarks.
+
+Speaks the A11A / tcp_function 194 protocol for an inverter whose registers
+come from plain tables ({register: value}), e.g. decoded from the captured
+responses in test_data.py. It can be reached over real TCP (async_start) or
+in-process through DongleSimulator.transport(), and can misbehave like real
+dongles: reply latency, greeting and cloud frames, replies concatenated with
+other frames or split into chunks, truncated frames and CRC errors.
+
+Run standalone to serve the test data on a local port:
+
+    python tests/dongle_simulator.py --port 8000 --latency 0.05
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.frame_protocol import LxpFrameProtocol
+from custom_components.lxp_modbus.classes.lxp_packet_utils import LxpPacketUtils
+from custom_components.lxp_modbus.classes.lxp_request_builder import LxpRequestBuilder
+from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
+from custom_components.lxp_modbus.classes.transport import LxpTransport
+
+from test_data import INPUT_RESPONSES, HOLD_RESPONSES, FUNCTION_193_MESSAGE
+
+DEFAULT_DONGLE_SERIAL = b"DG44302247"
+DEFAULT_INVERTER_SERIAL = b"4434280298"
+
+# Response protocol number used by current dongles (value length byte present)
+RESPONSE_PROTOCOL = 5
+READ_HOLD = 3
+READ_INPUT = 4
+WRITE_SINGLE = 6
+WRITE_MULTI = 16
+# Modbus exception codes
+ILLEGAL_FUNCTION = 1
+ILLEGAL_DATA_VALUE = 3
+# Largest block the simulated inverter answers
+MAX_BLOCK_SIZE = 127
+
+GREETING_FRAME = bytes.fromhex(FUNCTION_193_MESSAGE)
+
+
+def registers_from_responses(responses: dict, function_code: int) -> dict[int, int]:
+    """Decode the captured read responses of one function (as in test_data.py) into a register table.
+
+    Samples that are truncated or fail their CRC are skipped.
+    """
+    registers = {}
+    for sample in responses.values():
+        response = LxpResponse(bytes.fromhex(sample["response_hex"]))
+        if not response.packet_error and response.device_function == function_code:
+            registers.update(response.parsed_values_dictionary)
+    return registers
+
+
+def build_response(dongle_serial: bytes, inverter_serial: bytes, device_function: int,
+                   register: int, payload: bytes, value_length_byte: bool = True) -> bytes:
+    """Build a tcp_function 194 frame as sent by the dongle."""
+    data_frame = bytearray()
+    data_frame += (1).to_bytes(1, 'little')  # address/action
+    data_frame += device_function.to_bytes(1, 'little')
+    data_frame += inverter_serial
+    data_frame += register.to_bytes(2, 'little')
+    if value_length_byte:
+        data_frame += len(payload).to_bytes(1, 'little')
+    data_frame += payload
+    crc = LxpPacketUtils.compute_crc(bytes(data_frame))
+
+    frame = bytearray()
+    frame += LxpRequestBuilder.PREFIX
+    frame += RESPONSE_PROTOCOL.to_bytes(2, 'little')
+    frame += (14 + len(data_frame) + 2).to_bytes(2, 'little')  # everything after the frame length
+    frame += (1).to_bytes(1, 'little')
+    frame += LxpRequestBuilder.TRANSLATED_DATA.to_bytes(1, 'little')
+    frame += dongle_serial
+    frame += (len(data_frame) + 2).to_bytes(2, 'little')
+    frame += data_frame
+    frame += crc.to_bytes(2, 'little')
+    return bytes(frame)
+
+
+class DongleSimulator:
+    """Answers A11A requests from register tables, optionally misbehaving.
+
+    Fault options (rates are probabilities per reply, drawn from a seeded RNG
+    so runs are reproducible):
+    - latency: seconds before each reply is sent.
+    - greeting: send a tcp_function 193 frame right after connecting.
+    - concatenate: send a 193 frame in the same write as each reply.
+    - chunk_size: split every write into chunks of this many bytes.
+    - truncate_rate: send only the first half of a reply.
+    - crc_error_rate: corrupt the CRC of a reply.
+    - drop_rate: never answer a request.
+    - write_multi: answer write multiple (0x10) requests, else reject them
+      like older firmware.
+    - disconnect_at: close the connection instead of answering that request
+      (counted over all connections), once.
+    """
+
+    def __init__(self, input_registers: dict | None = None, hold_registers: dict | None = None,
+                 dongle_serial: bytes = DEFAULT_DONGLE_SERIAL,
+                 inverter_serial: bytes = DEFAULT_INVERTER_SERIAL,
+                 latency: float = 0.0, greeting: bool = False, concatenate: bool = False,
+                 chunk_size: int = 0, truncate_rate: float = 0.0, crc_error_rate: float = 0.0,
+                 drop_rate: float = 0.0, write_multi: bool = True, disconnect_at: int = 0,
+                 seed: int = 0):
+        """Initialize the simulator."""
+        self.input_registers = dict(input_registers or {})
+        self.hold_registers = dict(hold_registers or {})
+        self.dongle_serial = dongle_serial
+        self.inverter_serial = inverter_serial
+        self.latency = latency
+        self.greeting = greeting
+        self.concatenate = concatenate
+        self.chunk_size = chunk_size
+        self.truncate_rate = truncate_rate
+        self.crc_error_rate = crc_error_rate
+        self.drop_rate = drop_rate
+        self.write_multi = write_multi
+        self.disconnect_at = disconnect_at
+        self._random = random.Random(seed)
+        self._server = None
+
+        # Statistics
+        self.connections = 0
+        self.requests = 0
+        self.writes = 0
+
+    @classmethod
+    def from_test_data(cls, **kwargs) -> "DongleSimulator":
+        """Simulator serving the registers of the captured test data responses."""
+        samples = {**INPUT_RESPONSES, **HOLD_RESPONSES}
+        return cls(
+            input_registers=registers_from_responses(samples, READ_INPUT),
+            hold_registers=registers_from_responses(samples, READ_HOLD),
+            **kwargs,
+        )
+
+    # --- Protocol handling ---
+
+    def _exception(self, function_code: int, register: int, code: int) -> bytes:
+        return build_response(self.dongle_serial, self.inverter_serial,
+                              function_code | 0x80, register, bytes([code]), value_length_byte=False)
+
+    def handle_request(self, packet: bytes) -> bytes | None:
+        """Return the reply frame to a request packet, None if it gets no reply."""
+        if (len(packet) < 38 or packet[0:2] != LxpRequestBuilder.PREFIX
+                or packet[7] != LxpRequestBuilder.TRANSLATED_DATA):
+            return None
+        length = int.from_bytes(packet[4:6], 'little') + 6
+        data_frame = packet[20:length - 2]
+        if LxpPacketUtils.compute_crc(data_frame) != int.from_bytes(packet[length - 2:length], 'little'):
+            return None
+        function_code = data_frame[1]
+        if data_frame[2:12] != self.inverter_serial:
+            return None
+        register = int.from_bytes(data_frame[12:14], 'little')
+        argument = int.from_bytes(data_frame[14:16], 'little')
+        self.requests += 1
+
+        if function_code in (READ_HOLD, READ_INPUT):
+            if not 0 < argument <= MAX_BLOCK_SIZE:
+                return self._exception(function_code, register, ILLEGAL_DATA_VALUE)
+            table = self.hold_registers if function_code == READ_HOLD else self.input_registers
+            payload = b"".join(
+                table.get(reg, 0).to_bytes(2, 'little') for reg in range(register, register + argument)
+            )
+            return build_response(self.dongle_serial, self.inverter_serial, function_code, register, payload)
+
+        if function_code == WRITE_SINGLE:
+            self.writes += 1
+            self.hold_registers[register] = argument
+            return build_response(self.dongle_serial, self.inverter_serial, function_code, register,
+                                  argument.to_bytes(2, 'little'), value_length_byte=False)
+
+        if function_code == WRITE_MULTI and self.write_multi:
+            self.writes += 1
+            values = data_frame[17:17 + data_frame[16]]
+            for offset in range(argument):
+                self.hold_registers[register + offset] = int.from_bytes(values[2 * offset:2 * offset + 2], 'little')
+            return build_response(self.dongle_serial, self.inverter_serial, function_code, register,
+                                  argument.to_bytes(2, 'little'), value_length_byte=False)
+
+        return self._exception(function_code, register, ILLEGAL_FUNCTION)
+
+    def _apply_faults(self, reply: bytes) -> bytes | None:
+        """Return the bytes actually sent for a reply."""
+        if self.drop_rate and self._random.random() < self.drop_rate:
+            return None
+        if self.crc_error_rate and self._random.random() < self.crc_error_rate:
+            reply = reply[:-2] + bytes([reply[-2] ^ 0xFF, reply[-1]])
+        if self.truncate_rate and self._random.random() < self.truncate_rate:
+            reply = reply[:len(reply) // 2]
+        if self.concatenate:
+            reply = GREETING_FRAME + reply
+        return reply
+
+    def _chunks(self, data: bytes) -> list[bytes]:
+        if not self.chunk_size:
+            return [data]
+        return [data[i:i + self.chunk_size] for i in range(0, len(data), self.chunk_size)]
+
+    # --- Connections ---
+
+    async def _async_serve(self, requests: asyncio.Queue, write, close) -> None:
+        """Answer the request packets put on the queue, in order, through write, until close."""
+        if self.greeting:
+            for chunk in self._chunks(GREETING_FRAME):
+                write(chunk)
+        while True:
+            packet = await requests.get()
+            if packet is None:
+                return
+            reply = self.handle_request(packet)
+            if self.requests == self.disconnect_at:
+                close()
+                return
+            if reply is None:
+                continue
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            data = self._apply_faults(reply)
+            if data is None:
+                continue
+            for chunk in self._chunks(data):
+                write(chunk)
+
+    @staticmethod
+    def _split_requests(buffer: bytearray) -> list[bytes]:
+        """Cut complete request packets from the start of buffer."""
+        packets = []
+        while len(buffer) >= 6:
+            start = buffer.find(LxpRequestBuilder.PREFIX)
+            if start == -1:
+                buffer.clear()
+                break
+            del buffer[:start]
+            length = int.from_bytes(buffer[4:6], 'little') + 6
+            if len(buffer) < length:
+                break
+            packets.append(bytes(buffer[:length]))
+            del buffer[:length]
+        return packets
+
+    async def _async_handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        requests = asyncio.Queue()
+        server = asyncio.ensure_future(self._async_serve(requests, writer.write, writer.close))
+        buffer = bytearray()
+        try:
+            while data := await reader.read(1024):
+                buffer += data
+                for packet in self._split_requests(buffer):
+                    requests.put_nowait(packet)
+        except ConnectionError:
+            pass
+        finally:
+            requests.put_nowait(None)
+            await server
+            writer.close()
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> tuple[str, int]:
+        """Start serving over TCP and return the address listened on."""
+        self._server = await asyncio.start_server(self._async_handle_client, host, port)
+        return self._server.sockets[0].getsockname()[:2]
+
+    async def async_stop(self) -> None:
+        """Stop the TCP server."""
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    def transport(self) -> "SimulatorTransport":
+        """Return an LxpTransport connecting to this simulator in-process."""
+        return SimulatorTransport(self)
+
+
+class _InProcessConnection(asyncio.Transport):
+    """asyncio transport carrying bytes between an LxpFrameProtocol and the simulator."""
+
+    def __init__(self, simulator: DongleSimulator, protocol: LxpFrameProtocol):
+        super().__init__()
+        self._simulator = simulator
+        self._protocol = protocol
+        self._closing = False
+        self._buffer = bytearray()
+        self._requests = asyncio.Queue()
+        self._server = asyncio.ensure_future(simulator._async_serve(self._requests, self._deliver, self.close))
+
+    def _deliver(self, data: bytes) -> None:
+        if not self._closing:
+            self._protocol.data_received(data)
+
+    def write(self, data: bytes) -> None:
+        self._buffer += data
+        for packet in self._simulator._split_requests(self._buffer):
+            self._requests.put_nowait(packet)
+
+    def is_closing(self) -> bool:
+        return self._closing
+
+    def close(self) -> None:
+        if self._closing:
+            return
+        self._closing = True
+        self._requests.put_nowait(None)
+        asyncio.get_running_loop().call_soon(self._protocol.connection_lost, None)
+
+    def abort(self) -> None:
+        self.close()
+
+
+class SimulatorTransport(LxpTransport):
+    """Opens in-process connections to a DongleSimulator, without sockets."""
+
+    def __init__(self, simulator: DongleSimulator):
+        self._simulator = simulator
+
+    async def async_open(self) -> LxpFrameProtocol:
+        protocol = LxpFrameProtocol()
+        self._simulator.connections += 1
+        protocol.connection_made(_InProcessConnection(self._simulator, protocol))
+        return protocol
+
+    @property
+    def description(self) -> str:
+        return "in-process dongle simulator"
+
+
+async def _main() -> None:
+    parser = argparse.ArgumentParser(description="Serve the test data as a simulated LuxPower dongle.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--greeting", action="store_true")
+    parser.add_argument("--concatenate", action="store_true")
+    parser.add_argument("--chunk-size", type=int, default=0)
+    parser.add_argument("--truncate-rate", type=float, default=0.0)
+    parser.add_argument("--crc-error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    simulator = DongleSimulator.from_test_data(
+        latency=args.latency, greeting=args.greeting, concatenate=args.concatenate,
+        chunk_size=args.chunk_size, truncate_rate=args.truncate_rate,
+        crc_error_rate=args.crc_error_rate, drop_rate=args.drop_rate,
+    )
+    host, port = await simulator.async_start(args.host, args.port)
+    print(f"Simulated dongle {simulator.dongle_serial.decode()} / inverter "
+          f"{simulator.inverter_serial.decode()} listening on {host}:{port}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await simulator.async_stop()
+
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(_main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,77 @@
+"""Tests for the benchmark harness, so it keeps running as the code changes."""
+
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.lxp_batteries import LxpBatteries
+from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
+
+from benchmark import (
+    BATTERY_COUNT, BATTERY_FRAME, HOLD_FRAME, INPUT_FRAME, benchmarks, compare, run_benchmarks,
+)
+
+
+class TestBenchmark:
+    """Test cases for the benchmark harness."""
+
+    @pytest.mark.parametrize("frame", [INPUT_FRAME, HOLD_FRAME, BATTERY_FRAME])
+    def test_frames_are_valid(self, frame):
+        """The benchmarked frames parse into 125 registers."""
+        response = LxpResponse(frame)
+
+        assert not response.packet_error
+        assert len(response.parsed_values_dictionary) == 125
+
+    def test_battery_frame_decodes(self):
+        """Every battery of the battery frame is found by its serial."""
+        batteries = LxpBatteries(LxpResponse(BATTERY_FRAME)).get_battery_info()
+
+        assert sorted(batteries) == [f"BAT{block:011d}" for block in range(BATTERY_COUNT)]
+
+    def test_every_benchmark_runs(self):
+        """Each benchmark, including the poll against the simulator, produces a result."""
+        results = run_benchmarks(min_time=0.001, repeat=1)
+
+        assert set(results) == set(benchmarks())
+        assert all(result["ops_per_sec"] > 0 for result in results.values())
+
+    def test_only_filter_keeps_calibration(self):
+        """Filtering benchmarks still measures the calibration loop."""
+        assert set(run_benchmarks(["crc"], min_time=0.001, repeat=1)) == {"calibration", "crc_125_registers"}
+
+    def test_compare_scales_by_calibration(self):
+        """A machine twice as slow is not a regression, a slower benchmark is."""
+        baseline = {
+            "calibration": {"ops_per_sec": 1000, "peak_bytes": 0},
+            "crc": {"ops_per_sec": 100, "peak_bytes": 100},
+            "parse": {"ops_per_sec": 100, "peak_bytes": 100},
+        }
+        results = {
+            "calibration": {"ops_per_sec": 500, "peak_bytes": 0},
+            "crc": {"ops_per_sec": 50, "peak_bytes": 100},
+            "parse": {"ops_per_sec": 20, "peak_bytes": 100},
+            "new": {"ops_per_sec": 1, "peak_bytes": 1},
+        }
+
+        regressions = compare(results, baseline, tolerance=0.25)
+
+        assert regressions == ["parse: 40% of baseline speed"]
+
+    def test_compare_flags_allocation_growth(self):
+        """Allocations above the tolerance and the noise slack are regressions."""
+        baseline = {"calibration": {"ops_per_sec": 1000, "peak_bytes": 0},
+                    "poll": {"ops_per_sec": 10, "peak_bytes": 100000}}
+
+        within = {"calibration": baseline["calibration"], "poll": {"ops_per_sec": 10, "peak_bytes": 120000}}
+        above = {"calibration": baseline["calibration"], "poll": {"ops_per_sec": 10, "peak_bytes": 200000}}
+
+        assert compare(within, baseline, tolerance=0.25) == []
+        assert len(compare(above, baseline, tolerance=0.25)) == 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
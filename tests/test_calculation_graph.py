@@ -0,0 +1,123 @@
+"""Tests for the incremental evaluation of calculated sensors."""
+
+import pytest
+from unittest.mock import MagicMock
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.calculation_graph import (
+    CalculationGraph,
+    Intermediate,
+    combined_u32,
+    register_sum,
+)
+from custom_components.lxp_modbus.classes.register_store import RegisterStore
+from custom_components.lxp_modbus.const import CONF_RATED_POWER, TOTAL_REGISTERS
+from custom_components.lxp_modbus.entity_descriptions.sensor_types import SENSOR_TYPES
+
+
+def _counting(compute):
+    calls = []
+
+    def counted(*args):
+        calls.append(args)
+        return compute(*args)
+
+    return counted, calls
+
+
+class TestCalculationGraph:
+    """Test cases for CalculationGraph and its intermediates."""
+
+    @pytest.mark.parametrize("seed", [1, 7, 300])
+    def test_matches_direct_extract(self, seed):
+        """Every calculated sensor gives the same value through the graph as called directly."""
+        registers = RegisterStore()
+        registers.set_block(0, [(reg * seed) & 0xFFFF for reg in range(TOTAL_REGISTERS)])
+        entry = MagicMock()
+        entry.data = {CONF_RATED_POWER: 5000}
+        graph = CalculationGraph()
+
+        for desc in SENSOR_TYPES:
+            if desc.get("register_type") == "calculated":
+                assert graph.evaluate(desc, registers, entry) == desc["extract"](registers, entry), desc["name"]
+
+    def test_result_reused_until_input_changes(self):
+        """A description is only re-evaluated when a register in depends_on changed."""
+        extract, calls = _counting(lambda registers, entry: registers.get(1, 0) + registers.get(2, 0))
+        desc = {"register_type": "calculated", "depends_on": [1, 2], "extract": extract}
+        registers = {1: 10, 2: 5}
+        graph = CalculationGraph()
+
+        assert graph.evaluate(desc, registers, None) == 15
+        graph.invalidate({3})
+        assert graph.evaluate(desc, registers, None) == 15
+        assert len(calls) == 1
+
+        registers[2] = 6
+        graph.invalidate({2})
+        assert graph.evaluate(desc, registers, None) == 16
+        assert len(calls) == 2
+
+    def test_intermediate_shared_between_descriptions(self):
+        """An intermediate is computed once for every description using it."""
+        compute, calls = _counting(lambda registers: registers.get(1, 0) * 2)
+        double = Intermediate("double", [1], compute)
+        first = {"depends_on": [1], "extract": lambda registers, entry: double(registers) + 1}
+        second = {"depends_on": [1], "extract": lambda registers, entry: double(registers) + 2}
+        registers = {1: 4}
+        graph = CalculationGraph()
+
+        assert graph.evaluate(first, registers, None) == 9
+        assert graph.evaluate(second, registers, None) == 10
+        assert len(calls) == 1
+
+        registers[1] = 5
+        graph.invalidate({1})
+        assert graph.evaluate(second, registers, None) == 12
+        assert len(calls) == 2
+
+    def test_intermediate_inputs_invalidate_description(self):
+        """A description depends on the inputs of the intermediates it uses, even if undeclared."""
+        total = register_sum("total", [1, 2])
+        desc = {"depends_on": [], "extract": lambda registers, entry: total(registers)}
+        registers = {1: 1, 2: 2}
+        graph = CalculationGraph()
+
+        assert graph.evaluate(desc, registers, None) == 3
+        registers[2] = 10
+        graph.invalidate({2})
+        assert graph.evaluate(desc, registers, None) == 11
+
+    def test_new_registers_object_drops_results(self):
+        """Results computed from another registers mapping are not reused."""
+        desc = {"depends_on": [1], "extract": lambda registers, entry: registers.get(1)}
+        graph = CalculationGraph()
+
+        assert graph.evaluate(desc, {1: 1}, None) == 1
+        assert graph.evaluate(desc, {1: 2}, None) == 2
+
+        graph.invalidate(None)
+        assert len(graph) == 0
+
+    def test_intermediates_outside_a_graph(self):
+        """Called with a plain mapping an intermediate computes its value directly."""
+        assert combined_u32(10, 11)({10: 0x5678, 11: 0x1234}) == 0x12345678
+        assert combined_u32(10, 11) is combined_u32(10, 11)
+        assert register_sum("sum", [1, 2, 3])({1: 1, 3: 3}) == 4
+
+    def test_counters_read_from_combined_view(self):
+        """Declared pairs in a RegisterStore are read from its combined view, others from the halves."""
+        registers = RegisterStore()
+        registers.update({40: 0x5678, 41: 0x1234, 300: 1, 301: 2})
+
+        assert combined_u32(40, 41)(registers) == 0x12345678
+        assert combined_u32(300, 301)(registers) == 0x20001
+        assert combined_u32(42, 43)(registers) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -11,11 +11,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from custom_components.lxp_modbus.classes.connection_manager import (
     ModbusConnectionManager,
-    CONNECTION_TIMEOUT,
     CLOSE_TIMEOUT,
-    INITIAL_DATA_READ_SIZE,
-    INITIAL_DATA_TIMEOUT,
 )
+from custom_components.lxp_modbus.classes.frame_protocol import LxpFrameProtocol
+from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
+from test_data import FUNCTION_193_MESSAGE
 
 
 class TestModbusConnectionManager:
@@ -41,17 +41,26 @@ class TestModbusConnectionManager:
         )
 
     @pytest.fixture
-    def mock_reader(self):
-        """Mock asyncio StreamReader."""
-        return AsyncMock(spec=asyncio.StreamReader)
-
-    @pytest.fixture
-    def mock_writer(self):
-        """Mock asyncio StreamWriter."""
-        writer = AsyncMock(spec=asyncio.StreamWriter)
-        writer.close = MagicMock()
-        writer.wait_closed = AsyncMock()
-        return writer
+    def mock_session(self):
+        """Mock LxpFrameProtocol session."""
+        session = MagicMock(spec=LxpFrameProtocol)
+        session.wait_closed = AsyncMock()
+        session.pop_unsolicited.return_value = []
+        return session
+
+    @staticmethod
+    def _patch_connect(**kwargs):
+        """Patch the event loop's create_connection."""
+        return patch.object(asyncio.get_running_loop(), "create_connection", AsyncMock(**kwargs))
+
+    @staticmethod
+    def _live_session():
+        """Return a (transport, session) pair that reports an open connection."""
+        session = MagicMock(spec=LxpFrameProtocol)
+        session.is_alive = True
+        session.wait_closed = AsyncMock()
+        session.pop_unsolicited.return_value = []
+        return MagicMock(), session
 
     # --- Initialization tests ---
 
@@ -100,112 +109,183 @@ class TestModbusConnectionManager:
 
     @pytest.mark.asyncio
     async def test_async_connect_success(self, manager):
-        """Test successful TCP connection."""
-        mock_reader = AsyncMock(spec=asyncio.StreamReader)
-        mock_writer = AsyncMock(spec=asyncio.StreamWriter)
+        """Test successful TCP connection returns a framing session."""
+        transport, session = self._live_session()
 
-        with patch('asyncio.open_connection', return_value=(mock_reader, mock_writer)) as mock_open:
-            reader, writer = await manager.async_connect()
+        with self._patch_connect(return_value=(transport, session)) as mock_connect:
+            result = await manager.async_connect()
 
-            mock_open.assert_called_once_with("192.168.1.100", 8000)
-            assert reader is mock_reader
-            assert writer is mock_writer
+            mock_connect.assert_called_once_with(LxpFrameProtocol, "192.168.1.100", 8000)
+            assert result is session
 
     @pytest.mark.asyncio
     async def test_async_connect_timeout(self, manager):
         """Test connection attempt that times out."""
-        with patch('asyncio.open_connection', side_effect=asyncio.TimeoutError()):
+        with self._patch_connect(side_effect=asyncio.TimeoutError()):
             with pytest.raises(asyncio.TimeoutError):
                 await manager.async_connect()
 
     # --- async_close tests ---
 
     @pytest.mark.asyncio
-    async def test_async_close_success(self, manager, mock_writer):
+    async def test_async_close_success(self, manager, mock_session):
         """Test successful connection close."""
-        await manager.async_close(mock_writer)
+        await manager.async_close(mock_session)
 
-        mock_writer.close.assert_called_once()
-        mock_writer.wait_closed.assert_called_once()
+        mock_session.close.assert_called_once()
+        mock_session.wait_closed.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_async_close_with_none_writer(self, manager):
-        """Test close with None writer returns immediately without error."""
+    async def test_async_close_with_none_session(self, manager):
+        """Test close with None session returns immediately without error."""
         await manager.async_close(None)
         # Should not raise any exception
 
     @pytest.mark.asyncio
-    async def test_async_close_timeout(self, manager, mock_writer):
+    async def test_async_close_timeout(self, manager, mock_session):
         """Test close that times out is handled gracefully."""
-        mock_writer.wait_closed.side_effect = asyncio.TimeoutError()
+        mock_session.wait_closed.side_effect = asyncio.TimeoutError()
 
         # Should not raise; the TimeoutError is caught and logged
-        await manager.async_close(mock_writer)
+        await manager.async_close(mock_session)
 
-        mock_writer.close.assert_called_once()
-        mock_writer.wait_closed.assert_called_once()
+        mock_session.close.assert_called_once()
+        mock_session.wait_closed.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_async_close_connection_error(self, manager, mock_writer):
+    async def test_async_close_connection_error(self, manager, mock_session):
         """Test close that raises ConnectionError is handled gracefully."""
-        mock_writer.wait_closed.side_effect = ConnectionError("Connection reset")
+        mock_session.wait_closed.side_effect = ConnectionError("Connection reset")
 
         # Should not raise; the ConnectionError is caught and logged
-        await manager.async_close(mock_writer)
+        await manager.async_close(mock_session)
 
-        mock_writer.close.assert_called_once()
-        mock_writer.wait_closed.assert_called_once()
+        mock_session.close.assert_called_once()
+        mock_session.wait_closed.assert_called_once()
 
     # --- async_discard_initial_data tests ---
 
     @pytest.mark.asyncio
-    async def test_async_discard_initial_data_skip_enabled(self, manager, mock_reader):
-        """Test discard initial data when skip is enabled reads data."""
-        mock_reader.read.return_value = b"some_initial_data"
+    async def test_async_discard_initial_data_skip_enabled(self, manager, mock_session):
+        """Test discard initial data drops the frames filed as unsolicited."""
+        mock_session.pop_unsolicited.return_value = [LxpResponse(bytes.fromhex(FUNCTION_193_MESSAGE))]
 
-        with patch(
-            'custom_components.lxp_modbus.classes.connection_manager.LxpResponse'
-        ) as mock_response_class:
-            mock_response = MagicMock()
-            mock_response.info = "test_info"
-            mock_response_class.return_value = mock_response
+        await manager.async_discard_initial_data(mock_session)
 
-            await manager.async_discard_initial_data(mock_reader)
-
-            mock_reader.read.assert_called_once_with(INITIAL_DATA_READ_SIZE)
-            mock_response_class.assert_called_once_with(b"some_initial_data")
+        mock_session.pop_unsolicited.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_async_discard_initial_data_skip_disabled(self, manager_no_skip, mock_reader):
+    async def test_async_discard_initial_data_skip_disabled(self, manager_no_skip, mock_session):
         """Test discard initial data when skip is disabled is a no-op."""
-        await manager_no_skip.async_discard_initial_data(mock_reader)
+        await manager_no_skip.async_discard_initial_data(mock_session)
 
-        mock_reader.read.assert_not_called()
+        mock_session.pop_unsolicited.assert_not_called()
 
     @pytest.mark.asyncio
-    async def test_async_discard_initial_data_timeout(self, manager, mock_reader):
-        """Test discard initial data when timeout occurs is suppressed."""
-        mock_reader.read.side_effect = asyncio.TimeoutError()
+    async def test_async_discard_initial_data_does_not_wait(self, manager, mock_session):
+        """Test discard initial data returns immediately when the dongle sent nothing."""
+        await asyncio.wait_for(manager.async_discard_initial_data(mock_session), timeout=0.1)
+
+        mock_session.pop_unsolicited.assert_called_once()
 
-        # Should not raise; TimeoutError is suppressed
-        await manager.async_discard_initial_data(mock_reader)
+    # --- persistent session tests ---
 
-        mock_reader.read.assert_called_once_with(INITIAL_DATA_READ_SIZE)
+    @pytest.fixture
+    def persistent_manager(self):
+        """Create a connection manager in persistent session mode."""
+        return ModbusConnectionManager(
+            host="192.168.1.100",
+            port=8000,
+            connection_retries=3,
+            skip_initial_data=False,
+            persistent=True,
+        )
+
+    @pytest.mark.asyncio
+    async def test_acquire_non_persistent_opens_every_time(self, manager_no_skip):
+        """Without persistent mode every acquire opens a new connection and release closes it."""
+        first = self._live_session()
+        second = self._live_session()
+
+        with self._patch_connect(side_effect=[first, second]) as mock_connect:
+            session1 = await manager_no_skip.async_acquire()
+            await manager_no_skip.async_release(session1)
+            session2 = await manager_no_skip.async_acquire()
+
+        assert mock_connect.call_count == 2
+        assert session1 is not session2
+        session1.close.assert_called_once()
+        assert manager_no_skip.get_stats()["connections_opened"] == 2
+        assert manager_no_skip.get_stats()["sessions_reused"] == 0
 
     @pytest.mark.asyncio
-    async def test_async_discard_initial_data_empty_response(self, manager, mock_reader):
-        """Test discard initial data when dongle sends empty bytes."""
-        mock_reader.read.return_value = b""
+    async def test_acquire_persistent_reuses_live_session(self, persistent_manager):
+        """A live persistent session is handed out again instead of reconnecting."""
+        with self._patch_connect(return_value=self._live_session()) as mock_connect:
+            session1 = await persistent_manager.async_acquire()
+            await persistent_manager.async_release(session1)
+            session2 = await persistent_manager.async_acquire()
+
+        mock_connect.assert_called_once()
+        assert session1 is session2
+        session1.close.assert_not_called()
+        stats = persistent_manager.get_stats()
+        assert stats["persistent"] is True
+        assert stats["connections_opened"] == 1
+        assert stats["sessions_reused"] == 1
+        assert stats["reconnects"] == 0
+
+    @pytest.mark.asyncio
+    async def test_acquire_persistent_reconnects_dead_session(self, persistent_manager):
+        """A persistent session closed by the dongle is replaced transparently."""
+        first = self._live_session()
+        second = self._live_session()
+
+        with self._patch_connect(side_effect=[first, second]):
+            session1 = await persistent_manager.async_acquire()
+            await persistent_manager.async_release(session1)
+            session1.is_alive = False
+            session2 = await persistent_manager.async_acquire()
+
+        assert session2 is second[1]
+        session1.close.assert_called_once()
+        assert persistent_manager.get_stats()["reconnects"] == 1
+
+    @pytest.mark.asyncio
+    async def test_release_failed_drops_persistent_session(self, persistent_manager):
+        """Releasing a persistent session as failed closes it so the next acquire reconnects."""
+        first = self._live_session()
+        second = self._live_session()
+
+        with self._patch_connect(side_effect=[first, second]) as mock_connect:
+            session1 = await persistent_manager.async_acquire()
+            await persistent_manager.async_release(session1, failed=True)
+            session2 = await persistent_manager.async_acquire()
+
+        assert mock_connect.call_count == 2
+        session1.close.assert_called_once()
+        assert session2 is second[1]
+
+    @pytest.mark.asyncio
+    async def test_disconnect_closes_persistent_session(self, persistent_manager):
+        """async_disconnect closes the open persistent session."""
+        with self._patch_connect(return_value=self._live_session()):
+            session = await persistent_manager.async_acquire()
+
+        await persistent_manager.async_disconnect()
+
+        session.close.assert_called_once()
+        assert persistent_manager._session is None
 
-        with patch(
-            'custom_components.lxp_modbus.classes.connection_manager.LxpResponse'
-        ) as mock_response_class:
-            await manager.async_discard_initial_data(mock_reader)
+    def test_is_alive(self):
+        """is_alive reflects the session state."""
+        _, session = self._live_session()
+        assert ModbusConnectionManager.is_alive(session) is True
 
-            mock_reader.read.assert_called_once_with(INITIAL_DATA_READ_SIZE)
-            # LxpResponse should NOT be constructed when ignored data is empty/falsy
-            mock_response_class.assert_not_called()
+        session.is_alive = False
+        assert ModbusConnectionManager.is_alive(session) is False
 
+        assert ModbusConnectionManager.is_alive(None) is False
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -11,6 +11,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
+from custom_components.lxp_modbus.const import TIER_LIVE, TIER_ENERGY, TIER_HOLD
 from custom_components.lxp_modbus.coordinator import (
     LxpModbusDataUpdateCoordinator,
     RECOVERY_MODE_THRESHOLD,
@@ -40,6 +41,9 @@ class TestLxpModbusDataUpdateCoordinator:
         """Create a mock API client with async_get_data."""
         client = AsyncMock()
         client.async_get_data = AsyncMock(return_value={"input": {0: 100}, "hold": {0: 200}})
+        client.set_read_plan = MagicMock()
+        client.request_hold_refresh = MagicMock()
+        client.pop_changes = MagicMock(return_value={"input": {0}, "hold": set(), "battery": set()})
         return client
 
     @pytest.fixture
@@ -60,6 +64,8 @@ class TestLxpModbusDataUpdateCoordinator:
             coord.hass = mock_hass
             coord.update_interval = timedelta(seconds=30)
             coord.async_refresh = MagicMock()
+            coord.last_update_success = True
+            coord._listeners = {}
             return coord
 
     # ---------------------------------------------------------------
@@ -233,6 +239,236 @@ class TestLxpModbusDataUpdateCoordinator:
             assert coordinator._failed_updates == RECOVERY_MODE_THRESHOLD
             assert coordinator._is_recovering is True
 
+    # ---------------------------------------------------------------
+    # 11. Read plan follows the descriptions of added entities
+    # ---------------------------------------------------------------
+    @pytest.mark.asyncio
+    async def test_read_plan_follows_added_descriptions(self, coordinator, mock_api_client):
+        """The read plan is recompiled before a poll only when entities were added or removed."""
+        desc_a = {"register_type": "input", "register": 20}
+        desc_b = {"register_type": "hold", "register": 64}
+
+        # No entities yet: the client keeps sweeping every register
+        await coordinator._async_update_data()
+        mock_api_client.set_read_plan.assert_not_called()
+
+        remove_a = coordinator.async_add_description(desc_a)
+        coordinator.async_add_description(desc_b)
+        await coordinator._async_update_data()
+        mock_api_client.set_read_plan.assert_called_once_with([desc_a, desc_b])
+
+        # Unchanged set of entities, nothing to recompile
+        await coordinator._async_update_data()
+        assert mock_api_client.set_read_plan.call_count == 1
+
+        remove_a()
+        await coordinator._async_update_data()
+        mock_api_client.set_read_plan.assert_called_with([desc_b])
+
+    def test_shared_description_tracked_until_last_removal(self, coordinator, mock_api_client):
+        """A description shared by several entities stays tracked until all are removed."""
+        desc = {"register_type": "hold", "register": 64}
+        remove_first = coordinator.async_add_description(desc)
+        remove_second = coordinator.async_add_description(desc)
+
+        remove_first()
+        coordinator._update_read_plan()
+        mock_api_client.set_read_plan.assert_called_with([desc])
+
+        remove_second()
+        coordinator._update_read_plan()
+        mock_api_client.set_read_plan.assert_called_with(None)
+
+    # ---------------------------------------------------------------
+    # 12. Polling tiers run at their own interval
+    # ---------------------------------------------------------------
+    @pytest.mark.asyncio
+    async def test_tiers_polled_at_their_interval(self, coordinator, mock_api_client):
+        """Live values are read every update, energy and hold only when due."""
+        clock = [1000.0]
+        coordinator._tier_intervals = {TIER_LIVE: 30, TIER_ENERGY: 60, TIER_HOLD: 600}
+
+        with patch("custom_components.lxp_modbus.coordinator.time_lib.monotonic", side_effect=lambda: clock[0]):
+            await coordinator._async_update_data()
+            assert mock_api_client.async_get_data.call_args.args[0] == {TIER_LIVE, TIER_ENERGY, TIER_HOLD}
+
+            clock[0] += 30
+            await coordinator._async_update_data()
+            assert mock_api_client.async_get_data.call_args.args[0] == {TIER_LIVE}
+
+            # Energy is due again after its interval, a few seconds of jitter don't delay it a poll
+            clock[0] += 28
+            await coordinator._async_update_data()
+            assert mock_api_client.async_get_data.call_args.args[0] == {TIER_LIVE, TIER_ENERGY}
+
+            clock[0] += 600
+            await coordinator._async_update_data()
+            assert mock_api_client.async_get_data.call_args.args[0] == {TIER_LIVE, TIER_ENERGY, TIER_HOLD}
+
+    @pytest.mark.asyncio
+    async def test_failed_update_keeps_tiers_due(self, coordinator, mock_api_client):
+        """A tier whose poll failed is read again on the next update."""
+        mock_api_client.async_get_data.side_effect = UpdateFailed("connection lost")
+
+        with pytest.raises(UpdateFailed):
+            await coordinator._async_update_data()
+
+        assert coordinator._tier_last_polled == {}
+
+    @pytest.mark.asyncio
+    async def test_refresh_hold_registers(self, coordinator, mock_api_client):
+        """An explicit settings refresh bypasses the hold cache and polls right away."""
+        coordinator._tier_last_polled = {TIER_LIVE: 1.0, TIER_HOLD: 1.0}
+        coordinator.async_request_refresh = AsyncMock()
+
+        await coordinator.async_refresh_hold_registers()
+
+        mock_api_client.request_hold_refresh.assert_called_once()
+        assert TIER_HOLD not in coordinator._tier_last_polled
+        coordinator.async_request_refresh.assert_awaited_once()
+
+    # ---------------------------------------------------------------
+    # 13. Only entities whose registers changed are notified
+    # ---------------------------------------------------------------
+    def _listen(self, coordinator, context):
+        listener = MagicMock()
+        coordinator._listeners[object()] = (listener, context)
+        coordinator._change_index = None
+        return listener
+
+    @pytest.mark.asyncio
+    async def test_only_changed_listeners_notified(self, coordinator, mock_api_client):
+        """Listeners are notified when a key in their context changed, or without a context."""
+        changed = self._listen(coordinator, frozenset({("input", 0)}))
+        calculated = self._listen(coordinator, frozenset({("input", 5), ("input", 0)}))
+        unchanged = self._listen(coordinator, frozenset({("hold", 0)}))
+        battery = self._listen(coordinator, frozenset({("battery", "BAT1")}))
+        no_context = self._listen(coordinator, None)
+        mock_api_client.pop_changes.return_value = {"input": {0}, "hold": set(), "battery": {"BAT1"}}
+
+        await coordinator._async_update_data()
+        coordinator.async_update_listeners()
+
+        changed.assert_called_once()
+        calculated.assert_called_once()
+        battery.assert_called_once()
+        no_context.assert_called_once()
+        unchanged.assert_not_called()
+
+        # Anything else notifying the listeners (errors, manual updates) reaches all of them
+        coordinator.async_update_listeners()
+        unchanged.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_all_listeners_notified_after_failure(self, coordinator, mock_api_client):
+        """The first successful update after a failure notifies every listener."""
+        unchanged = self._listen(coordinator, frozenset({("hold", 0)}))
+        coordinator.last_update_success = False
+
+        await coordinator._async_update_data()
+        coordinator.async_update_listeners()
+
+        unchanged.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_read_back_notifies_only_dependent_listeners(self, coordinator, mock_api_client):
+        """A read-back reads the given registers and notifies the listeners of those that changed."""
+        written = self._listen(coordinator, frozenset({("hold", 11)}))
+        other = self._listen(coordinator, frozenset({("hold", 0)}))
+        mock_api_client.async_read_back = AsyncMock(return_value={11: 0})
+        mock_api_client.pop_changes.return_value = {"input": set(), "hold": {11}, "battery": set()}
+
+        await coordinator.async_read_back("hold", [11])
+
+        mock_api_client.async_read_back.assert_awaited_once_with("hold", [11])
+        mock_api_client.async_get_data.assert_not_called()
+        written.assert_called_once()
+        other.assert_not_called()
+
+    def test_notify_changes_keeps_pending_update_changes(self, coordinator, mock_api_client):
+        """Notifying a write's changes does not touch the changes of an update still to be notified."""
+        written = self._listen(coordinator, frozenset({("hold", 66)}))
+        coordinator._changes = {("input", 0)}
+        mock_api_client.pop_changes.return_value = {"input": set(), "hold": {66}, "battery": set()}
+
+        coordinator.async_notify_changes()
+
+        written.assert_called_once()
+        assert coordinator._changes == {("input", 0)}
+
+    @pytest.mark.asyncio
+    async def test_update_invalidates_changed_calculations(self, coordinator, mock_api_client):
+        """Calculated results depending on a changed input register are dropped."""
+        desc = {"depends_on": [0, 1], "extract": lambda registers, entry: registers.get(0, 0)}
+        registers = {0: 100}
+        assert coordinator.calculations.evaluate(desc, registers, None) == 100
+        registers[0] = 5
+
+        mock_api_client.pop_changes.return_value = {"input": {2}, "hold": {0}, "battery": set()}
+        await coordinator._async_update_data()
+        assert coordinator.calculations.evaluate(desc, registers, None) == 100
+
+        mock_api_client.pop_changes.return_value = {"input": {0}, "hold": set(), "battery": set()}
+        await coordinator._async_update_data()
+        assert coordinator.calculations.evaluate(desc, registers, None) == 5
+
+    # ---------------------------------------------------------------
+    # Device info and facts shared by the entities
+    # ---------------------------------------------------------------
+    @staticmethod
+    def _with_entry(coordinator, **data):
+        entry = MagicMock()
+        entry.entry_id = "entry1"
+        entry.title = "Inverter"
+        entry.data = {"inverter_serial": "4434280298", "model": "LXP", **data}
+        coordinator._entry = entry
+        coordinator.data = None
+        return entry
+
+    def test_device_info_cached_per_group(self, coordinator):
+        """Entities share one device info dict per device group."""
+        self._with_entry(coordinator, enable_device_grouping=True)
+
+        main = coordinator.device_info()
+        assert coordinator.device_info(None) is main
+        assert main["identifiers"] == {("lxp_modbus", "entry1")}
+        assert main["serial_number"] == "4434280298"
+
+        battery = coordinator.device_info("Battery")
+        assert coordinator.device_info("Battery") is battery
+        assert battery["identifiers"] == {("lxp_modbus", "entry1_Battery")}
+        assert battery["via_device"] == ("lxp_modbus", "entry1")
+
+    def test_device_info_without_grouping(self, coordinator):
+        """With grouping disabled every entity belongs to the main device."""
+        self._with_entry(coordinator, enable_device_grouping=False)
+        assert coordinator.device_info("Battery") is coordinator.device_info()
+
+    @pytest.mark.asyncio
+    async def test_firmware_change_updates_device_registry(self, coordinator, mock_api_client):
+        """The device registry is only updated when the firmware version changes."""
+        self._with_entry(coordinator)
+        firmware = {7: 0x4146, 8: 0x4241, 9: 0x0102, 10: 0x0003}
+        mock_api_client.async_get_data.return_value = {"input": {}, "hold": dict(firmware)}
+        registry = MagicMock()
+        registry.async_get_device.return_value.sw_version = "FAAB-020103"
+
+        with patch("custom_components.lxp_modbus.coordinator.dr.async_get", return_value=registry):
+            await coordinator._async_update_data()
+            assert coordinator.device_facts.firmware_version == "FAAB-020103"
+            assert coordinator.device_info()["sw_version"] == "FAAB-020103"
+
+            await coordinator._async_update_data()
+            registry.async_update_device.assert_not_called()
+
+            mock_api_client.async_get_data.return_value = {"input": {}, "hold": {**firmware, 10: 0x0004}}
+            await coordinator._async_update_data()
+
+        registry.async_update_device.assert_called_once_with(
+            registry.async_get_device.return_value.id, sw_version="FAAB-020104"
+        )
+        assert coordinator.device_info()["sw_version"] == "FAAB-020104"
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
@@ -7,10 +7,20 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from custom_components.lxp_modbus.classes.data_validator import (
-    is_data_sane,
+    BlockValidator,
+    DependentMinimum,
+    FieldLimit,
     HOLD_TIME_REGISTERS,
     INPUT_TIME_REGISTERS,
+    invalid_registers,
+    is_data_sane,
+    value_limit,
 )
+from custom_components.lxp_modbus.constants import hold_registers
+from custom_components.lxp_modbus.constants.input_registers import (
+    I_FAC, I_FEPS, I_SOC_SOH, I_VAC_R, I_VBAT, I_VEPS_R, I_VPV1,
+)
+from custom_components.lxp_modbus.entity_descriptions.time_types import TIME_TYPES
 from custom_components.lxp_modbus.constants.hold_registers import (
     H_AC_CHARGE_START_TIME,
     H_AC_CHARGE_END_TIME,
@@ -38,7 +48,7 @@ class TestHoldTimeRegisters:
     """Test cases for the HOLD_TIME_REGISTERS set."""
 
     def test_hold_time_registers_contains_expected_registers(self):
-        """HOLD_TIME_REGISTERS contains all 14 expected time register addresses."""
+        """HOLD_TIME_REGISTERS holds the 30 schedule times and the 112 weekly schedule times, nothing else."""
         expected = {
             H_AC_CHARGE_START_TIME,
             H_AC_CHARGE_END_TIME,
@@ -55,8 +65,33 @@ class TestHoldTimeRegisters:
             H_PEAK_SHAVING_START_TIME_1,
             H_PEAK_SHAVING_END_TIME_1,
         }
+        expected |= {
+            getattr(hold_registers, f"H_{name}")
+            for name in (
+                "AC_FIRST_START_TIME_2", "AC_FIRST_END_TIME_2",
+                "CHARGE_FIRST_START_TIME_2", "CHARGE_FIRST_END_TIME", "CHARGE_FIRST_END_TIME_1",
+                "CHARGE_FIRST_END_TIME_2",
+                "FORCED_DISCHARGE_START_TIME", "FORCED_DISCHARGE_END_TIME",
+                "FORCED_DISCHARGE_START_TIME_1", "FORCED_DISCHARGE_END_TIME_1",
+                "FORCED_DISCHARGE_START_TIME_2", "FORCED_DISCHARGE_END_TIME_2",
+                "GEN_START_TIME", "GEN_END_TIME", "GEN_START_TIME_1", "GEN_END_TIME_1",
+            )
+        }
+        expected |= {
+            getattr(hold_registers, f"H_{schedule}_TIME{slot}_{edge}_{day}")
+            for schedule in ("AC_CHG", "FORCED_CHG", "FORCED_DISCHG", "PEAK_SHAV")
+            for slot in (1, 2)
+            for edge in ("START", "END")
+            for day in ("MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN")
+        }
         assert HOLD_TIME_REGISTERS == expected
-        assert len(HOLD_TIME_REGISTERS) == 14
+        assert len(HOLD_TIME_REGISTERS) == 142
+
+    def test_hold_time_registers_match_time_descriptions(self):
+        """The time registers derived from the constants are those of the time entities."""
+        assert HOLD_TIME_REGISTERS == {desc["register"] for desc in TIME_TYPES}
+        for desc in TIME_TYPES:
+            assert desc["extract"](_encode_time(23, 59)) == (23, 59)
 
     def test_input_time_registers_is_empty(self):
         """INPUT_TIME_REGISTERS is an empty set."""
@@ -277,5 +312,98 @@ class TestIsDataSane:
         assert is_data_sane(registers, "hold") is False
 
 
+class TestBlockValidation:
+    """Test cases for the per-register verdicts on register blocks."""
+
+    def test_block_reports_only_implausible_registers(self):
+        """Only the registers breaking their rule are reported, in register order."""
+        values = [0] * 20
+        values[I_VPV1] = 3500                      # 350.0 V
+        values[I_VBAT] = 0xFFFF                    # implausible battery voltage
+        values[I_SOC_SOH] = 101 | (100 << 8)       # SOC 101%
+        values[I_FAC] = 5000                       # 50.00 Hz
+
+        assert invalid_registers(0, values, "input") == [I_VBAT, I_SOC_SOH]
+
+    def test_block_offset_and_partial_coverage(self):
+        """Rules are matched by register number for blocks not starting at 0."""
+        start = H_AC_CHARGE_START_TIME - 2
+        values = [0xFFFF, 0xFFFF, _encode_time(8, 0), _encode_time(24, 0)]
+
+        assert invalid_registers(start, values, "hold") == [H_AC_CHARGE_END_TIME]
+        # A block ending before the time register has nothing to check
+        assert invalid_registers(start, values[:2], "hold") == []
+
+    def test_register_breaking_several_limits_reported_once(self):
+        """A time register with both hour and minute out of range is reported once."""
+        assert invalid_registers(H_AC_CHARGE_START_TIME, [_encode_time(25, 61)], "hold") == [H_AC_CHARGE_START_TIME]
+
+    def test_unknown_register_type_passes(self):
+        """Register types without rules have nothing to reject."""
+        assert invalid_registers(0, [0xFFFF] * 10, "battery") == []
+        assert is_data_sane({0: 0xFFFF}, "battery") is True
+
+    def test_validator_with_custom_rules(self):
+        """A validator checks byte fields and whole values of its own rules."""
+        validator = BlockValidator({2: value_limit(10), 3: (FieldLimit(8, 0xFF, 1),)})
+
+        assert validator.invalid_registers(0, [99, 99, 10, 0x01FF]) == []
+        assert validator.invalid_registers(0, [99, 99, 11, 0x0200]) == [2, 3]
+        assert validator.invalid_in({2: 11, 3: 0x0100, 7: 99}) == [2]
+
+    def test_input_block_checks_soc_soh_and_frequency(self):
+        """SOC and SOH are at most 100%, no grid reads as 0 Hz."""
+        assert is_data_sane({I_SOC_SOH: 100 | (100 << 8), I_FAC: 0}, "input") is True
+        assert is_data_sane({I_SOC_SOH: 50 | (101 << 8)}, "input") is False
+        assert is_data_sane({I_FAC: 7001}, "input") is False
+
+
+class TestDependentRules:
+    """Test cases for the limits depending on another register of the block."""
+
+    def test_frequency_zero_with_grid_voltage_rejected(self):
+        """A grid or off-grid frequency of 0 Hz while that output has voltage is dropped."""
+        values = [0] * 30
+        values[I_VAC_R] = 2300                     # 230.0 V
+        values[I_VEPS_R] = 2300
+
+        assert invalid_registers(0, values, "input") == [I_FAC, I_FEPS]
+
+        values[I_FAC] = values[I_FEPS] = 5000
+        assert invalid_registers(0, values, "input") == []
+
+    def test_frequency_zero_without_voltage_kept(self):
+        """No grid reads as 0 V and 0 Hz."""
+        assert invalid_registers(0, [0] * 30, "input") == []
+        assert is_data_sane({I_VAC_R: 0, I_FAC: 0}, "input") is True
+
+    def test_block_without_other_register_not_checked(self):
+        """The limit only applies when the block holds the register it depends on."""
+        assert invalid_registers(I_FAC, [0, 0], "input") == []
+
+    def test_invalid_in_checks_dependent_rules(self):
+        """Mappings are checked against the dependent rules too."""
+        assert is_data_sane({I_VAC_R: 2300, I_FAC: 0}, "input") is False
+        assert is_data_sane({I_VAC_R: 2300, I_FAC: 4999}, "input") is True
+
+    def test_validator_with_custom_dependent_rules(self):
+        """A value limited by a field limit and a dependent minimum is reported once."""
+        validator = BlockValidator({2: value_limit(10)}, {2: (DependentMinimum(0, 1, 5),)})
+
+        assert validator.invalid_registers(0, [0, 0, 0]) == []
+        assert validator.invalid_registers(0, [1, 0, 4]) == [2]
+        assert validator.invalid_registers(0, [1, 0, 11]) == [2]
+        assert validator.invalid_in({0: 1, 2: 4}) == [2]
+
+
+class TestHoldSettings:
+    """Hold settings are only checked for their format, not the range of the entity writing them."""
+
+    def test_settings_outside_entity_range_kept(self):
+        """Negative temperature limits and large settings are values the inverter holds."""
+        assert invalid_registers(100, [0xFFFF] * 25, "hold") == []
+        assert is_data_sane({106: 0xFFF6, 64: 0xFFFF}, "hold") is True
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
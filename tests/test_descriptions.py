@@ -0,0 +1,100 @@
+"""Tests for the lazy loading of the entity description tables."""
+
+import subprocess
+import pytest
+from unittest.mock import MagicMock
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from homeassistant.const import Platform
+
+from custom_components.lxp_modbus.const import DOMAIN
+from custom_components.lxp_modbus.descriptions import (
+    DESCRIPTION_MODULES,
+    async_load_descriptions,
+    descriptions_loaded,
+    format_startup_timings,
+    load_descriptions,
+    record_platform_setup,
+)
+
+REPO_ROOT = os.path.join(os.path.dirname(__file__), '..')
+BUTTON_MODULE = "custom_components.lxp_modbus.entity_descriptions.button_types"
+
+
+def _hass(entry):
+    hass = MagicMock()
+    hass.data = {DOMAIN: {entry.entry_id: {}}}
+
+    async def executor(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = MagicMock(side_effect=executor)
+    return hass
+
+
+def _entry():
+    entry = MagicMock()
+    entry.entry_id = "entry"
+    return entry
+
+
+class TestDescriptions:
+    """Test cases for the description loader and startup timings."""
+
+    def test_every_platform_has_its_tables(self):
+        """Each platform's module loads and is shared between calls."""
+        for platform in DESCRIPTION_MODULES:
+            module = load_descriptions(platform)
+            assert load_descriptions(platform) is module
+            assert descriptions_loaded(platform)
+        assert load_descriptions(Platform.SENSOR).BATTERY_SENSOR_TYPES
+
+    @pytest.mark.asyncio
+    async def test_first_load_imports_in_executor(self, monkeypatch):
+        """The first load imports in the executor and records the time, later loads do not."""
+        load_descriptions(Platform.BUTTON)
+        monkeypatch.delitem(sys.modules, BUTTON_MODULE)
+        entry = _entry()
+        hass = _hass(entry)
+
+        module = await async_load_descriptions(hass, entry, Platform.BUTTON)
+        assert module.BUTTON_TYPES
+        assert hass.async_add_executor_job.call_count == 1
+        assert hass.data[DOMAIN]["entry"]["startup_timings"][Platform.BUTTON]["import"] > 0
+
+        assert await async_load_descriptions(hass, entry, Platform.BUTTON) is module
+        assert hass.async_add_executor_job.call_count == 1
+
+    def test_startup_report(self):
+        """The report lists the import and setup cost of each platform."""
+        entry = _entry()
+        hass = _hass(entry)
+        record_platform_setup(hass, entry, Platform.NUMBER, 0.0, 3)
+        timings = hass.data[DOMAIN]["entry"]["startup_timings"]
+        timings[Platform.NUMBER]["import"] = 0.25
+        timings[Platform.NUMBER]["setup"] = 0.5
+        timings[Platform.SWITCH] = {"import": 0.01}
+
+        assert format_startup_timings(timings) == (
+            "number: import 250 ms, setup 500 ms (3 entities); switch: import 10 ms"
+        )
+        assert format_startup_timings({}) == "no platforms"
+
+    def test_platform_modules_do_not_import_descriptions(self):
+        """Importing the platforms leaves the description tables to their setup."""
+        code = (
+            "import sys\n"
+            "import custom_components.lxp_modbus.sensor, custom_components.lxp_modbus.number\n"
+            "print([name for name in sys.modules if '.entity_descriptions.' in name])\n"
+        )
+        result = subprocess.run([sys.executable, "-c", code], cwd=REPO_ROOT, capture_output=True, text=True)
+        assert result.returncode == 0, result.stderr
+        assert result.stdout.strip() == "[]"
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,38 @@
+"""Tests for the device facts derived from the inverter registers."""
+
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.device_facts import DeviceFacts, derive_device_facts
+from custom_components.lxp_modbus.constants.input_registers import I_MASTER_SLAVE_PARALLEL_STATUS
+
+FIRMWARE_REGISTERS = {7: 0x4146, 8: 0x4241, 9: 0x0102, 10: 0x0003}
+
+
+class TestDeviceFacts:
+    """Test cases for derive_device_facts."""
+
+    def test_firmware_version(self):
+        """The firmware string is formatted from hold registers 7-10."""
+        facts = derive_device_facts({"hold": FIRMWARE_REGISTERS, "input": {}})
+        assert facts.firmware_version == "FAAB-020103"
+
+    def test_missing_data(self):
+        """Without data the firmware is unknown and the inverter taken as master."""
+        facts = derive_device_facts(None)
+        assert facts == DeviceFacts(firmware_version=None, parallel_status=None)
+        assert facts.is_master
+
+    @pytest.mark.parametrize("status, is_master", [(0, True), (1, True), (2, False), (6, False), (3, True)])
+    def test_parallel_role(self, status, is_master):
+        """Only role 2 in bits 0-1 is a slave."""
+        facts = derive_device_facts({"input": {I_MASTER_SLAVE_PARALLEL_STATUS: status}})
+        assert facts.is_master is is_master
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
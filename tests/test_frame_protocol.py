@@ -0,0 +1,148 @@
+"""Tests for the LxpFrameProtocol class."""
+
+import asyncio
+import pytest
+from unittest.mock import MagicMock
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.frame_protocol import LxpFrameProtocol
+from test_data import INPUT_RESPONSES, FUNCTION_193_MESSAGE
+
+READ_RESPONSE = bytes.fromhex(INPUT_RESPONSES["DUMMY_INVERTER_197"]["response_hex"])
+GREETING = bytes.fromhex(FUNCTION_193_MESSAGE)
+
+
+def _is_read_reply(response):
+    """Matcher accepting the hold read reply from the test data."""
+    return response.tcp_function == 194 and response.device_function == 3 and response.register == 0
+
+
+class TestLxpFrameProtocol:
+    """Test cases for LxpFrameProtocol."""
+
+    @pytest.fixture
+    def transport(self):
+        """Mock transport that is open."""
+        transport = MagicMock()
+        transport.is_closing.return_value = False
+        return transport
+
+    @pytest.fixture
+    def protocol(self, transport):
+        """Create a protocol attached to the mock transport."""
+        protocol = LxpFrameProtocol()
+        protocol.connection_made(transport)
+        return protocol
+
+    @pytest.mark.asyncio
+    async def test_request_resolved_by_matching_frame(self, protocol, transport):
+        """A complete frame resolves the request waiting for it."""
+        request = asyncio.ensure_future(protocol.async_request(b"req", _is_read_reply, 1))
+        await asyncio.sleep(0)
+        transport.write.assert_called_once_with(b"req")
+
+        protocol.data_received(READ_RESPONSE)
+        response = await request
+
+        assert response.packet_error is False
+        assert response.register == 0
+        assert protocol.pending_requests == 0
+
+    @pytest.mark.asyncio
+    async def test_frame_split_across_reads(self, protocol):
+        """Bytes arriving in small chunks are reassembled into one frame."""
+        future = protocol.expect(_is_read_reply)
+
+        for i in range(0, len(READ_RESPONSE), 7):
+            protocol.data_received(READ_RESPONSE[i:i + 7])
+
+        assert future.done()
+        assert future.result().packet_error is False
+        assert protocol.frames_received == 1
+
+    @pytest.mark.asyncio
+    async def test_concatenated_frames_and_greeting(self, protocol):
+        """A greeting and a reply in one read are split; the greeting is filed as unsolicited."""
+        future = protocol.expect(_is_read_reply)
+
+        protocol.data_received(GREETING + READ_RESPONSE)
+
+        assert future.result().register == 0
+        unsolicited = protocol.pop_unsolicited()
+        assert len(unsolicited) == 1
+        assert unsolicited[0].tcp_function == 193
+        assert protocol.pop_unsolicited() == []
+        assert protocol.get_stats()["unsolicited_frames"] == 1
+
+    @pytest.mark.asyncio
+    async def test_garbage_before_prefix_is_discarded(self, protocol):
+        """Leading bytes that are not part of a frame are dropped."""
+        future = protocol.expect(_is_read_reply)
+
+        protocol.data_received(b"\x00\x01garbage" + READ_RESPONSE)
+
+        assert future.result().packet_error is False
+        assert protocol.bytes_discarded == 9
+
+    @pytest.mark.asyncio
+    async def test_crc_errors_counted(self, protocol):
+        """A reply with a wrong CRC is counted and answers no request; greetings are not counted."""
+        future = protocol.expect(_is_read_reply)
+
+        protocol.data_received(GREETING + READ_RESPONSE[:-2] + bytes([READ_RESPONSE[-2] ^ 0xFF, READ_RESPONSE[-1]]))
+
+        assert not future.done()
+        assert protocol.get_stats()["crc_errors"] == 1
+        assert protocol.get_stats()["unsolicited_frames"] == 2
+
+    @pytest.mark.asyncio
+    async def test_invalid_length_resynchronises(self, protocol):
+        """A prefix followed by an impossible length is skipped and framing resumes."""
+        future = protocol.expect(_is_read_reply)
+
+        protocol.data_received(b"\xa1\x1a\x05\x00\xff\xff" + READ_RESPONSE)
+
+        assert future.result().packet_error is False
+
+    @pytest.mark.asyncio
+    async def test_request_timeout_forgets_waiter(self, protocol):
+        """A request without a matching frame times out and stops waiting."""
+        with pytest.raises(asyncio.TimeoutError):
+            await protocol.async_request(b"req", _is_read_reply, 0.01)
+
+        assert protocol.pending_requests == 0
+
+        # A late reply is then filed as unsolicited
+        protocol.data_received(READ_RESPONSE)
+        assert len(protocol.pop_unsolicited()) == 1
+
+    @pytest.mark.asyncio
+    async def test_connection_lost_fails_pending_requests(self, protocol):
+        """Pending requests fail as soon as the connection drops."""
+        future = protocol.expect(_is_read_reply)
+
+        protocol.connection_lost(None)
+
+        with pytest.raises(ConnectionResetError):
+            future.result()
+        assert protocol.is_alive is False
+        with pytest.raises(ConnectionResetError):
+            protocol.send(b"req")
+        await asyncio.wait_for(protocol.wait_closed(), timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_is_alive_follows_transport(self, protocol, transport):
+        """is_alive turns False once the transport is closing."""
+        assert protocol.is_alive is True
+
+        transport.is_closing.return_value = True
+
+        assert protocol.is_alive is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
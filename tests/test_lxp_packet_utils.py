@@ -0,0 +1,64 @@
+"""Tests for the CRC-16/Modbus implementation."""
+
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.lxp_packet_utils import CRC_INIT, LxpPacketUtils
+from test_data import INPUT_RESPONSES
+
+
+def _bitwise_crc(data: bytes) -> int:
+    """Reference bit-by-bit CRC-16/Modbus."""
+    crc = 0xFFFF
+    for pos in data:
+        crc ^= pos
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0xA001 if crc & 1 else crc >> 1
+    return crc
+
+
+FRAME = bytes.fromhex(INPUT_RESPONSES["DUMMY_INVERTER_197"]["response_hex"])
+
+
+class TestLxpPacketUtils:
+    """Test cases for LxpPacketUtils."""
+
+    def test_check_value(self):
+        """The standard CRC-16/Modbus check value."""
+        assert LxpPacketUtils.compute_crc(b"123456789") == 0x4B37
+        assert LxpPacketUtils.compute_crc(b"") == CRC_INIT
+
+    def test_matches_bitwise_reference(self):
+        """The table-driven CRC equals the bitwise one for every byte value and a real frame."""
+        assert LxpPacketUtils.compute_crc(bytes(range(256))) == _bitwise_crc(bytes(range(256)))
+        assert LxpPacketUtils.compute_crc(FRAME) == _bitwise_crc(FRAME)
+
+    def test_frame_crc(self):
+        """The CRC of a captured reply matches the one it carries."""
+        data_frame = FRAME[20:-2]
+        assert LxpPacketUtils.compute_crc(data_frame) == int.from_bytes(FRAME[-2:], 'little')
+
+    def test_accepts_bytes_like(self):
+        """bytearray and memoryview slices give the same result as bytes."""
+        expected = LxpPacketUtils.compute_crc(FRAME[20:-2])
+
+        assert LxpPacketUtils.compute_crc(bytearray(FRAME)[20:-2]) == expected
+        assert LxpPacketUtils.compute_crc(memoryview(FRAME)[20:-2]) == expected
+
+    @pytest.mark.parametrize("chunk_size", [1, 7, 64])
+    def test_incremental_update(self, chunk_size):
+        """Feeding the data in chunks gives the CRC of the whole."""
+        view = memoryview(FRAME)
+        crc = CRC_INIT
+        for start in range(0, len(FRAME), chunk_size):
+            crc = LxpPacketUtils.update_crc(crc, view[start:start + chunk_size])
+
+        assert crc == LxpPacketUtils.compute_crc(FRAME)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,118 @@
+"""Tests for the request packet builder and its per-client cache."""
+
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.lxp_packet_utils import LxpPacketUtils
+from custom_components.lxp_modbus.classes.lxp_request_builder import LxpRequestBuilder, LxpRequestCache
+
+DONGLE = b"DG44302247"
+INVERTER = b"4434280298"
+
+
+class TestEncodeValue:
+    """Test cases for the register value encoding shared by all write packets."""
+
+    @pytest.mark.parametrize("value,encoded", [(0, b"\x00\x00"), (0x7FFF, b"\xff\x7f"), (0x8000, b"\x00\x80"),
+                                               (0xFFFF, b"\xff\xff"), (-1, b"\xff\xff"), (-20, b"\xec\xff")])
+    def test_encode_value(self, value, encoded):
+        """Values are unsigned 16-bit, negative ones in two's complement."""
+        assert LxpRequestBuilder.encode_value(value) == encoded
+
+    @pytest.mark.parametrize("value", [0x8000, 0xFFFF, -1, -32768])
+    def test_single_and_multi_writes_encode_alike(self, value):
+        """Single and write multiple packets carry the same value bytes."""
+        single = LxpRequestBuilder.prepare_packet_for_write(DONGLE, INVERTER, 106, value)
+        multi = LxpRequestBuilder.prepare_packet_for_write_multi(DONGLE, INVERTER, 106, [value])
+
+        assert single[34:36] == multi[-4:-2] == LxpRequestBuilder.encode_value(value)
+        assert LxpRequestCache(DONGLE, INVERTER).write(106, value) == single
+
+
+class TestLxpRequestCache:
+    """Test cases for LxpRequestCache."""
+
+    @pytest.mark.parametrize("function_code,start,count", [(3, 0, 125), (4, 125, 125), (4, 5000, 120), (3, 21, 64)])
+    def test_read_matches_builder(self, function_code, start, count):
+        """Cached read packets are identical to freshly built ones."""
+        cache = LxpRequestCache(DONGLE, INVERTER)
+
+        assert cache.read(start, count, function_code) == LxpRequestBuilder.prepare_packet_for_read(
+            DONGLE, INVERTER, start, count, function_code
+        )
+
+    def test_read_is_built_once(self):
+        """The same block returns the same packet object."""
+        cache = LxpRequestCache(DONGLE, INVERTER)
+
+        assert cache.read(0, 125, 4) is cache.read(0, 125, 4)
+        assert cache.read(0, 125, 4) != cache.read(0, 125, 3)
+
+    def test_read_cache_is_bounded(self):
+        """The cache is emptied instead of growing without limit."""
+        cache = LxpRequestCache(DONGLE, INVERTER)
+        for start in range(LxpRequestCache.MAX_READS + 10):
+            cache.read(start, 1, 3)
+
+        assert len(cache._reads) <= LxpRequestCache.MAX_READS
+
+    @pytest.mark.parametrize("register,value", [(0, 0), (66, 80), (21, 0xFFFF >> 1), (105, -20), (106, 0x8000), (255, 1)])
+    def test_write_matches_builder(self, register, value):
+        """Patched write packets are identical to freshly built ones, signed values included."""
+        cache = LxpRequestCache(DONGLE, INVERTER)
+        cache.write(1, 1)
+
+        assert cache.write(register, value) == LxpRequestBuilder.prepare_packet_for_write(
+            DONGLE, INVERTER, register, value
+        )
+
+    def test_invalid_serial_raises_on_use(self):
+        """Serials are validated when a packet is first needed, as the builder does."""
+        cache = LxpRequestCache(DONGLE, b"SHORT")
+
+        with pytest.raises(ValueError):
+            cache.read(0, 125, 3)
+        with pytest.raises(ValueError):
+            cache.write(66, 1)
+
+
+class TestWriteMulti:
+    """Test cases for write multiple (0x10) request packets."""
+
+    def test_write_multi_packet_layout(self):
+        """The data frame holds start, count, byte count and the little-endian values."""
+        packet = LxpRequestBuilder.prepare_packet_for_write_multi(DONGLE, INVERTER, 72, [0x0A08, 0x1E10])
+
+        assert packet[:2] == LxpRequestBuilder.PREFIX
+        assert int.from_bytes(packet[2:4], 'little') == LxpRequestBuilder.PROTOCOL_WRITE_MULTI
+        assert int.from_bytes(packet[4:6], 'little') + 6 == len(packet) == 43
+        assert int.from_bytes(packet[18:20], 'little') == len(packet) - 20
+        data_frame = packet[20:-2]
+        assert data_frame[1] == LxpRequestBuilder.WRITE_MULTI
+        assert data_frame[2:12] == INVERTER
+        assert int.from_bytes(data_frame[12:14], 'little') == 72
+        assert int.from_bytes(data_frame[14:16], 'little') == 2
+        assert data_frame[16] == 4
+        assert data_frame[17:] == bytes([0x08, 0x0A, 0x10, 0x1E])
+        assert int.from_bytes(packet[-2:], 'little') == LxpPacketUtils.compute_crc(data_frame)
+
+    def test_write_multi_cache_matches_builder(self):
+        """The client cache builds the same write multiple packets."""
+        cache = LxpRequestCache(DONGLE, INVERTER)
+
+        assert cache.write_multi(66, [1, 0xFFFF, -1]) == LxpRequestBuilder.prepare_packet_for_write_multi(
+            DONGLE, INVERTER, 66, [1, 0xFFFF, -1]
+        )
+
+    def test_write_multi_rejects_empty_values(self):
+        """A write multiple request needs at least one value."""
+        with pytest.raises(ValueError):
+            LxpRequestBuilder.prepare_packet_for_write_multi(DONGLE, INVERTER, 66, [])
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -9,7 +9,10 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
-from test_data import EXCEPTION_RESPONSES, FUNCTION_193_MESSAGE
+from dongle_simulator import build_response
+from test_data import EXCEPTION_RESPONSES, FUNCTION_193_MESSAGE, INPUT_RESPONSES
+
+READ_RESPONSE = bytes.fromhex(INPUT_RESPONSES["DUMMY_INVERTER_197"]["response_hex"])
 
 class TestLxpResponse:
     """Test cases for LxpResponse."""
@@ -38,3 +41,51 @@ class TestLxpResponse:
         assert response.dongle_serial == b"DG99999999"
         assert len(response.value)
 
+
+    def test_registers_view_packet(self):
+        """Register values are decoded from the packet without copying it."""
+        response = LxpResponse(READ_RESPONSE)
+
+        assert response.packet_error is False
+        assert response.value.obj is READ_RESPONSE
+        assert len(response.registers) == 80
+        assert response.parsed_values == [
+            READ_RESPONSE[35 + 2 * i] | (READ_RESPONSE[36 + 2 * i] << 8) for i in range(80)
+        ]
+        assert response.value == READ_RESPONSE[35:195]
+
+    def test_parsed_values_dictionary_built_once(self):
+        """The register dict is built on first access and reused."""
+        response = LxpResponse(READ_RESPONSE)
+        parsed = response.parsed_values_dictionary
+
+        assert response.parsed_values_dictionary is parsed
+        assert list(parsed) == list(range(0, 80))
+        assert list(parsed.values()) == response.parsed_values
+
+    def test_bytearray_packet(self):
+        """A mutable packet is decoded the same, and stays resizable."""
+        packet = bytearray(READ_RESPONSE)
+        response = LxpResponse(packet)
+        packet.clear()
+
+        assert response.parsed_values_dictionary == LxpResponse(READ_RESPONSE).parsed_values_dictionary
+
+    def test_exception_has_no_registers(self):
+        """Exception replies carry no register values."""
+        response = LxpResponse(bytes.fromhex(EXCEPTION_RESPONSES["DUMMY_INVERTER_1_EXCEPTION"]["response_hex"]))
+
+        assert len(response.registers) == 0
+        assert response.parsed_values_dictionary == {}
+
+    def test_write_multi_acknowledgement(self):
+        """A write multiple reply carries the start register and register count, no values."""
+        packet = build_response(b"DG44302247", b"4434280298", 16, 72, (2).to_bytes(2, 'little'),
+                                value_length_byte=False)
+        response = LxpResponse(packet)
+
+        assert not response.packet_error
+        assert response.device_function == 16
+        assert response.register == 72
+        assert response.register_count == 2
+        assert response.parsed_values_dictionary == {}
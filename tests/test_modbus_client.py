@@ -2,6 +2,7 @@
 
 import asyncio
 import pytest
+from collections.abc import Mapping
 from unittest.mock import AsyncMock, MagicMock, patch
 import time as time_lib
 
@@ -12,17 +13,92 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from custom_components.lxp_modbus.classes.modbus_client import LxpModbusApiClient, HOLD_TIME_REGISTERS
+from custom_components.lxp_modbus.classes.modbus_client import LxpModbusApiClient, HOLD_TIME_REGISTERS, _contiguous_blocks
+from custom_components.lxp_modbus.classes.request_scheduler import RequestScheduler
 from custom_components.lxp_modbus.classes.data_validator import is_data_sane
 from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
 from custom_components.lxp_modbus.classes.lxp_request_builder import LxpRequestBuilder
 from custom_components.lxp_modbus.const import (
-    DEFAULT_CONNECTION_RETRIES, TOTAL_REGISTERS, RESPONSE_OVERHEAD, 
-    WRITE_RESPONSE_LENGTH, MAX_PACKET_RECOVERY_ATTEMPTS, PACKET_RECOVERY_TIMEOUT
+    DEFAULT_CONNECTION_RETRIES, TOTAL_REGISTERS, RESPONSE_OVERHEAD, TIER_LIVE, TIER_ENERGY, TIER_HOLD,
+    HOLD_SENTINEL_START, HOLD_SENTINEL_COUNT, HOLD_SENTINEL_MAX_SKIPS,
+    WRITE_RESPONSE_LENGTH
 )
 from custom_components.lxp_modbus.constants.hold_registers import H_AC_CHARGE_START_TIME, H_AC_CHARGE_END_TIME
 
-from test_data import INPUT_RESPONSES, HOLD_RESPONSES
+from test_data import INPUT_RESPONSES, HOLD_RESPONSES, FUNCTION_193_MESSAGE
+
+
+def _mock_session(**request_kwargs):
+    """Mock LxpFrameProtocol session whose async_request is configured by request_kwargs."""
+    session = MagicMock()
+    session.is_alive = True
+    session.async_request = AsyncMock(**request_kwargs)
+    session.pop_unsolicited.return_value = []
+    session.wait_closed = AsyncMock()
+    return session
+
+
+def _read_one(session, reg, request_type, function_code, count):
+    """Stand-in for async_request_registers returning the block's first register."""
+    return {reg: 1}
+
+
+class _PipelineSession:
+    """Fake session answering every read request it receives.
+
+    Replies to the requests in flight are delivered in reverse order when
+    reverse is set; registers in drop never get a reply.
+    """
+
+    def __init__(self, inverter_serial, reverse=False, drop=()):
+        self._serial = inverter_serial.encode()
+        self._reverse = reverse
+        self._drop = set(drop)
+        self.pending = []
+        self.max_in_flight = 0
+
+    def expect(self, matcher):
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((matcher, future))
+        return future
+
+    def forget(self, future):
+        self.pending = [p for p in self.pending if p[1] is not future]
+        if not future.done():
+            future.cancel()
+
+    def send(self, packet):
+        # Register and function code sit right after the dongle/inverter serials
+        function_code = packet[21]
+        register = int.from_bytes(packet[32:34], "little")
+        in_flight = sum(1 for _, f in self.pending if not f.done())
+        self.max_in_flight = max(self.max_in_flight, in_flight)
+        if register in self._drop:
+            return
+        response = MagicMock()
+        response.tcp_function = LxpRequestBuilder.TRANSLATED_DATA
+        response.packet_error = False
+        response.serial_number = self._serial
+        response.device_function = function_code
+        response.register = register
+        response.parsed_values_dictionary = {register: 1}
+        response.registers = [1]
+        delay = 0.01 * (10 - in_flight) if self._reverse else 0
+        asyncio.get_running_loop().call_later(delay, self._deliver, response)
+
+    def _deliver(self, response):
+        for matcher, future in self.pending:
+            if not future.done() and matcher(response):
+                future.set_result(response)
+                return
+
+
+FULL_BLOCKS = [(reg, 125) for reg in range(0, TOTAL_REGISTERS, 125)]
+
+
+def _patch_connect(**kwargs):
+    """Patch the event loop's create_connection used by ModbusConnectionManager."""
+    return patch.object(asyncio.get_running_loop(), "create_connection", AsyncMock(**kwargs))
 
 
 class TestLxpModbusApiClient:
@@ -30,11 +106,8 @@ class TestLxpModbusApiClient:
 
     @pytest.fixture
     def mock_lock(self):
-        """Mock asyncio lock."""
-        lock = AsyncMock()
-        lock.__aenter__ = AsyncMock(return_value=None)
-        lock.__aexit__ = AsyncMock(return_value=None)
-        return lock
+        """Request scheduler shared by the client's polls and writes."""
+        return RequestScheduler()
 
     @pytest.fixture
     def client(self, mock_lock):
@@ -50,15 +123,6 @@ class TestLxpModbusApiClient:
             skip_initial_data=False
         )
 
-    @pytest.fixture
-    def mock_reader_writer(self):
-        """Mock asyncio reader and writer."""
-        reader = AsyncMock()
-        writer = AsyncMock()
-        writer.close = MagicMock()
-        writer.wait_closed = AsyncMock()
-        return reader, writer
-
     @pytest.fixture
     def sample_input_response(self):
         """Sample input response data."""
@@ -90,10 +154,7 @@ class TestLxpModbusApiClient:
         assert client._last_good_hold_regs == {}
         assert client._last_good_battery_data == {}
         assert client._connection_retry_count == 0
-        stats = client.get_recovery_stats()
-        assert stats["total_recovery_attempts"] == 0
-        assert stats["successful_recoveries"] == 0
-        assert stats["failed_recoveries"] == 0
+        assert client.get_recovery_stats() == {"frames_received": 0, "bytes_discarded": 0, "crc_errors": 0}
 
     def test_init_with_custom_params(self, mock_lock):
         """Test client initialization with custom parameters."""
@@ -115,204 +176,408 @@ class TestLxpModbusApiClient:
         assert client._block_size == 40
         assert client._connection_retries == 5
 
-    def test_get_recovery_stats_initial(self, client):
-        """Test recovery statistics when no recoveries have been attempted."""
-        stats = client.get_recovery_stats()
-        
-        assert stats["total_recovery_attempts"] == 0
-        assert stats["successful_recoveries"] == 0
-        assert stats["failed_recoveries"] == 0
-        assert stats["recovery_success_rate"] == 0
-
-    def test_get_recovery_stats_with_data(self, client):
-        """Test recovery statistics with some data."""
-        client._packet_recovery._recovery_attempts_total = 10
-        client._packet_recovery._recovery_successes = 7
-        client._packet_recovery._recovery_failures = 3
-        
-        stats = client.get_recovery_stats()
-        
-        assert stats["total_recovery_attempts"] == 10
-        assert stats["successful_recoveries"] == 7
-        assert stats["failed_recoveries"] == 3
-        assert stats["recovery_success_rate"] == 70.0
-
     @pytest.mark.asyncio
     async def test_async_discard_initial_data_skip_disabled(self, client):
         """Test discard initial data when skip is disabled."""
         client._connection_manager._skip_initial_data = False
-        reader = AsyncMock()
+        session = _mock_session()
 
-        await client.async_discard_initial_data(reader)
+        await client.async_discard_initial_data(session)
 
-        # Should not read anything when skip is disabled
-        reader.read.assert_not_called()
+        # Should leave unsolicited frames alone when skip is disabled
+        session.pop_unsolicited.assert_not_called()
 
     @pytest.mark.asyncio
     async def test_async_discard_initial_data_skip_enabled(self, client):
         """Test discard initial data when skip is enabled."""
         client._connection_manager._skip_initial_data = True
-        reader = AsyncMock()
-        reader.read.return_value = b"some_initial_data"
+        session = _mock_session()
+        session.pop_unsolicited.return_value = [LxpResponse(bytes.fromhex(FUNCTION_193_MESSAGE))]
 
-        await client.async_discard_initial_data(reader)
+        await client.async_discard_initial_data(session)
 
-        # Should attempt to read initial data
-        reader.read.assert_called_once_with(300)
+        # Should drop the frames the framer filed as unsolicited
+        session.pop_unsolicited.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_async_discard_initial_data_timeout(self, client):
-        """Test discard initial data when timeout occurs."""
+    async def test_async_discard_initial_data_does_not_wait(self, client):
+        """Test discard initial data returns immediately when the dongle sent nothing."""
         client._connection_manager._skip_initial_data = True
-        reader = AsyncMock()
-        reader.read.side_effect = asyncio.TimeoutError()
+        session = _mock_session()
 
-        # Should not raise exception on timeout
-        await client.async_discard_initial_data(reader)
+        await asyncio.wait_for(client.async_discard_initial_data(session), timeout=0.1)
 
-        reader.read.assert_called_once_with(300)
+        session.pop_unsolicited.assert_called_once()
 
     @pytest.mark.asyncio
-    async def test_async_request_registers_success(self, client, mock_reader_writer, sample_input_response):
+    async def test_async_request_registers_success(self, client):
         """Test successful register request."""
-        reader, writer = mock_reader_writer
-        reader.read.return_value = sample_input_response
-        
-        # Mock the response validation in the method
-        with patch('custom_components.lxp_modbus.classes.modbus_client.LxpResponse') as mock_response_class:
-            mock_response = MagicMock()
-            mock_response.packet_error = False
-            mock_response.serial_number = b"4434280298"
-            mock_response.device_function = 4
-            mock_response.register = 0
-            mock_response.parsed_values_dictionary = {0: 100, 1: 200, 2: 300}
-            mock_response_class.return_value = mock_response
-            
-            # Mock the is_data_sane function to return True
-            with patch('custom_components.lxp_modbus.classes.modbus_client.is_data_sane', return_value=True):
-                result = await client.async_request_registers(writer, reader, 0, "input", 4)
-                
-                writer.write.assert_called_once()
-                writer.drain.assert_called_once()
-                reader.read.assert_called_once()
-                
-                # Should return a dictionary with parsed values
-                assert isinstance(result, dict)
-                assert len(result) > 0
+        mock_response = MagicMock()
+        mock_response.packet_error = False
+        mock_response.serial_number = b"4434280298"
+        mock_response.device_function = 4
+        mock_response.register = 0
+        mock_response.parsed_values_dictionary = {0: 100, 1: 200, 2: 300}
+        mock_response.registers = [100, 200, 300]
+        session = _mock_session(return_value=mock_response)
+
+        # Mock the validation to find no implausible registers
+        with patch('custom_components.lxp_modbus.classes.modbus_client.invalid_registers', return_value=[]):
+            result = await client.async_request_registers(session, 0, "input", 4)
+
+            session.async_request.assert_called_once()
+            request_packet = session.async_request.call_args[0][0]
+            assert request_packet == LxpRequestBuilder.prepare_packet_for_read(
+                b"DG44302247", b"4434280298", 0, 125, 4
+            )
+
+            # Should return a mapping of the parsed values
+            assert isinstance(result, Mapping)
+            assert result == {0: 100, 1: 200, 2: 300}
 
     @pytest.mark.asyncio
-    async def test_async_request_registers_timeout(self, client, mock_reader_writer):
+    async def test_async_request_registers_drops_implausible_registers(self, client):
+        """Only the registers failing validation are dropped from a block."""
+        mock_response = MagicMock()
+        mock_response.packet_error = False
+        mock_response.serial_number = b"4434280298"
+        mock_response.device_function = 3
+        mock_response.register = H_AC_CHARGE_START_TIME
+        mock_response.parsed_values_dictionary = {}
+        mock_response.registers = [0x1E08, 0x0A18, 7]  # 08:30, 24:10
+        session = _mock_session(return_value=mock_response)
+
+        result = await client.async_request_registers(session, H_AC_CHARGE_START_TIME, "hold", 3, 3)
+
+        assert result == {H_AC_CHARGE_START_TIME: 0x1E08, H_AC_CHARGE_START_TIME + 2: 7}
+
+    @pytest.mark.asyncio
+    async def test_async_request_registers_timeout(self, client):
         """Test register request with timeout."""
-        reader, writer = mock_reader_writer
-        reader.read.side_effect = asyncio.TimeoutError()
-        
-        # The timeout should be propagated up from asyncio.wait_for
+        session = _mock_session(side_effect=asyncio.TimeoutError())
+
+        # The timeout should be propagated up from the session
         with pytest.raises(asyncio.TimeoutError):
-            await client.async_request_registers(writer, reader, 0, "input", 4)
+            await client.async_request_registers(session, 0, "input", 4)
 
     @pytest.mark.asyncio
-    async def test_async_request_registers_empty_response(self, client, mock_reader_writer):
+    async def test_async_request_registers_empty_response(self, client):
         """Test register request with empty response."""
-        reader, writer = mock_reader_writer
-        reader.read.return_value = b""
-        
-        result = await client.async_request_registers(writer, reader, 0, "input", 4)
-        
+        session = _mock_session(return_value=LxpResponse(b""))
+
+        result = await client.async_request_registers(session, 0, "input", 4)
+
         # Should return empty dict
         assert result == {}
 
     @pytest.mark.asyncio
-    async def test_async_request_registers_invalid_response(self, client, mock_reader_writer):
+    async def test_async_request_registers_invalid_response(self, client):
         """Test register request with invalid response."""
-        reader, writer = mock_reader_writer
-        reader.read.return_value = b"invalid_response_data"
-        
-        result = await client.async_request_registers(writer, reader, 0, "input", 4)
-        
+        session = _mock_session(return_value=LxpResponse(b"invalid_response_data"))
+
+        result = await client.async_request_registers(session, 0, "input", 4)
+
         # Should return empty dict for invalid response
         assert result == {}
 
-    @pytest.mark.asyncio
-    async def test_async_safe_packet_recovery_no_error(self, client, mock_reader_writer, sample_input_response):
-        """Test packet recovery when no recovery is needed."""
-        reader, writer = mock_reader_writer
-        response = LxpResponse(sample_input_response)
-        
-        if not response.packet_error:
-            result = await client.async_safe_packet_recovery(
-                reader, sample_input_response, len(sample_input_response), "input", 4
-            )
-            
-            assert result.packet_error == response.packet_error
-            # Should not attempt to read more data
-            reader.read.assert_not_called()
+    def test_response_matcher(self, client):
+        """Test the matcher only accepts replies for the requested function and register."""
+        response = LxpResponse(bytes.fromhex(INPUT_RESPONSES["DUMMY_INVERTER_197"]["response_hex"]))
 
-    @pytest.mark.asyncio
-    async def test_async_safe_packet_recovery_success(self, client, mock_reader_writer):
-        """Test successful packet recovery."""
-        reader, writer = mock_reader_writer
-        
-        # Create a malformed packet that needs recovery - should have packet_error = True
-        # and packet_length_calced > expected_length
-        malformed_packet = b"\xa1\x1a\x05\x00\x50\x01\x01\xc2" + b"incomplete_data"  # packet says it's 80 bytes but is only 18
-        additional_data = b"recovered_data_to_complete_packet" * 3  # Enough data to complete
-        
-        reader.read.return_value = additional_data
-        
-        result = await client.async_safe_packet_recovery(
-            reader, malformed_packet, 18, "input", 4  # expected_length < calculated length to trigger recovery
-        )
-        
-        # Recovery should have been attempted if the packet has error and needs more data
-        # The recovery will only increment if the original response has packet_error=True and needs more bytes
-        response = LxpResponse(malformed_packet)
-        if response.packet_error and response.packet_length_calced > 18:
-            assert client._packet_recovery._recovery_attempts_total > 0
+        assert client._response_matcher(3, 0)(response) is True
+        assert client._response_matcher(4, 0)(response) is False
+        assert client._response_matcher(3, 125)(response) is False
+        assert client._response_matcher(3, 0)(LxpResponse(bytes.fromhex(FUNCTION_193_MESSAGE))) is False
 
     @pytest.mark.asyncio
-    async def test_async_safe_packet_recovery_timeout(self, client, mock_reader_writer):
-        """Test packet recovery with timeout."""
-        reader, writer = mock_reader_writer
-        
-        # Create a malformed packet that triggers recovery
-        malformed_packet = b"\xa1\x1a\x05\x00\x50\x01\x01\xc2" + b"incomplete_data"  # Says 80 bytes but only 18
-        
-        reader.read.side_effect = asyncio.TimeoutError()
-        
-        result = await client.async_safe_packet_recovery(
-            reader, malformed_packet, 18, "input", 4
-        )
-        
-        # Check if recovery was attempted based on packet conditions
-        response = LxpResponse(malformed_packet)
-        if response.packet_error and response.packet_length_calced > 18:
-            assert client._packet_recovery._recovery_failures > 0
-
-    @pytest.mark.asyncio
-    async def test_async_get_data_connection_success(self, client, mock_reader_writer, sample_input_response, sample_hold_response):
+    async def test_async_get_data_connection_success(self, client, sample_input_response, sample_hold_response):
         """Test successful data retrieval."""
-        reader, writer = mock_reader_writer
-        
+        # Mock register responses
+        session = _mock_session(side_effect=[
+            LxpResponse(sample_input_response), LxpResponse(sample_hold_response)
+        ] * (TOTAL_REGISTERS // client._block_size + 1))
+
         # Mock successful connection
-        with patch('asyncio.open_connection', return_value=(reader, writer)):
-            # Mock register responses
-            reader.read.side_effect = [sample_input_response, sample_hold_response] * (TOTAL_REGISTERS // client._block_size + 1)
-            
+        with _patch_connect(return_value=(MagicMock(), session)):
             result = await client.async_get_data()
 
             assert "input" in result
             assert "hold" in result
             assert "battery" in result
-            assert isinstance(result["input"], dict)
-            assert isinstance(result["hold"], dict)
+            assert isinstance(result["input"], Mapping)
+            assert isinstance(result["hold"], Mapping)
             assert isinstance(result["battery"], dict)
+            session.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_async_get_data_persistent_connection_reused(self, mock_lock, sample_input_response):
+        """In persistent mode consecutive polls share a single connection."""
+        client = LxpModbusApiClient(
+            host="192.168.1.100",
+            port=8000,
+            dongle_serial="DG44302247",
+            inverter_serial="4434280298",
+            lock=mock_lock,
+            skip_initial_data=False,
+            persistent_connection=True,
+        )
+        session = _mock_session(return_value=LxpResponse(sample_input_response))
+
+        with _patch_connect(return_value=(MagicMock(), session)) as mock_connect:
+            await client.async_get_data()
+            await client.async_get_data()
+
+        mock_connect.assert_called_once()
+        session.close.assert_not_called()
+        stats = client.get_connection_stats()
+        assert stats["connections_opened"] == 1
+        assert stats["sessions_reused"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_request_blocks_pipelined(self, mock_lock):
+        """Pipelined reads keep up to window requests in flight and accept out-of-order replies."""
+        client = LxpModbusApiClient(
+            host="192.168.1.100",
+            port=8000,
+            dongle_serial="DG44302247",
+            inverter_serial="4434280298",
+            lock=mock_lock,
+            skip_initial_data=False,
+            pipeline_window=3,
+        )
+        session = _PipelineSession(client._inverter_serial, reverse=True)
+
+        values = await client.async_request_blocks(session, FULL_BLOCKS, "input", 4)
+
+        assert sorted(values) == list(range(0, TOTAL_REGISTERS, 125))
+        assert session.max_in_flight == 3
+        assert session.pending == []
+        stats = client.get_pipeline_stats()
+        assert stats["pipelined_requests"] == 6
+        assert stats["fallback_to_serial"] is False
+
+    @pytest.mark.asyncio
+    async def test_async_request_blocks_pipeline_timeout_falls_back(self, mock_lock):
+        """A pipelined request that times out switches the client to serial reads."""
+        client = LxpModbusApiClient(
+            host="192.168.1.100",
+            port=8000,
+            dongle_serial="DG44302247",
+            inverter_serial="4434280298",
+            lock=mock_lock,
+            skip_initial_data=False,
+            pipeline_window=4,
+        )
+        session = _PipelineSession(client._inverter_serial, drop={250})
+
+        with patch("custom_components.lxp_modbus.classes.modbus_client.READ_TIMEOUT", 0.3), \
+             patch.object(client, "async_request_registers",
+                          AsyncMock(side_effect=lambda s, reg, t, f, count: {reg: 1})) as mock_serial:
+            values = await client.async_request_blocks(session, FULL_BLOCKS, "input", 4)
+
+        assert sorted(values) == list(range(0, TOTAL_REGISTERS, 125))
+        # Replies already in flight are still used, only the dropped block is read again
+        assert [c.args[1] for c in mock_serial.call_args_list] == [250]
+        assert session.pending == []
+        stats = client.get_pipeline_stats()
+        assert stats["fallback_to_serial"] is True
+        assert stats["timeouts"] == 1
+
+        # Later polls stay serial
+        mock_serial.reset_mock()
+        with patch.object(client, "async_request_registers",
+                          AsyncMock(side_effect=lambda s, reg, t, f, count: {reg: 1})) as mock_serial:
+            await client.async_request_blocks(session, FULL_BLOCKS[:2], "hold", 3)
+        assert mock_serial.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_async_request_blocks_serial_by_default(self, client):
+        """With the default window of 1 blocks are read one at a time."""
+        with patch.object(client, "async_request_registers",
+                          AsyncMock(side_effect=lambda s, reg, t, f, count: {reg: 1})) as mock_serial:
+            values = await client.async_request_blocks(MagicMock(), FULL_BLOCKS, "hold", 3)
+
+        assert len(values) == 6
+        assert mock_serial.call_count == 6
+
+    @pytest.mark.asyncio
+    async def test_async_request_blocks_retries_unusable_and_lost_blocks(self, client):
+        """A block that came back empty or timed out is read again, up to the retry limit."""
+        replies = [{}, asyncio.TimeoutError(), {0: 1}, {125: 1}]
+        with patch.object(client, "async_request_registers", AsyncMock(side_effect=replies)) as mock_serial:
+            read = set()
+            values = await client.async_request_blocks(MagicMock(), FULL_BLOCKS[:2], "hold", 3, read=read)
+
+        assert values == {0: 1, 125: 1}
+        assert read == {0, 125}
+        assert mock_serial.call_count == 4
+        assert client.get_block_stats()["blocks"]["hold 0"] == {"reads": 1, "retries": 2, "failures": 0}
+
+        # Blocks already read are skipped, a block unanswered after its retries ends the read
+        with patch.object(client, "async_request_registers",
+                          AsyncMock(side_effect=asyncio.TimeoutError())) as mock_serial:
+            with pytest.raises(asyncio.TimeoutError):
+                await client.async_request_blocks(MagicMock(), FULL_BLOCKS[:3], "hold", 3, read=read)
+        assert [c.args[1] for c in mock_serial.call_args_list] == [250, 250, 250]
+        assert client.get_block_stats()["blocks"]["hold 250"]["failures"] == 1
+
+    @pytest.mark.asyncio
+    async def test_async_get_data_follows_read_plan(self, client):
+        """With a read plan only the planned ranges are requested."""
+        client.set_read_plan([
+            {"register_type": "input", "register": 20},
+            {"register_type": "hold", "register": 210},
+        ])
+        session = _mock_session()
+
+        with _patch_connect(return_value=(MagicMock(), session)), \
+             patch.object(client, "async_request_registers", AsyncMock(side_effect=_read_one)) as mock_request:
+            await client.async_get_data()
+
+        requested = [(c.args[1], c.args[2], c.args[4]) for c in mock_request.call_args_list]
+        # Input 20 merges with the core registers (96, 113), hold 210 can't share the firmware block
+        assert requested == [(20, "input", 94), (7, "hold", 4), (210, "hold", 1)]
+
+        client.set_read_plan(None)
+        mock_request.reset_mock()
+        with _patch_connect(return_value=(MagicMock(), session)), \
+             patch.object(client, "async_request_registers", AsyncMock(side_effect=_read_one)) as mock_request:
+            await client.async_get_data()
+        assert mock_request.call_count == 2 * len(FULL_BLOCKS)
+
+    @pytest.mark.asyncio
+    async def test_async_get_data_tiers(self, client):
+        """Only registers of the requested tiers are polled, hold ones again after a write."""
+        client.set_read_plan([
+            {"register_type": "input", "register": 20, "device_class": "power"},
+            {"register_type": "input", "register": 300, "device_class": "energy"},
+            {"register_type": "hold", "register": 210},
+        ])
+        session = _mock_session()
+
+        async def poll(tiers):
+            with _patch_connect(return_value=(MagicMock(), session)), \
+                 patch.object(client, "async_request_registers", AsyncMock(side_effect=_read_one)) as mock_request:
+                await client.async_get_data(tiers)
+            return [(c.args[1], c.args[2]) for c in mock_request.call_args_list]
+
+        assert await poll({TIER_LIVE}) == [(20, "input")]
+        assert await poll({TIER_LIVE, TIER_ENERGY}) == [(20, "input"), (300, "input")]
+
+        client.request_hold_refresh()
+        assert await poll({TIER_LIVE}) == [(20, "input"), (7, "hold"), (210, "hold")]
+        assert client._hold_refresh_requested is False
+        assert await poll({TIER_LIVE}) == [(20, "input")]
+
+    @pytest.mark.asyncio
+    async def test_hold_cache_sentinel_check(self, mock_lock):
+        """With the sentinel check, hold registers are only read in full when the sentinels changed."""
+        client = LxpModbusApiClient(
+            host="192.168.1.100",
+            port=8000,
+            dongle_serial="DG44302247",
+            inverter_serial="4434280298",
+            lock=mock_lock,
+            skip_initial_data=False,
+            hold_sentinel_check=True,
+        )
+        client.set_read_plan([{"register_type": "hold", "register": 210}])
+        sentinels = {reg: 1 for reg in range(HOLD_SENTINEL_START, HOLD_SENTINEL_START + HOLD_SENTINEL_COUNT)}
+        session = _mock_session()
+
+        def answer(s, reg, request_type, function_code, count):
+            if request_type != "hold":
+                return {}
+            if reg == HOLD_SENTINEL_START and count == HOLD_SENTINEL_COUNT:
+                return dict(sentinels)
+            return {**sentinels, 210: 5}
+
+        async def poll(tiers):
+            with _patch_connect(return_value=(MagicMock(), session)), \
+                 patch.object(client, "async_request_registers", AsyncMock(side_effect=answer)) as mock_request:
+                await client.async_get_data(tiers)
+            return [c.args[1] for c in mock_request.call_args_list if c.args[2] == "hold"]
+
+        # Empty cache: full read
+        assert await poll({TIER_HOLD}) == [7, 210]
+        # Sentinels unchanged: only the sentinel block is read
+        assert await poll({TIER_HOLD}) == [HOLD_SENTINEL_START]
+        # Changed from the app: full read
+        sentinels[HOLD_SENTINEL_START] = 2
+        assert await poll({TIER_HOLD}) == [HOLD_SENTINEL_START, 7, 210]
+        # Explicit refresh bypasses the check
+        client.request_hold_refresh()
+        assert await poll({TIER_LIVE}) == [7, 210]
+
+        stats = client.get_hold_cache_stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+
+    @pytest.mark.asyncio
+    async def test_hold_cache_forces_full_read_after_max_skips(self, mock_lock):
+        """Settings changed outside the sentinels are read after HOLD_SENTINEL_MAX_SKIPS cached hold polls."""
+        client = LxpModbusApiClient(
+            host="192.168.1.100",
+            port=8000,
+            dongle_serial="DG44302247",
+            inverter_serial="4434280298",
+            lock=mock_lock,
+            skip_initial_data=False,
+            hold_sentinel_check=True,
+        )
+        client.set_read_plan([{"register_type": "hold", "register": 210}])
+        sentinels = {reg: 1 for reg in range(HOLD_SENTINEL_START, HOLD_SENTINEL_START + HOLD_SENTINEL_COUNT)}
+        outside = {210: 5}
+        session = _mock_session()
+
+        def answer(s, reg, request_type, function_code, count):
+            if request_type != "hold":
+                return {}
+            if reg == HOLD_SENTINEL_START and count == HOLD_SENTINEL_COUNT:
+                return dict(sentinels)
+            return {**sentinels, **outside}
+
+        async def poll():
+            with _patch_connect(return_value=(MagicMock(), session)), \
+                 patch.object(client, "async_request_registers", AsyncMock(side_effect=answer)) as mock_request:
+                data = await client.async_get_data({TIER_HOLD})
+            return [c.args[1] for c in mock_request.call_args_list if c.args[2] == "hold"], data
+
+        assert (await poll())[0] == [7, 210]
+        # Changed from the app, outside the sentinels: not seen while the cache is trusted
+        outside[210] = 6
+        for _ in range(HOLD_SENTINEL_MAX_SKIPS):
+            reads, data = await poll()
+            assert reads == [HOLD_SENTINEL_START]
+            assert data["hold"][210] == 5
+
+        reads, data = await poll()
+        assert reads == [7, 210]
+        assert data["hold"][210] == 6
+        # The count starts over after the full read
+        assert (await poll())[0] == [HOLD_SENTINEL_START]
+
+        stats = client.get_hold_cache_stats()
+        assert stats["hits"] == HOLD_SENTINEL_MAX_SKIPS + 1
+        assert stats["forced_reads"] == 1
+
+    def test_sentinel_checksum(self, client):
+        """The checksum needs every sentinel register and changes with any of them."""
+        values = {reg: reg for reg in range(HOLD_SENTINEL_START, HOLD_SENTINEL_START + HOLD_SENTINEL_COUNT)}
+        checksum = client._sentinel_checksum(values)
+
+        assert checksum is not None
+        assert client._sentinel_checksum({**values, 0: 99}) == checksum
+        assert client._sentinel_checksum({**values, HOLD_SENTINEL_START + 5: 0}) != checksum
+        del values[HOLD_SENTINEL_START]
+        assert client._sentinel_checksum(values) is None
 
     @pytest.mark.asyncio
     async def test_async_get_data_connection_failure(self, client):
         """Test data retrieval with connection failure."""
         # Mock connection failure for enough attempts to trigger UpdateFailed
         client._connection_retries = 1  # Reduce retries for faster test
-        with patch('asyncio.open_connection', side_effect=ConnectionRefusedError("Connection refused")):
+        with _patch_connect(side_effect=ConnectionRefusedError("Connection refused")):
             # Should raise UpdateFailed after enough failures without cached data
             result = await client.async_get_data()
             # The method returns empty data structure for the first few failures
@@ -332,7 +597,7 @@ class TestLxpModbusApiClient:
         client._last_good_battery_data = {}
 
         # Mock connection failure
-        with patch('asyncio.open_connection', side_effect=ConnectionRefusedError("Connection refused")):
+        with _patch_connect(side_effect=ConnectionRefusedError("Connection refused")):
             result = await client.async_get_data()
 
             # Should return cached data for first few failures
@@ -341,16 +606,14 @@ class TestLxpModbusApiClient:
             assert result["battery"] == {}
 
     @pytest.mark.asyncio
-    async def test_async_get_data_connection_retry(self, client, mock_reader_writer, sample_input_response):
+    async def test_async_get_data_connection_retry(self, client, sample_input_response):
         """Test connection retry logic."""
-        reader, writer = mock_reader_writer
-        
+        session = _mock_session(return_value=LxpResponse(sample_input_response))
+
         # First connection fails, second succeeds
-        connection_attempts = [ConnectionRefusedError("Connection refused"), (reader, writer)]
-        
-        with patch('asyncio.open_connection', side_effect=connection_attempts):
-            reader.read.return_value = sample_input_response
-            
+        connection_attempts = [ConnectionRefusedError("Connection refused"), (MagicMock(), session)]
+
+        with _patch_connect(side_effect=connection_attempts):
             result = await client.async_get_data()
 
             assert "input" in result
@@ -359,82 +622,86 @@ class TestLxpModbusApiClient:
             assert client._connection_retry_count > 0
 
     @pytest.mark.asyncio
-    async def test_async_write_register_success(self, client, mock_reader_writer):
+    async def test_async_write_register_success(self, client):
         """Test successful register write."""
-        reader, writer = mock_reader_writer
-        
         # Mock successful write response
-        write_response = b"\xa1\x1a\x05\x00\x1e\x01\x01\xc2" + b"0" * 68  # Mock response
-        reader.read.return_value = write_response
-        
-        with patch('asyncio.open_connection', return_value=(reader, writer)):
-            # Mock LxpResponse instance to return successful response
-            with patch('custom_components.lxp_modbus.classes.modbus_client.LxpResponse') as mock_response_class:
-                mock_response = MagicMock()
-                mock_response.packet_error = False
-                mock_response.parsed_values_dictionary = {100: 500}
-                mock_response_class.return_value = mock_response
-                
-                result = await client.async_write_register(100, 500)
-                
-                assert result is True
-                writer.write.assert_called_once()
-                writer.drain.assert_called_once()
+        mock_response = MagicMock()
+        mock_response.packet_error = False
+        mock_response.parsed_values_dictionary = {100: 500}
+        session = _mock_session(return_value=mock_response)
+
+        with _patch_connect(return_value=(MagicMock(), session)):
+            result = await client.async_write_register(100, 500)
+
+            assert result is True
+            # Write-through into the hold register cache
+            assert client._last_good_hold_regs[100] == 500
+            session.async_request.assert_called_once()
+            request_packet = session.async_request.call_args[0][0]
+            assert request_packet == LxpRequestBuilder.prepare_packet_for_write(
+                b"DG44302247", b"4434280298", 100, 500
+            )
 
     @pytest.mark.asyncio
     async def test_async_write_register_failure(self, client):
         """Test register write failure."""
-        with patch('asyncio.open_connection', side_effect=ConnectionRefusedError("Connection refused")):
+        with _patch_connect(side_effect=ConnectionRefusedError("Connection refused")):
             result = await client.async_write_register(100, 500)
-            
+
             assert result is False
 
     @pytest.mark.asyncio
-    async def test_async_write_register_retry_logic(self, client, mock_reader_writer):
+    async def test_async_write_register_retry_logic(self, client):
         """Test write register retry logic."""
-        reader, writer = mock_reader_writer
-        
+        mock_response = MagicMock()
+        mock_response.packet_error = False
+        mock_response.parsed_values_dictionary = {100: 500}
+        session = _mock_session(return_value=mock_response)
+
         # First attempt fails, subsequent attempts succeed
         connection_attempts = [
             ConnectionRefusedError("Connection refused"),
-            (reader, writer)
+            (MagicMock(), session)
         ]
-        
-        write_response = b"\xa1\x1a\x05\x00\x1e\x01\x01\xc2" + b"0" * 68
-        reader.read.return_value = write_response
-        
-        with patch('asyncio.open_connection', side_effect=connection_attempts):
-            # Mock LxpResponse instance to return successful response
-            with patch('custom_components.lxp_modbus.classes.modbus_client.LxpResponse') as mock_response_class:
-                mock_response = MagicMock()
-                mock_response.packet_error = False
-                mock_response.parsed_values_dictionary = {100: 500}
-                mock_response_class.return_value = mock_response
-                
-                result = await client.async_write_register(100, 500)
-                
-                assert result is True
+
+        with _patch_connect(side_effect=connection_attempts):
+            result = await client.async_write_register(100, 500)
+
+            assert result is True
 
     @pytest.mark.asyncio
-    async def test_async_write_register_confirmation_mismatch(self, client, mock_reader_writer):
+    async def test_async_write_register_no_response(self, client):
+        """Test write register when the dongle never answers."""
+        client._connection_retries = 1
+        session = _mock_session(side_effect=asyncio.TimeoutError())
+
+        with _patch_connect(return_value=(MagicMock(), session)):
+            result = await client.async_write_register(100, 500)
+
+        assert result is False
+        session.close.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_async_write_register_confirmation_mismatch(self, client):
         """Test write register with confirmation mismatch."""
-        reader, writer = mock_reader_writer
-        
-        write_response = b"\xa1\x1a\x05\x00\x1e\x01\x01\xc2" + b"0" * 68
-        reader.read.return_value = write_response
-        
-        with patch('asyncio.open_connection', return_value=(reader, writer)):
-            # Mock LxpResponse instance to return different value than requested
-            with patch('custom_components.lxp_modbus.classes.modbus_client.LxpResponse') as mock_response_class:
-                mock_response = MagicMock()
-                mock_response.packet_error = False
-                mock_response.parsed_values_dictionary = {100: 600}  # Different value than requested
-                mock_response_class.return_value = mock_response
-                
-                result = await client.async_write_register(100, 500)
-                
-                assert result is False
+        # Mock response returning a different value than requested
+        mock_response = MagicMock()
+        mock_response.packet_error = False
+        mock_response.parsed_values_dictionary = {100: 600}  # Different value than requested
+        session = _mock_session(return_value=mock_response)
+
+        with _patch_connect(return_value=(MagicMock(), session)):
+            result = await client.async_write_register(100, 500)
+
+            assert result is False
+
+    def test_contiguous_blocks(self):
+        """Write values are grouped into runs of consecutive registers, split at the maximum count."""
+        values = {70: 1, 71: 2, 72: 3, 80: 4, 82: 5, 83: 6}
 
+        assert _contiguous_blocks(values, 32) == [(70, [1, 2, 3]), (80, [4]), (82, [5, 6])]
+        assert _contiguous_blocks(values, 2) == [(70, [1, 2]), (72, [3]), (80, [4]), (82, [5, 6])]
+        assert _contiguous_blocks({}, 32) == []
 
 class TestDataSanityFunction:
     """Test cases for the is_data_sane function."""
@@ -0,0 +1,164 @@
+"""Tests for the read plan compiler."""
+
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.read_plan import (
+    CORE_REGISTERS,
+    collect_registers,
+    compile_read_plan,
+    description_change_keys,
+    description_tier,
+    full_read_plan,
+    merge_ranges,
+)
+from custom_components.lxp_modbus.constants.register_pairs import INPUT_REGISTER_PAIRS
+from custom_components.lxp_modbus.const import TOTAL_REGISTERS, TIER_LIVE, TIER_ENERGY, TIER_HOLD
+from custom_components.lxp_modbus.entity_descriptions.sensor_types import SENSOR_TYPES, BATTERY_SENSOR_TYPES
+from custom_components.lxp_modbus.entity_descriptions.number_types import NUMBER_TYPES
+from custom_components.lxp_modbus.entity_descriptions.switch_types import SWITCH_TYPES
+from custom_components.lxp_modbus.entity_descriptions.selectbox_types import SELECTBOX_TYPES
+from custom_components.lxp_modbus.entity_descriptions.time_types import TIME_TYPES
+from custom_components.lxp_modbus.entity_descriptions.binary_sensor_types import BINARY_SENSOR_TYPES
+from custom_components.lxp_modbus.entity_descriptions.button_types import BUTTON_TYPES
+
+ALL_DESCRIPTIONS = (
+    SENSOR_TYPES + NUMBER_TYPES + SWITCH_TYPES + SELECTBOX_TYPES
+    + TIME_TYPES + BINARY_SENSOR_TYPES + BUTTON_TYPES
+)
+
+
+class TestReadPlan:
+    """Test cases for the read plan compiler."""
+
+    def test_collect_registers_by_type(self):
+        """Plain entities contribute their register, calculated ones their dependencies."""
+        descriptions = [
+            {"register_type": "input", "register": 20},
+            {"register_type": "hold", "register": 64},
+            {"register_type": "calculated", "depends_on": [1, 2]},
+            {"register_type": "battery", "register": 5},
+        ]
+
+        registers = collect_registers(descriptions)
+
+        assert set(registers["input"]) == CORE_REGISTERS["input"] | {1, 2, 20}
+        assert set(registers["hold"]) == CORE_REGISTERS["hold"] | {64}
+
+    def test_description_tier(self):
+        """Settings, energy counters and live values land in their own tier."""
+        assert description_tier({"register_type": "hold", "register": 64}) == TIER_HOLD
+        assert description_tier({"register_type": "input", "device_class": "energy"}) == TIER_ENERGY
+        assert description_tier({"register_type": "input", "state_class": "total_increasing"}) == TIER_ENERGY
+        assert description_tier({"register_type": "input", "device_class": "power"}) == TIER_LIVE
+        assert description_tier({"register_type": "calculated", "device_class": "energy"}) == TIER_ENERGY
+
+    def test_description_change_keys(self):
+        """Entities depend on their register, calculated ones on their inputs, battery ones on their battery."""
+        assert description_change_keys({"register_type": "hold", "register": 64}) == {("hold", 64)}
+        assert description_change_keys(
+            {"register_type": "calculated", "depends_on": [1, 2]}) == {("input", 1), ("input", 2)}
+        assert description_change_keys({"register_type": "battery", "register": 5}, "BAT1") == {("battery", "BAT1")}
+        assert description_change_keys({"register_type": "battery_calculated"}, "BAT1") == {("battery", "BAT1")}
+        assert description_change_keys({"register_type": "input"}) is None
+
+    def test_shared_register_uses_fastest_tier(self):
+        """A register read by a live and an energy entity is polled live."""
+        descriptions = [
+            {"register_type": "input", "register": 40, "device_class": "energy"},
+            {"register_type": "calculated", "depends_on": [40, 41], "device_class": "power"},
+            {"register_type": "input", "register": 42, "device_class": "energy"},
+        ]
+
+        registers = collect_registers(descriptions)["input"]
+
+        assert registers[40] == TIER_LIVE
+        assert registers[41] == TIER_LIVE
+        assert registers[42] == TIER_ENERGY
+
+    def test_plan_limited_to_tiers(self):
+        """Only registers of the requested tiers are planned, merged across tiers."""
+        descriptions = [
+            {"register_type": "input", "register": 20, "device_class": "power"},
+            {"register_type": "input", "register": 200, "device_class": "energy"},
+            {"register_type": "hold", "register": 64},
+        ]
+
+        live = compile_read_plan(descriptions, 125, {TIER_LIVE})
+        assert live["input"] == [(20, 94)]
+        assert live["hold"] == []
+
+        every = compile_read_plan(descriptions, 125)
+        assert every["input"] == [(20, 94), (200, 1)]
+        assert every["hold"] == [(7, 58)]
+
+    def test_merge_ranges_respects_block_size(self):
+        """Registers are merged into the fewest ranges no longer than block_size."""
+        assert merge_ranges([0, 5, 9, 10, 30, 39, 40], 10) == [(0, 10), (10, 1), (30, 10), (40, 1)]
+
+    def test_merge_ranges_keeps_pairs_together(self):
+        """A range never ends between the low and high register of a pair."""
+        assert merge_ranges([0, 9, 10], 10) == [(0, 10), (10, 1)]
+        assert merge_ranges([0, 9, 10], 10, {9: 10}) == [(0, 1), (9, 2)]
+
+    @pytest.mark.parametrize("block_size", [125, 70, 40, 13])
+    def test_register_pairs_read_in_one_range(self, block_size):
+        """Both halves of every 32-bit input pair are polled, in the same request."""
+        descriptions = [{"register_type": "input", "register": high} for high in INPUT_REGISTER_PAIRS.values()]
+
+        for plan in (compile_read_plan(descriptions, block_size), full_read_plan(block_size)):
+            for low, high in INPUT_REGISTER_PAIRS.items():
+                assert any(start <= low and high < start + count for start, count in plan["input"]), low
+            assert all(0 < count <= block_size for _, count in plan["input"])
+
+    def test_merge_ranges_single_and_empty(self):
+        """Edge cases: nothing to read, one register, out-of-range registers."""
+        assert merge_ranges([], 125) == []
+        assert merge_ranges([7], 125) == [(7, 1)]
+        assert merge_ranges([-1, 3, TOTAL_REGISTERS], 125) == [(3, 1)]
+
+    @pytest.mark.parametrize("block_size", [125, 40])
+    def test_all_descriptions_covered(self, block_size):
+        """Every register used by a description falls inside a range of the plan."""
+        plan = compile_read_plan(ALL_DESCRIPTIONS, block_size)
+        registers = collect_registers(ALL_DESCRIPTIONS)
+
+        for register_type in ("input", "hold"):
+            ranges = plan[register_type]
+            assert all(0 < count <= block_size for _, count in ranges)
+            for register in registers[register_type]:
+                assert any(start <= register < start + count for start, count in ranges), register
+
+    def test_sparse_plan_reads_less_than_full_sweep(self):
+        """A few enabled entities need far fewer registers than the full sweep."""
+        descriptions = [desc for desc in SENSOR_TYPES if desc.get("register_type") == "input"][:5]
+
+        plan = compile_read_plan(descriptions, 125)
+        full = full_read_plan(125)
+
+        assert sum(count for _, count in plan["hold"]) < sum(count for _, count in full["hold"])
+        assert len(plan["hold"]) == 1
+
+    def test_battery_descriptions_ignored(self):
+        """Battery entities are read from the battery block, not the plan."""
+        registers = collect_registers(BATTERY_SENSOR_TYPES)
+
+        assert set(registers["input"]) == CORE_REGISTERS["input"]
+        assert set(registers["hold"]) == CORE_REGISTERS["hold"]
+
+    def test_full_read_plan(self):
+        """The full plan sweeps the whole register space in block_size steps."""
+        plan = full_read_plan(125)
+
+        assert plan["input"] == [(reg, 125) for reg in range(0, TOTAL_REGISTERS, 125)]
+        assert plan["hold"] == plan["input"]
+        assert full_read_plan(40)["input"][-1] == (720, 30)
+        assert full_read_plan(125, {TIER_LIVE})["hold"] == []
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
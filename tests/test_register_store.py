@@ -0,0 +1,155 @@
+"""Tests for the array-backed register store."""
+
+from array import array
+
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
+from custom_components.lxp_modbus.classes.register_store import RegisterBlock, RegisterStore
+from custom_components.lxp_modbus.const import TOTAL_REGISTERS
+from custom_components.lxp_modbus.constants.register_pairs import INPUT_REGISTER_PAIRS
+from test_data import INPUT_RESPONSES
+
+
+class TestRegisterStore:
+    """Test cases for RegisterStore and RegisterBlock."""
+
+    def test_behaves_like_dict(self):
+        """Reads, writes, membership, iteration and equality match a dict."""
+        store = RegisterStore()
+        store[5] = 50
+        store[1] = 10
+        store[5] = 55
+
+        assert store == {1: 10, 5: 55}
+        assert list(store) == [1, 5]
+        assert len(store) == 2
+        assert store[5] == 55
+        assert store.get(2) is None
+        assert store.get(2, 0) == 0
+        assert 1 in store and 2 not in store
+        assert dict(store.items()) == {1: 10, 5: 55}
+
+        del store[1]
+        assert store == {5: 55}
+        with pytest.raises(KeyError):
+            store[1]
+
+    def test_out_of_range_registers(self):
+        """Registers outside the register space are missing and can't be stored."""
+        store = RegisterStore()
+
+        assert store.get(TOTAL_REGISTERS) is None
+        assert store.get(-1) is None
+        assert "1" not in store
+        with pytest.raises(KeyError):
+            store[TOTAL_REGISTERS] = 1
+
+    def test_set_block_from_response(self):
+        """A reply's register view is stored in one slice copy."""
+        response = LxpResponse(bytes.fromhex(INPUT_RESPONSES["DUMMY_INVERTER_197"]["response_hex"]))
+        store = RegisterStore()
+        store[0] = 1  # overwritten, counted once
+
+        store.set_block(response.register, response.registers, timestamp=100.0)
+
+        assert store == response.parsed_values_dictionary
+        assert len(store) == 80
+        assert store.updated_at(79) == 100.0
+        assert store.updated_at(80) is None
+
+    @pytest.mark.parametrize("values", [[1, 2, 3], array('H', [1, 2, 3]), (1, 2, 3)])
+    def test_set_block_sequences(self, values):
+        """Lists, tuples and arrays are accepted, clipped to the register space."""
+        store = RegisterStore()
+        store.set_block(TOTAL_REGISTERS - 2, values)
+
+        assert store == {TOTAL_REGISTERS - 2: 1, TOTAL_REGISTERS - 1: 2}
+
+    def test_update_from_store_keeps_missing(self):
+        """Merging a store copies only the registers it has, with their timestamps."""
+        old = RegisterStore()
+        old.set_block(0, [1] * 10, timestamp=1.0)
+        new = RegisterStore()
+        new.set_block(2, [7, 7], timestamp=2.0)
+        new.set_block(8, [9, 9, 9], timestamp=3.0)
+
+        old.update(new)
+
+        assert old == {0: 1, 1: 1, 2: 7, 3: 7, 4: 1, 5: 1, 6: 1, 7: 1, 8: 9, 9: 9, 10: 9}
+        assert len(old) == 11
+        assert old.updated_at(1) == 1.0
+        assert old.updated_at(3) == 2.0
+        assert old.updated_at(10) == 3.0
+
+    def test_merge_returns_changed_registers(self):
+        """Merging reports the registers that were new or got a different value."""
+        store = RegisterStore()
+        store.set_block(0, [1, 2, 3, 4])
+        polled = RegisterStore()
+        polled.set_block(0, [1, 2, 9, 4])
+        polled.set_block(100, [5])
+
+        assert store.merge(polled) == {2, 100}
+        assert store.merge(polled) == set()
+
+    def test_signed_value_stored_as_word(self):
+        """A negative value written optimistically is kept as its 16-bit word."""
+        store = RegisterStore()
+        store[10] = -2
+
+        assert store[10] == 0xFFFE
+
+    def test_update_from_block_and_dict(self):
+        """Blocks and plain dicts merge too."""
+        store = RegisterStore()
+        store.update(RegisterBlock(100, [4, 5]))
+        store.update({7: 70})
+
+        assert store == {7: 70, 100: 4, 101: 5}
+
+    def test_register_block_mapping(self):
+        """A block maps its registers to the wrapped values."""
+        block = RegisterBlock(10, array('H', [1, 2, 3]))
+
+        assert block == {10: 1, 11: 2, 12: 3}
+        assert block.get(13) is None
+        assert 12 in block and 9 not in block
+        with pytest.raises(KeyError):
+            block[13]
+
+    def test_combined_pairs(self):
+        """Every declared pair with both halves present is decoded as a 32-bit value."""
+        store = RegisterStore()
+        store.set_block(0, [(reg * 7919) & 0xFFFF for reg in range(TOTAL_REGISTERS)])
+        del store[231]
+
+        combined = store.combined(INPUT_REGISTER_PAIRS)
+
+        assert combined == {
+            low: (store[high] << 16) | store[low]
+            for low, high in INPUT_REGISTER_PAIRS.items() if high in store
+        }
+        assert 230 not in combined
+
+    def test_combined_cached_until_change(self):
+        """The combined view is reused until the store changes."""
+        store = RegisterStore()
+        store.update({40: 1, 41: 2})
+        pairs = {40: 41, 44: 46}  # 44/46 are not consecutive and are left out
+
+        first = store.combined(pairs)
+        assert first == {40: 0x20001}
+        assert store.combined(pairs) is first
+
+        store[41] = 3
+        assert store.combined(pairs) == {40: 0x30001}
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
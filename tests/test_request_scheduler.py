@@ -0,0 +1,168 @@
+"""Tests for the priority request scheduler."""
+
+import asyncio
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.request_scheduler import (
+    PRIORITY_POLL, PRIORITY_READ, PRIORITY_WRITE, RequestScheduler,
+)
+
+
+async def _run(scheduler, priority, name, order, hold=0.0):
+    async with scheduler.slot(priority):
+        order.append(name)
+        await asyncio.sleep(hold)
+
+
+class TestRequestScheduler:
+    """Test cases for RequestScheduler."""
+
+    @pytest.mark.asyncio
+    async def test_waiters_granted_by_priority(self):
+        """Waiting writes go before reads, reads before polls, each in arrival order."""
+        scheduler = RequestScheduler()
+        order = []
+
+        holder = asyncio.ensure_future(_run(scheduler, PRIORITY_POLL, "first", order, 0.01))
+        await asyncio.sleep(0)
+        waiters = [
+            asyncio.ensure_future(_run(scheduler, priority, name, order))
+            for priority, name in (
+                (PRIORITY_POLL, "poll"), (PRIORITY_READ, "read"), (PRIORITY_WRITE, "write 1"),
+                (PRIORITY_WRITE, "write 2"),
+            )
+        ]
+        await asyncio.gather(holder, *waiters)
+
+        assert order == ["first", "write 1", "write 2", "read", "poll"]
+
+    @pytest.mark.asyncio
+    async def test_one_holder_at_a_time(self):
+        """Slots never overlap."""
+        scheduler = RequestScheduler()
+        active = []
+
+        async def run(priority):
+            async with scheduler.slot(priority):
+                active.append(1)
+                assert len(active) == 1
+                await asyncio.sleep(0)
+                active.pop()
+
+        await asyncio.gather(*(run(priority) for priority in (2, 0, 1, 2, 0)))
+
+    @pytest.mark.asyncio
+    async def test_yield_lends_session_to_waiting_write(self):
+        """A poll yielding between requests lets the waiting write run on its session."""
+        scheduler = RequestScheduler()
+        order = []
+
+        async def write():
+            async with scheduler.slot(PRIORITY_WRITE) as slot:
+                order.append(("write", slot.session))
+
+        async with scheduler.slot(PRIORITY_POLL) as poll:
+            order.append("block 1")
+            task = asyncio.ensure_future(write())
+            await asyncio.sleep(0)
+            assert await poll.async_yield("session") is True
+            order.append("block 2")
+            assert poll.session is None
+        await task
+
+        assert order == ["block 1", ("write", "session"), "block 2"]
+        assert scheduler.get_stats()["preemptions"] == 1
+
+    @pytest.mark.asyncio
+    async def test_yield_without_higher_priority_waiter(self):
+        """Polls waiting behind a poll do not preempt it."""
+        scheduler = RequestScheduler()
+        order = []
+
+        async with scheduler.slot(PRIORITY_POLL) as poll:
+            task = asyncio.ensure_future(_run(scheduler, PRIORITY_POLL, "other poll", order))
+            await asyncio.sleep(0)
+            assert await poll.async_yield("session") is True
+            order.append("poll")
+        await task
+
+        assert order == ["poll", "other poll"]
+        assert scheduler.get_stats()["preemptions"] == 0
+
+    @pytest.mark.asyncio
+    async def test_yielded_poll_resumes_before_new_polls(self):
+        """After the writes, the preempted poll continues before polls that queued meanwhile."""
+        scheduler = RequestScheduler()
+        order = []
+
+        async def write():
+            async with scheduler.slot(PRIORITY_WRITE):
+                order.append("write")
+                await asyncio.sleep(0)
+
+        async with scheduler.slot(PRIORITY_POLL) as poll:
+            tasks = [asyncio.ensure_future(write()), asyncio.ensure_future(_run(scheduler, PRIORITY_POLL, "new", order))]
+            await asyncio.sleep(0)
+            await poll.async_yield("session")
+            order.append("resumed")
+        await asyncio.gather(*tasks)
+
+        assert order == ["write", "resumed", "new"]
+
+    @pytest.mark.asyncio
+    async def test_failed_lent_session_reported_to_poll(self):
+        """A write that broke the lent session makes the poll's yield return False."""
+        scheduler = RequestScheduler()
+
+        async def write():
+            async with scheduler.slot(PRIORITY_WRITE) as slot:
+                slot.session_failed()
+
+        async with scheduler.slot(PRIORITY_POLL) as poll:
+            task = asyncio.ensure_future(write())
+            await asyncio.sleep(0)
+            assert await poll.async_yield("session") is False
+        await task
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_is_skipped(self):
+        """A waiter cancelled while queued is never granted."""
+        scheduler = RequestScheduler()
+        order = []
+
+        async with scheduler.slot(PRIORITY_POLL):
+            cancelled = asyncio.ensure_future(_run(scheduler, PRIORITY_WRITE, "cancelled", order))
+            waiting = asyncio.ensure_future(_run(scheduler, PRIORITY_READ, "read", order))
+            await asyncio.sleep(0)
+            cancelled.cancel()
+            await asyncio.sleep(0)
+        await waiting
+
+        assert order == ["read"]
+        assert scheduler.get_stats()["waiting"] == 0
+
+    @pytest.mark.asyncio
+    async def test_wait_statistics(self):
+        """Grants and queue waits are counted per priority."""
+        scheduler = RequestScheduler()
+        order = []
+
+        holder = asyncio.ensure_future(_run(scheduler, PRIORITY_POLL, "poll", order, 0.02))
+        await asyncio.sleep(0)
+        await _run(scheduler, PRIORITY_WRITE, "write", order)
+        await holder
+
+        stats = scheduler.get_stats()
+        assert stats["poll"]["granted"] == 1 and stats["write"]["granted"] == 1
+        assert stats["read"] == {"granted": 0, "wait_avg": 0.0, "wait_max": 0.0}
+        assert stats["write"]["wait_max"] >= 0.01
+        assert stats["poll"]["wait_max"] < 0.01
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,366 @@
+"""Tests for the dongle transports, run against the dongle simulator."""
+
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.connection_manager import ModbusConnectionManager
+from custom_components.lxp_modbus.classes.lxp_request_builder import LxpRequestBuilder
+from custom_components.lxp_modbus.classes.lxp_response import LxpResponse
+from custom_components.lxp_modbus.classes.modbus_client import LxpModbusApiClient
+from custom_components.lxp_modbus.classes.request_scheduler import RequestScheduler
+from custom_components.lxp_modbus.classes.transport import LxpTransport, TcpTransport
+from custom_components.lxp_modbus.classes.write_queue import WriteQueue
+from custom_components.lxp_modbus.const import TIER_LIVE, TIER_HOLD
+
+from dongle_simulator import DongleSimulator
+from test_data import INPUT_RESPONSES
+
+DONGLE = b"DG44302247"
+INVERTER = b"4434280298"
+
+
+def _is_reply(function_code, register):
+    return lambda response: (
+        response.tcp_function == LxpRequestBuilder.TRANSLATED_DATA
+        and (response.device_function & 0x7F) == function_code
+        and response.register == register
+    )
+
+
+def _client(simulator, **kwargs):
+    return LxpModbusApiClient(
+        host="simulator", port=0, dongle_serial=DONGLE.decode(), inverter_serial=INVERTER.decode(),
+        lock=RequestScheduler(), connection_retries=1, transport=simulator.transport(), **kwargs,
+    )
+
+
+class TestTransport:
+    """Test cases for TcpTransport and the in-process simulator transport."""
+
+    @pytest.mark.asyncio
+    async def test_tcp_transport_reads_registers(self):
+        """A TCP connection to the simulator returns the test data registers."""
+        simulator = DongleSimulator.from_test_data(greeting=True)
+        host, port = await simulator.async_start()
+        try:
+            session = await TcpTransport(host, port).async_open()
+            req = LxpRequestBuilder.prepare_packet_for_read(DONGLE, INVERTER, 0, 80, 3)
+            response = await session.async_request(req, _is_reply(3, 0), 1)
+            session.close()
+            await session.wait_closed()
+        finally:
+            await simulator.async_stop()
+
+        expected = bytes.fromhex(INPUT_RESPONSES["DUMMY_INVERTER_197"]["response_hex"])
+        assert response.parsed_values_dictionary == LxpResponse(expected).parsed_values_dictionary
+        assert session.unsolicited_frames == 1  # the greeting
+
+    def test_tcp_transport_description(self):
+        """The TCP transport describes its target."""
+        assert TcpTransport("10.0.0.1", 8000).description == "10.0.0.1:8000"
+
+    def test_incomplete_transport_cannot_be_created(self):
+        """A transport without a description fails when it is created."""
+        class NoDescription(LxpTransport):
+            async def async_open(self):
+                return None
+
+        with pytest.raises(TypeError):
+            NoDescription()
+        with pytest.raises(TypeError):
+            LxpTransport()
+
+    @pytest.mark.asyncio
+    async def test_connection_manager_uses_transport(self):
+        """The connection manager opens sessions through the given transport."""
+        transport = MagicMock()
+        transport.async_open = AsyncMock(return_value=MagicMock())
+        manager = ModbusConnectionManager("h", 1, 1, transport=transport)
+
+        session = await manager.async_connect()
+
+        assert session is transport.async_open.return_value
+        assert manager.transport is transport
+        assert manager.get_stats()["connections_opened"] == 1
+
+    @pytest.mark.asyncio
+    async def test_simulator_exception_and_write(self):
+        """Oversized reads get a Modbus exception, writes are echoed and stored."""
+        simulator = DongleSimulator()
+        session = await simulator.transport().async_open()
+
+        req = LxpRequestBuilder.prepare_packet_for_read(DONGLE, INVERTER, 0, 200, 4)
+        response = await session.async_request(req, _is_reply(4, 0), 1)
+        assert response.device_function == 0x84
+        assert response.exception == 3
+
+        req = LxpRequestBuilder.prepare_packet_for_write(DONGLE, INVERTER, 66, 80)
+        response = await session.async_request(req, _is_reply(6, 66), 1)
+        assert response.parsed_values_dictionary == {66: 80}
+        assert simulator.hold_registers[66] == 80
+        session.close()
+
+    @pytest.mark.asyncio
+    async def test_client_poll_through_faulty_dongle(self):
+        """Split and concatenated frames are reassembled during a full poll."""
+        simulator = DongleSimulator(
+            input_registers={reg: reg for reg in range(750)},
+            hold_registers={reg: 1 for reg in range(750)},
+            greeting=True, concatenate=True, chunk_size=7,
+        )
+        client = _client(simulator, pipeline_window=4)
+
+        data = await client.async_get_data()
+
+        assert len(data["input"]) == 750
+        assert data["input"][300] == 300
+        assert len(data["hold"]) == 750
+        assert simulator.requests == 12
+
+    @pytest.mark.asyncio
+    async def test_client_retries_block_after_crc_error(self, monkeypatch):
+        """A corrupt reply is retried on the same connection instead of ending the poll."""
+        monkeypatch.setattr("custom_components.lxp_modbus.classes.modbus_client.BLOCK_READ_TIMEOUT", 0.2)
+        # With this seed the third reply is the first one corrupted
+        simulator = DongleSimulator(
+            input_registers={reg: 1 for reg in range(750)},
+            crc_error_rate=0.3, seed=2,
+        )
+        client = _client(simulator)
+
+        data = await client.async_get_data({TIER_LIVE})
+
+        assert sorted(data["input"]) == list(range(750))
+        assert simulator.connections == 1
+        stats = client.get_block_stats()
+        assert stats["blocks"]["input 250"]["retries"] >= 1
+        assert stats["poll_resumes"] == 0
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("persistent_connection", [False, True])
+    async def test_client_recovery_stats_count_corrupt_frames(self, monkeypatch, persistent_connection):
+        """Corrupt and truncated replies show in the recovery statistics of the framing."""
+        monkeypatch.setattr("custom_components.lxp_modbus.classes.modbus_client.BLOCK_READ_TIMEOUT", 0.05)
+        simulator = DongleSimulator(
+            input_registers={reg: 1 for reg in range(750)},
+            crc_error_rate=0.2, truncate_rate=0.2, seed=3,
+        )
+        client = _client(simulator, persistent_connection=persistent_connection)
+
+        data = await client.async_get_data({TIER_LIVE})
+
+        assert sorted(data["input"]) == list(range(750))
+        stats = client.get_recovery_stats()
+        assert stats["crc_errors"] >= 1
+        assert stats["bytes_discarded"] >= 1
+        assert stats["frames_received"] >= 6
+
+    @pytest.mark.asyncio
+    async def test_client_resumes_poll_at_first_missing_block(self, monkeypatch):
+        """A block still unanswered after its retries makes the poll reconnect and resume at that block."""
+        monkeypatch.setattr("custom_components.lxp_modbus.classes.modbus_client.BLOCK_READ_TIMEOUT", 0.05)
+        simulator = DongleSimulator(input_registers={reg: 1 for reg in range(750)})
+        handle_request = simulator.handle_request
+
+        def lose_second_block(packet):
+            # The first connection stops answering after the first block
+            reply = handle_request(packet)
+            return None if simulator.connections == 1 and simulator.requests > 1 else reply
+
+        monkeypatch.setattr(simulator, "handle_request", lose_second_block)
+        client = _client(simulator)
+
+        data = await client.async_get_data({TIER_LIVE})
+
+        assert sorted(data["input"]) == list(range(750))
+        assert simulator.connections == 2
+        stats = client.get_block_stats()
+        assert stats["poll_resumes"] == 1
+        assert stats["blocks"]["input 0"] == {"reads": 1, "retries": 0, "failures": 0}
+        assert stats["blocks"]["input 125"] == {"reads": 1, "retries": 2, "failures": 1}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("pipeline_window", [1, 4])
+    async def test_client_resumes_poll_after_disconnect(self, pipeline_window):
+        """A connection closed by the dongle mid-poll is reopened and the poll resumes, keeping the blocks read."""
+        simulator = DongleSimulator(input_registers={reg: 1 for reg in range(750)}, disconnect_at=3)
+        client = _client(simulator, pipeline_window=pipeline_window)
+
+        data = await client.async_get_data({TIER_LIVE})
+
+        assert sorted(data["input"]) == list(range(750))
+        assert simulator.connections == 2
+        stats = client.get_block_stats()
+        assert stats["poll_resumes"] == 1
+        assert stats["blocks"]["input 0"]["reads"] == 1
+
+    @pytest.mark.asyncio
+    async def test_truncated_reply_times_out(self):
+        """A truncated frame never completes and its request times out."""
+        simulator = DongleSimulator(truncate_rate=1.0)
+        session = await simulator.transport().async_open()
+        req = LxpRequestBuilder.prepare_packet_for_read(DONGLE, INVERTER, 0, 10, 3)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await session.async_request(req, _is_reply(3, 0), 0.05)
+        session.close()
+
+    @pytest.mark.asyncio
+    async def test_simulator_latency(self):
+        """Replies are delayed by the configured latency."""
+        simulator = DongleSimulator(latency=0.05)
+        session = await simulator.transport().async_open()
+        req = LxpRequestBuilder.prepare_packet_for_read(DONGLE, INVERTER, 0, 10, 3)
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await session.async_request(req, _is_reply(3, 0), 1)
+
+        assert loop.time() - started >= 0.05
+        session.close()
+
+    @pytest.mark.asyncio
+    async def test_hold_write_roundtrip(self):
+        """A write through the client is stored by the simulator and read back."""
+        simulator = DongleSimulator(hold_registers={66: 10})
+        client = _client(simulator)
+
+        assert await client.async_write_register(66, 55) is True
+        data = await client.async_get_data({TIER_HOLD})
+
+        assert data["hold"][66] == 55
+        assert simulator.writes == 1
+
+    @pytest.mark.asyncio
+    async def test_client_reports_changed_registers(self):
+        """Polls report only the registers whose value changed, writes their register."""
+        simulator = DongleSimulator(input_registers={reg: 1 for reg in range(750)}, hold_registers={66: 10})
+        client = _client(simulator)
+
+        await client.async_get_data()
+        first = client.pop_changes()
+        assert len(first["input"]) == 750 and len(first["hold"]) == 750
+
+        simulator.input_registers[20] = 2
+        await client.async_get_data({TIER_LIVE})
+        assert client.pop_changes() == {"input": {20}, "hold": set(), "battery": set()}
+
+        await client.async_write_register(66, 55)
+        assert client.pop_changes()["hold"] == {66}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("write_multi", [True, False])
+    async def test_negative_values_written_through_queue(self, write_multi):
+        """Negative settings queued for writing reach the inverter as 16-bit values and confirm."""
+        simulator = DongleSimulator(hold_registers={106: 0, 107: 0, 117: 0}, write_multi=write_multi)
+        client = _client(simulator)
+        queue = WriteQueue(client, 0.01)
+
+        results = await asyncio.gather(queue.async_write(106, -10), queue.async_write(107, -20),
+                                       queue.async_write(117, -1))
+
+        assert results == [True, True, True]
+        assert simulator.hold_registers == {106: 0xFFF6, 107: 0xFFEC, 117: 0xFFFF}
+        assert client.hold_registers[106] == 0xFFF6 and client.hold_registers[117] == 0xFFFF
+
+    @pytest.mark.asyncio
+    async def test_write_registers_in_one_request(self):
+        """Contiguous registers are written by one write multiple request."""
+        simulator = DongleSimulator(hold_registers={72: 0, 73: 0})
+        client = _client(simulator)
+
+        assert await client.async_write_registers({73: 0x1E10, 72: 0x0A08}) is True
+
+        assert simulator.hold_registers[72] == 0x0A08 and simulator.hold_registers[73] == 0x1E10
+        assert simulator.connections == 1 and simulator.requests == 1
+        assert client._last_good_hold_regs[72] == 0x0A08
+        assert client.pop_changes()["hold"] == {72, 73}
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("write_multi", [True, False])
+    async def test_write_registers_high_and_negative_values(self, write_multi):
+        """Values of 0x8000 and up and negative ones are written and confirmed the same on both paths."""
+        simulator = DongleSimulator(write_multi=write_multi)
+        client = _client(simulator)
+
+        assert await client.async_write_registers({106: 0x8000, 107: -1, 108: 0xFFFF, 109: -32768}) is True
+
+        assert simulator.hold_registers == {106: 0x8000, 107: 0xFFFF, 108: 0xFFFF, 109: 0x8000}
+        assert simulator.requests == (1 if write_multi else 5)  # 0x10, or its rejection and four single writes
+
+    @pytest.mark.asyncio
+    async def test_write_registers_falls_back_to_single_writes(self):
+        """An inverter rejecting 0x10 gets single writes in the same session, and from then on."""
+        simulator = DongleSimulator(write_multi=False)
+        client = _client(simulator)
+
+        assert await client.async_write_registers({72: 1, 73: 2, 100: 3}) is True
+        assert simulator.hold_registers == {72: 1, 73: 2, 100: 3}
+        assert simulator.connections == 1
+        assert simulator.requests == 4  # rejected 0x10, then three single writes
+
+        assert await client.async_write_registers({72: 4, 73: 5}) is True
+        assert simulator.requests == 6
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("pipeline_window", [1, 4])
+    async def test_write_preempts_poll_on_its_session(self, pipeline_window):
+        """A write issued during a poll runs between its block reads, on the poll's connection."""
+        simulator = DongleSimulator(
+            input_registers={reg: 1 for reg in range(750)}, hold_registers={66: 10}, latency=0.02,
+        )
+        client = _client(simulator, pipeline_window=pipeline_window)
+
+        poll = asyncio.ensure_future(client.async_get_data())
+        await asyncio.sleep(0.01)
+        assert await client.async_write_register(66, 55) is True
+        assert not poll.done()
+
+        data = await poll
+        assert len(data["input"]) == 750
+        assert data["hold"][66] == 55
+        assert simulator.connections == 1
+        stats = client.get_scheduler_stats()
+        assert stats["preemptions"] == 1
+        assert stats["write"]["granted"] == 1 and stats["poll"]["granted"] == 1
+
+    @pytest.mark.asyncio
+    async def test_read_back_reads_only_covering_block(self):
+        """A read-back takes one request for nearby registers and reports the ones that changed."""
+        simulator = DongleSimulator(hold_registers={reg: 1 for reg in range(200)})
+        client = _client(simulator)
+        await client.async_get_data({TIER_HOLD})
+        client.pop_changes()
+        requests = simulator.requests
+
+        simulator.hold_registers[11] = 0
+        values = await client.async_read_back("hold", [11, 20])
+
+        assert simulator.requests == requests + 1
+        assert sorted(values) == list(range(11, 21))
+        assert client.hold_registers[11] == 0
+        assert client.pop_changes()["hold"] == {11}
+
+    @pytest.mark.asyncio
+    async def test_read_back_failure_keeps_data(self, monkeypatch):
+        """A read-back that gets no reply leaves the last known values in place."""
+        monkeypatch.setattr("custom_components.lxp_modbus.classes.modbus_client.BLOCK_READ_TIMEOUT", 0.05)
+        simulator = DongleSimulator(hold_registers={11: 1})
+        client = _client(simulator)
+        await client.async_get_data({TIER_HOLD})
+        client.pop_changes()
+
+        simulator.drop_rate = 1.0
+        assert await client.async_read_back("hold", [11]) == {}
+        assert client.hold_registers[11] == 1
+        assert client.pop_changes()["hold"] == set()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,60 @@
+"""Tests for the bitmask decoding helpers."""
+
+import random
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.constants.fault_codes import FAULT_CODES
+from custom_components.lxp_modbus.constants.warning_codes import WARNING_CODES
+from custom_components.lxp_modbus.utils import (
+    _decode_bitmask,
+    bitmask_attributes,
+    decode_bitmask,
+    decode_bitmask_to_string,
+)
+
+
+def _reference(value, code_map, default_string):
+    """Bit by bit decoding, as done before the lookup tables."""
+    messages = [message for bit, message in code_map.items() if (value >> bit) & 1]
+    return ", ".join(messages) if messages else default_string
+
+
+class TestBitmaskDecoding:
+    """Test cases for decode_bitmask and decode_bitmask_to_string."""
+
+    @pytest.mark.parametrize("code_map", [FAULT_CODES, WARNING_CODES])
+    def test_matches_bitwise_decoding(self, code_map):
+        """Table decoding gives the same string as testing each bit."""
+        values = [1 << bit for bit in range(32)] + [random.Random(seed).getrandbits(32) for seed in range(200)]
+        for value in values:
+            assert decode_bitmask_to_string(value, code_map, "None") == _reference(value, code_map, "None"), value
+
+    def test_no_codes(self):
+        """Zero, None and bits without a message give the default string."""
+        assert decode_bitmask_to_string(0, FAULT_CODES, "No Faults") == "No Faults"
+        assert decode_bitmask_to_string(None, FAULT_CODES) == "OK"
+        assert decode_bitmask(1 << 2, {0: "a"}) == ()
+
+    def test_structured_codes(self):
+        """Active codes are returned lowest bit first, also as attributes."""
+        code_map = {0: "zero", 9: "nine", 31: "top"}
+        value = (1 << 31) | (1 << 9) | 1
+
+        assert decode_bitmask(value, code_map) == ((0, "zero"), (9, "nine"), (31, "top"))
+        assert bitmask_attributes(1 << 9, code_map) == {"active_codes": [{"bit": 9, "message": "nine"}]}
+
+    def test_results_cached(self):
+        """Repeated decodes of a value are served from the cache."""
+        decode_bitmask(0x10001, FAULT_CODES)
+        hits = _decode_bitmask.cache_info().hits
+        decode_bitmask(0x10001, FAULT_CODES)
+        assert _decode_bitmask.cache_info().hits == hits + 1
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,124 @@
+"""Tests for the compiled entity value accessors."""
+
+import pytest
+from unittest.mock import MagicMock
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.register_store import RegisterStore
+from custom_components.lxp_modbus.classes.value_accessor import (
+    ValueAccessor,
+    compile_readonly_description,
+    compile_sensor_description,
+)
+from custom_components.lxp_modbus.const import CONF_RATED_POWER, TOTAL_REGISTERS
+from custom_components.lxp_modbus.entity_descriptions.sensor_types import SENSOR_TYPES, BATTERY_SENSOR_TYPES
+
+SERIAL = "BAT00000000001"
+
+
+def _legacy_value(desc, data, entry, battery_serial):
+    """The value ModbusBridgeSensor.native_value computed before descriptions were compiled."""
+    register_type = desc.get("register_type")
+    raw_val = None
+    if register_type == "calculated":
+        raw_val = desc["extract"](data.get("input", {}), entry)
+    elif register_type == "battery":
+        value = data.get("battery", {}).get(battery_serial, {}).get(desc.get("register"))
+        if value is not None:
+            raw_val = desc["extract"](value)
+    elif register_type == "battery_calculated":
+        raw_val = desc["extract"](data.get("battery", {}).get(battery_serial, {}), entry)
+    else:
+        value = data.get(register_type, {}).get(desc.get("register"))
+        if value is not None:
+            raw_val = desc["extract"](value)
+    if raw_val is None:
+        return None
+    if "options" in desc:
+        return desc["options"].get(raw_val, desc.get("default", "Unknown"))
+    if "scale" in desc:
+        scaled_value = raw_val * desc["scale"]
+        return int(scaled_value) if scaled_value == int(scaled_value) else scaled_value
+    return raw_val
+
+
+def _data(value):
+    store = RegisterStore()
+    store.set_block(0, [value] * TOTAL_REGISTERS)
+    battery = {reg: value for reg in range(30)}
+    return {"input": store, "hold": store, "battery": {SERIAL: battery}}
+
+
+class TestValueAccessor:
+    """Test cases for compile_sensor_description and compile_readonly_description."""
+
+    @pytest.mark.parametrize("value", [0, 1, 3, 1234, 0xFFFF])
+    def test_matches_legacy_native_value(self, value):
+        """Every sensor description reads the same value as the uncompiled lookup."""
+        data = _data(value)
+        entry = MagicMock()
+        entry.data = {CONF_RATED_POWER: 5000}
+        for desc in SENSOR_TYPES + BATTERY_SENSOR_TYPES:
+            accessor = compile_sensor_description(desc)
+            assert accessor.read(data, entry, SERIAL) == _legacy_value(desc, data, entry, SERIAL), desc["name"]
+
+    def test_missing_register_is_none(self):
+        """An unread register or unknown battery reads as None."""
+        desc = {"register_type": "input", "register": 5, "extract": lambda v: v, "scale": 0.1}
+        accessor = compile_sensor_description(desc)
+        assert accessor.read({"input": {}}, None, None) is None
+        assert accessor.read({}, None, None) is None
+
+        battery = compile_sensor_description({"register_type": "battery", "register": 2, "extract": lambda v: v})
+        assert battery.read({"battery": {SERIAL: {2: 7}}}, None, "other") is None
+        assert battery.read({"battery": {SERIAL: {2: 7}}}, None, SERIAL) == 7
+
+    def test_options_and_default(self):
+        """Options map the raw value, unknown values fall back to the default."""
+        desc = {"register_type": "input", "register": 0, "extract": lambda v: v, "options": {1: "On"}}
+        assert compile_sensor_description(desc).read({"input": {0: 1}}, None, None) == "On"
+        assert compile_sensor_description(desc).read({"input": {0: 2}}, None, None) == "Unknown"
+        desc["default"] = "Off"
+        assert compile_sensor_description(desc).read({"input": {0: 2}}, None, None) == "Off"
+
+    def test_scale_returns_clean_numbers(self):
+        """Whole scaled values are ints, fractions stay floats."""
+        accessor = compile_sensor_description(
+            {"register_type": "input", "register": 0, "extract": lambda v: v, "scale": 0.1}
+        )
+        assert accessor.read({"input": {0: 20}}, None, None) == 2
+        assert type(accessor.read({"input": {0: 20}}, None, None)) is int
+        assert accessor.read({"input": {0: 25}}, None, None) == 2.5
+
+    def test_calculated_reads_input(self):
+        """Calculated descriptions get the input registers and the config entry."""
+        entry = MagicMock()
+        accessor = compile_sensor_description(
+            {"register_type": "calculated", "extract": lambda regs, e: (regs.get(1), e)}
+        )
+        assert accessor.read({"input": {1: 9}}, entry, None) == (9, entry)
+
+    def test_accessor_is_slotted(self):
+        """Accessors are frozen and carry no per-instance dict."""
+        accessor = compile_sensor_description(SENSOR_TYPES[0])
+        assert isinstance(accessor, ValueAccessor)
+        assert not hasattr(accessor, "__dict__")
+        with pytest.raises(AttributeError):
+            accessor.register = 1
+
+    def test_readonly_renders_raw_register(self):
+        """Read-only control sensors render the raw register, or return it without a renderer."""
+        desc = {"register_type": "hold", "register": 64}
+        data = {"hold": {64: 12}}
+        assert compile_readonly_description(desc, None).read(data, None, None) == 12
+        rendered = compile_readonly_description(desc, lambda value, d: f"{value}:{d['register']}")
+        assert rendered.read(data, None, None) == "12:64"
+        assert rendered.read({"hold": {}}, None, None) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])
@@ -0,0 +1,198 @@
+"""Tests for the debounced write queue."""
+
+import asyncio
+import pytest
+
+# Import the module under test
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from custom_components.lxp_modbus.classes.write_queue import WriteQueue
+
+DEBOUNCE = 0.01
+
+
+class FakeClient:
+    """Client writing through to its hold registers, except the registers in fail."""
+
+    def __init__(self, hold_registers=None, fail=()):
+        self.hold_registers = dict(hold_registers or {})
+        self.fail = set(fail)
+        self.calls = []
+
+    async def async_write_registers(self, values):
+        self.calls.append(dict(values))
+        for register, value in values.items():
+            if register not in self.fail:
+                # Confirmed values are stored as the inverter echoes them, 16-bit
+                self.hold_registers[register] = value & 0xFFFF
+        return not self.fail & set(values)
+
+
+class TestWriteQueue:
+    """Test cases for WriteQueue."""
+
+    @pytest.mark.asyncio
+    async def test_last_value_wins(self):
+        """Values queued for a register within the window are written once, the last one."""
+        client = FakeClient({66: 10})
+        queue = WriteQueue(client, DEBOUNCE)
+
+        results = await asyncio.gather(*(queue.async_write(66, value) for value in (11, 12, 13)))
+
+        assert results == [True, True, True]
+        assert client.calls == [{66: 13}]
+        assert client.hold_registers[66] == 13
+        assert queue.get_stats()["coalesced_writes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_registers_of_one_window_written_together(self):
+        """Different registers queued in the same window go in one write."""
+        client = FakeClient()
+        queue = WriteQueue(client, DEBOUNCE)
+
+        assert await asyncio.gather(queue.async_write(72, 1), queue.async_write(73, 2)) == [True, True]
+        assert client.calls == [{72: 1, 73: 2}]
+
+    @pytest.mark.asyncio
+    async def test_unchanged_value_not_written(self):
+        """A value equal to the cached one is not written."""
+        client = FakeClient({66: 10})
+        queue = WriteQueue(client, DEBOUNCE)
+
+        assert await queue.async_write(66, 10) is True
+        assert client.calls == []
+        assert queue.get_stats()["skipped_writes"] == 1
+
+    @pytest.mark.asyncio
+    async def test_value_set_back_within_window_not_written(self):
+        """A register moved away and back within the window needs no write."""
+        client = FakeClient({66: 10})
+        queue = WriteQueue(client, DEBOUNCE)
+
+        assert await asyncio.gather(queue.async_write(66, 20), queue.async_write(66, 10)) == [True, True]
+        assert client.calls == []
+
+    @pytest.mark.asyncio
+    async def test_compose_sees_queued_value(self):
+        """Byte fields of the same register set within a window are both kept."""
+        client = FakeClient({80: 0x0101})
+        queue = WriteQueue(client, DEBOUNCE)
+
+        await asyncio.gather(
+            queue.async_write(80, lambda current: (current & 0xFF00) | 0x22),
+            queue.async_write(80, lambda current: (current & 0x00FF) | (0x33 << 8)),
+        )
+
+        assert client.calls == [{80: 0x3322}]
+
+    @pytest.mark.asyncio
+    async def test_results_per_register(self):
+        """Callers of a register that was not confirmed get False, the others True."""
+        client = FakeClient(fail={73})
+        queue = WriteQueue(client, DEBOUNCE)
+
+        assert await asyncio.gather(queue.async_write(72, 1), queue.async_write(73, 2)) == [True, False]
+
+    @pytest.mark.asyncio
+    async def test_writes_after_window_are_flushed_separately(self):
+        """A value queued after a flush started waits for the next window."""
+        client = FakeClient()
+        queue = WriteQueue(client, DEBOUNCE)
+
+        assert await queue.async_write(66, 1) is True
+        assert await queue.async_write(66, 2) is True
+        assert client.calls == [{66: 1}, {66: 2}]
+        assert queue.get_stats()["flushes"] == 2
+
+    @pytest.mark.asyncio
+    async def test_shutdown_writes_pending_values(self):
+        """Shutting down writes the queued values without waiting for the window."""
+        client = FakeClient()
+        queue = WriteQueue(client, 60)
+
+        write = asyncio.ensure_future(queue.async_write(66, 5))
+        await asyncio.sleep(0)
+        await queue.async_shutdown()
+
+        assert await write is True
+        assert client.calls == [{66: 5}]
+
+    @pytest.mark.asyncio
+    async def test_value_set_back_during_flush_is_written(self):
+        """Setting a register back to its cached value while a write to it is in flight still writes it."""
+        client = FakeClient({5: 10})
+        written = asyncio.Event()
+        release = asyncio.Event()
+        write_through = client.async_write_registers
+
+        async def slow_write(values):
+            written.set()
+            await release.wait()
+            return await write_through(values)
+
+        client.async_write_registers = slow_write
+        queue = WriteQueue(client, DEBOUNCE)
+
+        first = asyncio.ensure_future(queue.async_write(5, 20))
+        await written.wait()
+        second = asyncio.ensure_future(queue.async_write(5, 10))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await first is True
+        assert await second is True
+        assert client.calls == [{5: 20}, {5: 10}]
+        assert client.hold_registers[5] == 10
+
+    @pytest.mark.asyncio
+    async def test_compose_sees_value_in_flight(self):
+        """A composed value builds on the value being written, not the stale cached one."""
+        client = FakeClient({80: 0x0101})
+        written = asyncio.Event()
+        release = asyncio.Event()
+        write_through = client.async_write_registers
+
+        async def slow_write(values):
+            written.set()
+            await release.wait()
+            return await write_through(values)
+
+        client.async_write_registers = slow_write
+        queue = WriteQueue(client, DEBOUNCE)
+
+        first = asyncio.ensure_future(queue.async_write(80, lambda current: (current & 0xFF00) | 0x22))
+        await written.wait()
+        second = asyncio.ensure_future(queue.async_write(80, lambda current: (current & 0x00FF) | (0x33 << 8)))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert await asyncio.gather(first, second) == [True, True]
+        assert client.calls == [{80: 0x0122}, {80: 0x3322}]
+
+    @pytest.mark.asyncio
+    async def test_negative_value_confirmed(self):
+        """Signed values are written in two's complement and reported as confirmed."""
+        client = FakeClient({90: 0})
+        queue = WriteQueue(client, DEBOUNCE)
+
+        assert await queue.async_write(90, -5) is True
+        assert client.calls == [{90: 0xFFFB}]
+
+    @pytest.mark.asyncio
+    async def test_client_exception_fails_waiters(self):
+        """An exception from the client fails the queued writes instead of leaving callers waiting."""
+        client = FakeClient()
+
+        async def broken(values):
+            raise OSError("connection reset")
+
+        client.async_write_registers = broken
+        queue = WriteQueue(client, DEBOUNCE)
+
+        assert await queue.async_write(66, 5) is False
+
+
+if __name__ == "__main__":
+    pytest.main([__file__, "-v"])